@@ -1,4 +1,6 @@
 -- schema.sql
+-- Snapshot of the schema produced by model/migrations.py at the version
+-- below. Keep the two in sync (tests/test_migrations.py checks it).
 CREATE TABLE IF NOT EXISTS items (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     title TEXT NOT NULL,
@@ -8,6 +10,75 @@ CREATE TABLE IF NOT EXISTS items (
     notes TEXT NOT NULL DEFAULT '',
     author TEXT NOT NULL DEFAULT '',
     first_publish_year INTEGER NULL,
-    openlibrary_key TEXT UNIQUE,
+    openlibrary_key TEXT NULL,
     cover_id INTEGER NULL
 );
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_items_openlibrary_key ON items (openlibrary_key);
+CREATE INDEX IF NOT EXISTS idx_items_status ON items (status);
+CREATE INDEX IF NOT EXISTS idx_items_media_type ON items (media_type);
+CREATE INDEX IF NOT EXISTS idx_items_cover_id ON items (cover_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, author, notes,
+    content = 'items',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, title, author, notes)
+    VALUES (new.id, new.title, new.author, new.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, author, notes)
+    VALUES ('delete', old.id, old.title, old.author, old.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_fts_au
+AFTER UPDATE OF title, author, notes ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, author, notes)
+    VALUES ('delete', old.id, old.title, old.author, old.notes);
+    INSERT INTO items_fts (rowid, title, author, notes)
+    VALUES (new.id, new.title, new.author, new.notes);
+END;
+
+CREATE TABLE IF NOT EXISTS item_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id INTEGER NOT NULL,
+    op TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS items_changes_ai AFTER INSERT ON items BEGIN
+    INSERT INTO item_changes (item_id, op) VALUES (new.id, 'insert');
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_changes_au AFTER UPDATE ON items BEGIN
+    INSERT INTO item_changes (item_id, op) VALUES (new.id, 'update');
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_changes_ad AFTER DELETE ON items BEGIN
+    INSERT INTO item_changes (item_id, op) VALUES (old.id, 'delete');
+END;
+
+CREATE INDEX IF NOT EXISTS idx_items_title_nocase ON items (title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_items_rating ON items (IFNULL(rating, 0));
+CREATE INDEX IF NOT EXISTS idx_items_status_title ON items (status, title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_items_media_type_title ON items (media_type, title COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS import_log (
+    source TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    query TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    item_id INTEGER NULL,
+    PRIMARY KEY (source, line)
+);
+
+CREATE TABLE IF NOT EXISTS item_enrichment (
+    item_id INTEGER PRIMARY KEY,
+    enriched_at REAL NOT NULL
+);
+
+PRAGMA user_version = 8;
@@ -1,31 +1,68 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import sqlite3
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
 from pathlib import Path
-from typing import cast
+from typing import TypeVar
 
-from PySide6.QtCore import QObject, QRunnable, QThreadPool
-from PySide6.QtWidgets import QApplication, QMessageBox
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
 
 from library_app.dev.seed import _ensure_sample_data
-from library_app.model.covers import fetch_cover_to_cache
-from library_app.model.entities import Item
-from library_app.model.enums import ItemStatus, MediaType
-from library_app.model.openlibrary import OLResult, search_openlibrary
+from library_app.model.cover_misses import CoverMisses
+from library_app.model.covers import cover_cache
+from library_app.model.enrichment import EnrichProgress, enrich_items
+from library_app.model.entities import Item, ItemChange, ItemSummary
+from library_app.model.enums import ChangeOp, ItemStatus, MediaType
+from library_app.model.importer import ImportProgress, import_file
+from library_app.model.ol_client import OpenLibraryClient
+from library_app.model.openlibrary import OLResult
+from library_app.model.query import ItemSort
 from library_app.model.repository import ItemRepository
-from library_app.util.worker import Worker
+from library_app.model.search_cache import SearchCache
+from library_app.model.writer import DbWriter
+from library_app.util.async_loop import AsyncLoop
+from library_app.util.worker import WorkerSignals, watch_future
 from library_app.view.add_item_dialog import AddItemDialog
 from library_app.view.item_table_model import ItemTableModel
 from library_app.view.main_window import MainWindow
+from library_app.view.pixmap_cache import PixmapKey
 from library_app.view.search_online_dialog import SearchOnlineDialog
 
+T = TypeVar("T")
+
 
 class MainController(QObject):
+    _SEARCH_LIMIT = 500
+    _CHANGE_POLL_MS = 1000
+    _OL_FIRST_PAGE = 25
+    _OL_PAGE = 100
+
     def __init__(self) -> None:
         super().__init__()
         self._repo = ItemRepository()
+        # Every write goes through this thread; the UI never blocks on commit.
+        self._writer = DbWriter(self._repo)
+        # Network I/O: one asyncio loop thread, one pooled HTTP client.
+        # Needed before the first refresh: sizing columns already asks for covers.
+        self._aio = AsyncLoop()
+        # Covers that 404'd or kept failing, remembered across restarts.
+        self._cover_misses = CoverMisses()
+        # Covers on disk within a byte budget; its index loads here, not mid-paint.
+        self._cover_cache = cover_cache()
+        self._ol = OpenLibraryClient(misses=self._cover_misses)
+        self._search_cache = SearchCache()
+        self._search_futures: set[Future[list[OLResult]]] = set()
+        self._import_future: Future[ImportProgress] | None = None
+        self._enrich_future: Future[EnrichProgress] | None = None
         self._window = MainWindow()
         self.table_model: ItemTableModel = self._window.table_model
+        self.table_model.set_cover_misses(self._cover_misses)
         self.table_model.cover_requested.connect(self._on_cover_requested)
 
         self._current_cover_item_id: int | None = None
@@ -34,9 +71,21 @@ class MainController(QObject):
         if os.environ.get("LIBRARY_DEV_SEED") == "1":
             _ensure_sample_data(self._repo)
 
+        # Start the change feed at "now": everything older is already on
+        # screen after refresh(), and nobody else reads the feed.
+        self._change_seq = self._repo.latest_change_seq()
+        self._repo.prune_changes(self._change_seq)
+        self._data_version = self._repo.data_version()
+
         self.refresh()
 
+        self._change_timer = QTimer(self)
+        self._change_timer.setInterval(self._CHANGE_POLL_MS)
+        self._change_timer.timeout.connect(self._poll_changes)
+        self._change_timer.start()
+
         self._window.add_item_requested.connect(self.on_add_item)
+        self._window.filter_changed.connect(self.on_filter_changed)
 
         # selection -> detail
         self._window.table.selectionModel().selectionChanged.connect(
@@ -48,8 +97,9 @@ class MainController(QObject):
 
         self._window.delete_action.triggered.connect(self.on_delete_item)
 
-        self._pool = QThreadPool.globalInstance()
         self._window.search_online_requested.connect(self.on_search_online)
+        self._window.import_list_requested.connect(self.on_import_list)
+        self._window.enrich_requested.connect(self.on_enrich)
 
         # when wiring things up:
         app = QApplication.instance()
@@ -62,17 +112,94 @@ class MainController(QObject):
         self._window.show()
 
     def refresh(self, *, reselect_id: int | None = None) -> None:
-        items = self._repo.list_items()
-        self._window.set_items(items)
+        query = self._window.filter_text()
+        filters = self._window.current_filters()
+        if query:
+            self._window.set_items(
+                self._repo.search(query, limit=self._SEARCH_LIMIT, filters=filters)
+            )
+        else:
+
+            def load_page(
+                *, after: ItemSummary | None, limit: int, sort: ItemSort
+            ) -> list[ItemSummary]:
+                return self._repo.list_items_page(
+                    after=after, limit=limit, sort=sort, filters=filters
+                )
+
+            # Only the first page is read here; the model pages in the rest,
+            # and re-pages from SQL when a header is clicked.
+            self._window.set_item_loader(load_page)
 
         if reselect_id is not None:
             # reselect row by id after refresh (keeps UI stable)
-            for row, item in enumerate(items):
-                if item.id == reselect_id:
-                    idx = self.table_model.index(row, 0)
-                    self._window.table.selectRow(row)
-                    self._window.table.scrollTo(idx)
-                    break
+            row = self.table_model.row_for_id(reselect_id)
+            if row is not None:
+                idx = self.table_model.index(row, 0)
+                self._window.table.selectRow(row)
+                self._window.table.scrollTo(idx)
+
+    def _show_new_item(self, item_id: int) -> None:
+        # Placed by the current sort; may land past the fetched pages. Search
+        # hits are ranked, and the new item may not even match the query.
+        if self._window.filter_text():
+            return
+        item = self._repo.get_item(item_id)
+        if item is None:
+            return
+        summary = item.summary()
+        if not self._window.current_filters().matches(summary):
+            return
+        row = self.table_model.insert_sorted(summary)
+        if row is None:
+            return
+        self._window.table.selectRow(row)
+        self._window.table.scrollTo(self.table_model.index(row, 0))
+
+    def _poll_changes(self) -> None:
+        # data_version only moves when another connection commits, so the
+        # common idle case is one PRAGMA and no table reads at all.
+        version = self._repo.data_version()
+        if version == self._data_version:
+            return
+        self._data_version = version
+
+        changes = self._repo.changes_since(self._change_seq)
+        if not changes:
+            return
+        self._change_seq = max(c.seq for c in changes)
+        self._apply_changes(changes)
+        seq = self._change_seq
+        self._writer.submit(lambda repo: repo.prune_changes(seq))
+        self._window.set_status(f"Library updated ({len(changes)} changed).")
+
+    def _apply_changes(self, changes: list[ItemChange]) -> None:
+        changed = self._repo.get_items(
+            c.item_id for c in changes if c.op is not ChangeOp.DELETE
+        )
+        # New rows only belong in the paged listing, and only if they pass
+        # the filter bar; search hits are left alone.
+        listing = not self._window.filter_text()
+        filters = self._window.current_filters()
+        for change in changes:
+            item = changed.get(change.item_id)
+            if change.op is ChangeOp.DELETE or item is None:
+                self.table_model.remove_item(change.item_id)
+                if self._window.detail.current_item_id() == change.item_id:
+                    self._window.detail.clear()
+                continue
+            summary = item.summary()
+            if not filters.matches(summary):
+                # Edited out of the filter bar's selection.
+                self.table_model.remove_item(change.item_id)
+            elif not self.table_model.update_item(summary):
+                if change.op is ChangeOp.INSERT and listing:
+                    self.table_model.insert_sorted(summary)
+
+    def on_filter_changed(self, _text: str) -> None:
+        # FTS5 keeps this fast enough to run on every keystroke.
+        self.refresh()
+        self._window.detail.clear()
 
     def selected_item_id(self) -> int | None:
         index = self._window.table.currentIndex()
@@ -111,16 +238,30 @@ class MainController(QObject):
         media_type = data["media_type"]
         status = data["status"]
 
-        self._repo.update_item(
-            item_id=item_id,
-            title=title,
-            media_type=media_type,
-            status=status,
-            rating=data["rating"],
-            notes=data["notes"],
+        def _saved(_: object) -> None:
+            item = self._repo.get_item(item_id)
+            if item is not None:
+                summary = item.summary()
+                if self._window.current_filters().matches(summary):
+                    # Row-level update: the selection stays on the row, even
+                    # if a new sort key moves it.
+                    self.table_model.update_item(summary)
+                else:
+                    self.table_model.remove_item(item_id)
+            self._window.set_status(f"Saved: {title}")
+
+        self._write(
+            lambda repo: repo.update_item(
+                item_id=item_id,
+                title=title,
+                media_type=media_type,
+                status=status,
+                rating=data["rating"],
+                notes=data["notes"],
+            ),
+            _saved,
         )
-        self.refresh(reselect_id=item_id)
-        self._window.set_status(f"Saved: {title}")
+        self._window.set_status(f"Saving: {title}…")
 
     def on_add_item(self) -> None:
         dlg = AddItemDialog(self._window)
@@ -136,32 +277,106 @@ class MainController(QObject):
             self._window.set_status("Title is required.")
             return
 
-        new_id = self._repo.add_item(
-            title=title,
-            media_type=data["media_type"],
-            status=data["status"],
-            rating=data["rating"],
-            notes=str(data["notes"]),
+        def _added(new_id: int) -> None:
+            self._show_new_item(new_id)
+            self._window.set_status(f"Added: {title}")
+
+        self._write(
+            lambda repo: repo.add_item(
+                title=title,
+                media_type=data["media_type"],
+                status=data["status"],
+                rating=data["rating"],
+                notes=str(data["notes"]),
+            ),
+            _added,
         )
-        self.refresh(reselect_id=new_id)
-        self._window.set_status(f"Added: {title}")
 
     def on_search_online(self) -> None:
         dlg = SearchOnlineDialog(self._window)
         dlg.search_requested.connect(lambda q: self._do_search(dlg, q))
+        dlg.more_requested.connect(
+            lambda q, offset: self._fetch_search_page(dlg, dlg.generation, q, offset)
+        )
         dlg.import_requested.connect(lambda r: self._import_result(dlg, r))
         dlg.exec()
+        self._cancel_search()
+
+    def _cancel_search(self) -> None:
+        # Cancelling a future cancels its asyncio task, aborting the request.
+        for future in self._search_futures:
+            future.cancel()
+        self._search_futures.clear()
 
     def _do_search(self, dlg: SearchOnlineDialog, query: str) -> None:
+        # Whatever is still in flight answers an outdated query.
+        self._cancel_search()
+        generation = dlg.begin_search()
+        self._fetch_search_page(dlg, generation, query, 0)
+
+    def _fetch_search_page(
+        self, dlg: SearchOnlineDialog, generation: int, query: str, offset: int
+    ) -> None:
+        # A small first page shows up fast; later ones amortise the round trip.
+        limit = self._OL_FIRST_PAGE if offset == 0 else self._OL_PAGE
+
+        def _show(results: list[OLResult]) -> None:
+            dlg.show_page(generation, offset, results, exhausted=len(results) < limit)
+
+        cached = self._search_cache.get(query, limit=limit, offset=offset)
+        # Stale first pages are shown while they refresh. Stale later pages
+        # are refetched instead: they would not line up with fresh ones.
+        if cached is not None and (offset == 0 or not cached.stale):
+            _show(cached.results)
+            if not cached.stale:
+                dlg.set_busy(False)
+                self._window.set_status("Search complete (cached).")
+                return
+            self._window.set_status("Showing cached results, refreshing...")
+        else:
+            self._window.set_status("Searching Open Library...")
         dlg.set_busy(True)
-        self._window.set_status("Searching Open Library...")
 
-        w = Worker(search_openlibrary, query, limit=25)
-        w.signals.result.connect(lambda results: dlg.set_results(results))
-        w.signals.error.connect(self._on_search_error)
-        w.signals.finished.connect(lambda: dlg.set_busy(False))
-        w.signals.result.connect(lambda _: self._window.set_status("Search complete."))
-        self._pool.start(cast(QRunnable, w))
+        def _done(results: list[OLResult]) -> None:
+            if dlg.is_current(generation):
+                _show(results)
+                self._window.set_status("Search complete.")
+
+        def _failed(tb: str) -> None:
+            if dlg.is_current(generation):
+                dlg.page_failed(generation)
+                self._on_search_error(tb)
+
+        def _finished() -> None:
+            self._search_futures.discard(future)
+            if dlg.is_current(generation) and not self._search_futures:
+                dlg.set_busy(False)
+
+        future = self._aio.submit(
+            self._search_and_cache(query, limit=limit, offset=offset)
+        )
+        self._search_futures.add(future)
+        watch_future(future, on_result=_done, on_error=_failed, on_finished=_finished)
+
+    async def _search_and_cache(
+        self, query: str, *, limit: int, offset: int
+    ) -> list[OLResult]:
+        started = time.perf_counter()
+        results = await self._ol.search(query, limit=limit, offset=offset)
+        # put() commits to cache.db, which other threads write too: never on
+        # the GUI thread, and a failed put does not fail the search.
+        try:
+            await asyncio.to_thread(
+                self._search_cache.put,
+                query,
+                limit=limit,
+                offset=offset,
+                results=results,
+                fetch_s=time.perf_counter() - started,
+            )
+        except sqlite3.Error as e:
+            print(f"Caching search results failed: {e!r}")
+        return results
 
     def _on_search_error(self, tb: str) -> None:
         self._window.set_status("Search failed (see console).")
@@ -172,21 +387,108 @@ class MainController(QObject):
             self._window.set_status("Cannot import empty title.")
             return
 
-        new_id = self._repo.add_item(
-            title=r.title,
-            media_type=MediaType.BOOK,
-            status=ItemStatus.BACKLOG,
-            rating=None,
-            notes="Imported from Open Library",
-            author=r.author,
-            first_publish_year=r.first_publish_year,
-            openlibrary_key=r.key or None,
-            cover_id=r.cover_i,
+        def _imported(new_id: int) -> None:
+            self._show_new_item(new_id)
+            self._window.set_status(f"Imported: {r.title}")
+
+        self._write(
+            lambda repo: repo.add_item(
+                title=r.title,
+                media_type=MediaType.BOOK,
+                status=ItemStatus.BACKLOG,
+                rating=None,
+                notes="Imported from Open Library",
+                author=r.author,
+                first_publish_year=r.first_publish_year,
+                openlibrary_key=r.key or None,
+                cover_id=r.cover_i,
+            ),
+            _imported,
         )
-        self.refresh(reselect_id=new_id)
-        self._window.set_status(f"Imported: {r.title}")
         dlg.accept()
 
+    def on_import_list(self) -> None:
+        if self._import_future is not None:
+            self._window.set_status("An import is already running.")
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self._window,
+            "Import ISBNs or titles",
+            "",
+            "Lists (*.csv *.txt);;All files (*)",
+        )
+        if not path:
+            return
+
+        signals = WorkerSignals()
+        signals.progress.connect(self._on_import_progress)
+        signals.result.connect(
+            lambda p: self._window.set_status(f"Import finished: {_import_summary(p)}")
+        )
+        signals.error.connect(self._on_import_error)
+        signals.finished.connect(self._on_import_finished)
+
+        # Rows land through the writer; the change feed puts them on screen.
+        job = import_file(
+            Path(path),
+            client=self._ol,
+            writer=self._writer,
+            on_progress=signals.progress.emit,
+        )
+        self._import_future = self._aio.submit(job)
+        watch_future(self._import_future, signals)
+        self._window.set_status(f"Importing {Path(path).name}...")
+
+    def _on_import_progress(self, progress: ImportProgress) -> None:
+        self._window.set_status(
+            f"Importing: {progress.done}/{progress.total} ({_import_summary(progress)})"
+        )
+
+    def _on_import_error(self, tb: str) -> None:
+        self._window.set_status("Import failed (see console); run it again to resume.")
+        print(tb)
+
+    def _on_import_finished(self) -> None:
+        self._import_future = None
+
+    def on_enrich(self) -> None:
+        # The same action starts and stops the job.
+        if self._enrich_future is not None:
+            self._enrich_future.cancel()
+            self._window.set_status("Metadata refresh stopped.")
+            return
+
+        signals = WorkerSignals()
+        signals.progress.connect(
+            lambda p: self._window.set_status(
+                f"Refreshing metadata: {p.checked} checked, {p.updated} updated"
+            )
+        )
+        signals.result.connect(
+            lambda p: self._window.set_status(
+                f"Metadata refresh done: {p.checked} checked, {p.updated} updated."
+            )
+        )
+        signals.error.connect(self._on_enrich_error)
+        signals.finished.connect(self._on_enrich_finished)
+
+        # Updates land through the writer; the change feed repaints the rows.
+        job = enrich_items(
+            client=self._ol, writer=self._writer, on_progress=signals.progress.emit
+        )
+        self._enrich_future = self._aio.submit(job)
+        watch_future(self._enrich_future, signals)
+        self._window.set_enrich_running(True)
+        self._window.set_status("Refreshing metadata from Open Library...")
+
+    def _on_enrich_error(self, tb: str) -> None:
+        self._window.set_status("Metadata refresh failed (see console).")
+        print(tb)
+
+    def _on_enrich_finished(self) -> None:
+        self._enrich_future = None
+        self._window.set_enrich_running(False)
+
     def _load_cover_for_item(self, item: Item) -> None:
         # Guard against races when clicking around quickly
         self._current_cover_item_id = item.id
@@ -194,37 +496,64 @@ class MainController(QObject):
 
         cover_id = item.cover_id
         if not cover_id:
-            self._window.detail.set_cover_path(None)
+            self._window.detail.set_cover_image(None)
             return
 
-        w = Worker(fetch_cover_to_cache, cover_id, size="M")
-        w.signals.result.connect(lambda p: self._on_cover_ready(item.id, cover_id, p))
-        w.signals.error.connect(lambda tb: print(tb))
-        self._pool.start(cast(QRunnable, w))
+        detail = self._window.detail
+        key = detail.cover_key(cover_id)
+        if detail.show_cached_cover(key):
+            return
+
+        # Decoded and scaled off the GUI thread. If the table already asked
+        # for this cover, the download itself is shared.
+        size = detail.cover_target_size()
+        job = self._ol.fetch_cover_image(
+            cover_id, width=size.width(), height=size.height()
+        )
+
+        def _failed(tb: str) -> None:
+            print(tb.splitlines()[-1])
+            self._on_cover_ready(item.id, cover_id, None, None)
 
-    def _on_cover_ready(self, item_id: int, cover_id: int, path: Path | None) -> None:
+        watch_future(
+            self._aio.submit(job),
+            on_result=lambda img: self._on_cover_ready(item.id, cover_id, img, key),
+            on_error=_failed,
+        )
+
+    def _on_cover_ready(
+        self,
+        item_id: int,
+        cover_id: int,
+        image: QImage | None,
+        key: PixmapKey | None,
+    ) -> None:
         # Only update UI if we're still on the same selected item/cover
         if self._current_cover_item_id != item_id:
             return
         if self._current_cover_cover_id != cover_id:
             return
 
-        # Worker returns Path | None; keep it simple
-        self._window.detail.set_cover_path(path)
+        self._window.detail.set_cover_image(image, key=key)
 
     def _on_cover_requested(self, cover_id: int) -> None:
-        w = Worker(fetch_cover_to_cache, cover_id, size="M")
+        # Many of these are in flight at once while scrolling; the client's
+        # semaphores bound them, and a cover the detail pane is already
+        # fetching shares that download. The thumbnail comes back decoded.
+        job = self._ol.fetch_thumbnail(cover_id, scale=self.table_model.thumb_scale)
 
-        def _done(p: Path | None) -> None:
-            self.table_model.set_cover_ready(cover_id, ok=(p is not None))
+        def _done(image: QImage | None) -> None:
+            self.table_model.set_cover_image(cover_id, image)
 
         def _err(tb: str) -> None:
-            print(tb)
-            self.table_model.set_cover_ready(cover_id, ok=False)
+            # Already retried with backoff, or the circuit is open. The miss
+            # store holds the cover back for a while (for a refusal, until
+            # the breaker tries again). The row keeps the loading
+            # placeholder and is asked for again after that.
+            print(tb.splitlines()[-1])
+            self.table_model.set_cover_retryable(cover_id)
 
-        w.signals.result.connect(_done)
-        w.signals.error.connect(_err)
-        self._pool.start(cast(QRunnable, w))
+        watch_future(self._aio.submit(job), on_result=_done, on_error=_err)
 
     def on_delete_item(self) -> None:
         item_id = self._window.selected_item_id()
@@ -245,16 +574,57 @@ class MainController(QObject):
         if btn != QMessageBox.StandardButton.Yes:
             return
 
-        deleted = self._repo.delete_item(item_id)
-        if not deleted:
-            self._window.set_status("Item was not found (already deleted?).")
-            return
+        def _deleted(deleted: bool) -> None:
+            if not deleted:
+                self._window.set_status("Item was not found (already deleted?).")
+                return
+
+            # Drop just that row + clear details (selection is now gone)
+            self.table_model.remove_item(item_id)
+            if self._window.detail.current_item_id() == item_id:
+                self._window.detail.clear()
+            self._window.set_status(f"Deleted {title} (#{item_id}).")
+
+        self._write(lambda repo: repo.delete_item(item_id), _deleted)
+
+    def _write(
+        self,
+        fn: Callable[[ItemRepository], T],
+        on_done: Callable[[T], None],
+    ) -> None:
+        # Queue on the writer thread; on_done runs back on the GUI thread
+        # once the write is committed.
+        watch_future(
+            self._writer.submit(fn), on_result=on_done, on_error=self._on_write_error
+        )
 
-        # Refresh list + clear details (selection might now be invalid)
-        self.refresh()
-        self._window.detail.clear()
-        self._window.set_status(f"Deleted {title} (#{item_id}).")
+    def _on_write_error(self, tb: str) -> None:
+        self._window.set_status("Saving to the database failed (see console).")
+        print(tb)
 
     def _shutdown(self) -> None:
-        # stop scheduling new work first (optional flag)
-        self._pool.waitForDone(2000)  # milliseconds; bump if you want
+        # Both jobs record what they committed; the next run resumes.
+        for job in (self._import_future, self._enrich_future):
+            if job is not None:
+                job.cancel()
+        self._writer.close(timeout=5.0)  # flush queued writes
+        try:
+            self._aio.submit(self._ol.aclose()).result(timeout=2.0)
+        except Exception as e:  # shutting down anyway
+            print(f"Closing the Open Library client failed: {e!r}")
+        self._aio.close(timeout=2.0)
+        self._search_cache.close()
+        self._cover_misses.close()
+        self._cover_cache.close()  # saves recent access times for LRU
+        self._repo.close()
+
+
+def _import_summary(p: ImportProgress) -> str:
+    parts = [f"{p.imported} added", f"{p.duplicates} already in library"]
+    if p.not_found:
+        parts.append(f"{p.not_found} not found")
+    if p.failed:
+        parts.append(f"{p.failed} failed")
+    if p.skipped:
+        parts.append(f"{p.skipped} done earlier")
+    return ", ".join(parts)
@@ -0,0 +1,106 @@
+"""
+Row-decode microbenchmark: rows/sec for full-item listing.
+
+    python -m library_app.dev.bench_decode [rows]
+
+"before" replays the original decode (sqlite3.Row, a cast per field,
+Enum(value) lookups, non-slotted dataclass); "after" is
+ItemRepository.list_items as it is now.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from library_app.model.db import connect
+from library_app.model.entities import NewItem
+from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.repository import _ITEM_COLUMNS, ItemRepository
+
+
+@dataclass(frozen=True)
+class _LegacyItem:
+    id: int
+    title: str
+    media_type: MediaType
+    status: ItemStatus
+    rating: int | None = None
+    notes: str = ""
+    author: str = ""
+    first_publish_year: int | None = None
+    openlibrary_key: str | None = None
+    cover_id: int | None = None
+
+
+def _legacy_from_row(row: Any) -> _LegacyItem:
+    return _LegacyItem(
+        id=cast(int, row["id"]),
+        title=cast(str, row["title"]),
+        media_type=MediaType(cast(str, row["media_type"])),
+        status=ItemStatus(cast(str, row["status"])),
+        rating=cast(int | None, row["rating"]),
+        notes=cast(str, row["notes"]) if row["notes"] is not None else "",
+        author=cast(str, row["author"]) if row["author"] is not None else "",
+        first_publish_year=cast(int | None, row["first_publish_year"]),
+        openlibrary_key=cast(str | None, row["openlibrary_key"]),
+        cover_id=cast(int | None, row["cover_id"]),
+    )
+
+
+def _legacy_list(conn: sqlite3.Connection) -> int:
+    rows = conn.execute(
+        f"SELECT {_ITEM_COLUMNS} FROM items ORDER BY id DESC"
+    ).fetchall()
+    return len([_legacy_from_row(row) for row in rows])
+
+
+def _best_rate(fn: Callable[[], int], repeat: int = 5) -> float:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main(argv: list[str]) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(Path(tmp) / "bench.db")
+        repo = ItemRepository(conn)
+        statuses = list(ItemStatus)
+        repo.add_items(
+            NewItem(
+                title=f"Title {i}",
+                media_type=MediaType.BOOK,
+                status=statuses[i % len(statuses)],
+                rating=i % 6 or None,
+                notes="n" * 40,
+                author=f"Author {i % 997}",
+                first_publish_year=1900 + i % 120,
+                openlibrary_key=f"/works/OL{i}W",
+                cover_id=i,
+            )
+            for i in range(n)
+        )
+
+        before = _best_rate(lambda: _legacy_list(conn))
+        after = _best_rate(lambda: len(repo.list_items()))
+        conn.close()
+
+    print(f"rows:   {n}")
+    print(f"before: {before:12,.0f} rows/s")
+    print(f"after:  {after:12,.0f} rows/s  ({after / before:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -3,7 +3,7 @@ from library_app.model.repository import ItemRepository
 
 
 def _ensure_sample_data(repo: ItemRepository) -> None:
-    if repo.list_items():
+    if repo.list_items_page(limit=1):
         return
     repo.add_item(
         title="The Hobbit",
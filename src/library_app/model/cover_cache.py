@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Final, Protocol
+
+from library_app.model.db import CACHE_DB_PATH, connect
+
+COVER_CACHE_BUDGET: Final[int] = 256 * 1024 * 1024  # bytes on disk
+# Eviction goes a bit below the budget so every store does not trigger one.
+_EVICT_TO: Final[float] = 0.9
+
+_Key = tuple[int, str]
+
+
+@dataclass(slots=True)
+class _Entry:
+    nbytes: int
+    last_access: float
+    offset: int = 0  # where the bytes start, for backends that pack them
+
+
+class CoverStore(Protocol):
+    """What covers.py needs from a cover cache backend."""
+
+    @property
+    def root(self) -> Path: ...
+
+    def path(self, cover_id: int, size: str) -> Path: ...
+
+    def contains(self, cover_id: int, size: str) -> bool: ...
+
+    def read(self, cover_id: int, size: str) -> bytes | None: ...
+
+    def put(self, cover_id: int, size: str, data: bytes) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class CoverCache:
+    """
+    Cover images on disk, bounded by a byte budget.
+
+    One file per (cover_id, size) under `root`; `size` is an Open Library
+    size (S, M, L) or a thumbnail tier. An index of every file with its
+    length and last access lives in the cache database and is loaded up
+    front, so "is it cached?" never stats the disk. When a store takes the
+    total over `budget_bytes`, a background thread deletes the least
+    recently used files. Thread-safe: `_lock` guards only the in-memory
+    index, so lookups never wait on a commit or an unlink.
+
+    Subclasses store the bytes differently (see PackedCoverCache) through
+    the _write/_read_data/_discard hooks and their own index table.
+    """
+
+    _SCHEMA: ClassVar[str] = """
+        CREATE TABLE IF NOT EXISTS cover_files (
+            cover_id    INTEGER NOT NULL,
+            size        TEXT    NOT NULL,
+            bytes       INTEGER NOT NULL,
+            last_access REAL    NOT NULL,
+            PRIMARY KEY (cover_id, size)
+        )
+    """
+    _TABLE: ClassVar[str] = "cover_files"
+    _SELECT: ClassVar[str] = (
+        "SELECT cover_id, size, bytes, last_access, 0 FROM cover_files"
+    )
+    _UPSERT: ClassVar[str] = """
+        INSERT OR REPLACE INTO cover_files (cover_id, size, bytes, last_access)
+        VALUES (:cover_id, :size, :bytes, :last_access)
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        db_path: Path = CACHE_DB_PATH,
+        *,
+        budget_bytes: int = COVER_CACHE_BUDGET,
+    ) -> None:
+        self._root = root
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._budget = budget_bytes
+        self._lock = threading.Lock()
+        # The connection; taken before _lock when both are needed.
+        self._db_lock = threading.Lock()
+        self._conn = connect(db_path, shared=True)
+        self._conn.execute(self._SCHEMA)
+        self._files: dict[_Key, _Entry] = self._load_index()
+        if not self._files:
+            self._adopt_existing()
+        self._total = sum(e.nbytes for e in self._files.values())
+        # Reads only bump access times in memory; written back in batches.
+        self._touched: set[_Key] = set()
+        self._evicting = False
+        self._closed = False
+        self._maybe_evict()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total
+
+    def path(self, cover_id: int, size: str) -> Path:
+        return self._root / f"{cover_id}-{size}.jpg"
+
+    def contains(self, cover_id: int, size: str) -> bool:
+        with self._lock:
+            return (cover_id, size) in self._files
+
+    def read(self, cover_id: int, size: str) -> bytes | None:
+        """The stored bytes, or None if there are none. Counts as a use."""
+        key = (cover_id, size)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None:
+                return None
+            entry.last_access = time.time()
+            self._touched.add(key)
+        data = self._read_data(key)
+        if data is None:
+            # Deleted behind our back (e.g. the folder was cleared).
+            self._drop([key])
+        return data
+
+    def put(self, cover_id: int, size: str, data: bytes) -> None:
+        """Store `data` and index it; may start a background eviction."""
+        key = (cover_id, size)
+        offset = self._write(key, data)
+        entry = _Entry(len(data), time.time(), offset)
+        with self._lock:
+            old = self._files.get(key)
+            self._total += entry.nbytes - (old.nbytes if old else 0)
+            self._files[key] = entry
+        if old is not None:
+            self._superseded(key, old)
+        self._sync([key])
+        self._maybe_evict()
+
+    def evict(self) -> int:
+        """Delete least recently used files until under budget; bytes freed."""
+        self._flush_access()
+        with self._lock:
+            if self._closed:
+                return 0
+            excess = self._total - int(self._budget * _EVICT_TO)
+            if self._total <= self._budget or excess <= 0:
+                return 0
+            by_age = sorted(self._files.items(), key=lambda kv: kv[1].last_access)
+            victims: list[_Key] = []
+            for key, entry in by_age:
+                if excess <= 0:
+                    break
+                victims.append(key)
+                excess -= entry.nbytes
+        freed = self._drop(victims)
+        self._after_evict()
+        return freed
+
+    def close(self) -> None:
+        self._flush_access()
+        with self._db_lock:
+            with self._lock:
+                self._closed = True
+            self._conn.close()
+
+    def _drop(self, keys: list[_Key]) -> int:
+        freed = 0
+        dropped: list[_Key] = []
+        for key in keys:
+            # One at a time, so lookups and stores are never held up long.
+            with self._lock:
+                if self._closed:
+                    break
+                entry = self._files.pop(key, None)
+                if entry is None:
+                    continue
+                self._total -= entry.nbytes
+                self._touched.discard(key)
+            self._discard(key, entry)
+            freed += entry.nbytes
+            dropped.append(key)
+        self._sync(dropped)
+        return freed
+
+    def _sync(self, keys: list[_Key]) -> None:
+        """
+        Write the index rows of `keys` as they are in memory now.
+
+        Rows are read under the connection lock, so when a store and a drop
+        of the same key race, whichever commits last still writes the
+        current state.
+        """
+        if not keys:
+            return
+        with self._db_lock:
+            with self._lock:
+                if self._closed:
+                    return
+                rows = [
+                    self._row(key, entry)
+                    for key in keys
+                    if (entry := self._files.get(key)) is not None
+                ]
+                gone = [key for key in keys if key not in self._files]
+            self._conn.executemany(self._UPSERT, rows)
+            self._conn.executemany(
+                f"DELETE FROM {self._TABLE} WHERE cover_id = ? AND size = ?", gone
+            )
+            self._conn.commit()
+
+    def _maybe_evict(self) -> None:
+        with self._lock:
+            if self._evicting or self._total <= self._budget:
+                return
+            self._evicting = True
+
+        def run() -> None:
+            try:
+                self.evict()
+            finally:
+                with self._lock:
+                    self._evicting = False
+
+        threading.Thread(target=run, name="cover-cache-evict", daemon=True).start()
+
+    def _flush_access(self) -> None:
+        with self._db_lock:
+            with self._lock:
+                if self._closed or not self._touched:
+                    return
+                rows = [
+                    (self._files[key].last_access, *key)
+                    for key in self._touched
+                    if key in self._files
+                ]
+                self._touched.clear()
+            self._conn.executemany(
+                f"UPDATE {self._TABLE} SET last_access = ?"
+                " WHERE cover_id = ? AND size = ?",
+                rows,
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _row(key: _Key, entry: _Entry) -> dict[str, object]:
+        return {
+            "cover_id": key[0],
+            "size": key[1],
+            "bytes": entry.nbytes,
+            "last_access": entry.last_access,
+            "offset": entry.offset,
+        }
+
+    def _load_index(self) -> dict[_Key, _Entry]:
+        return {
+            (cover_id, size): _Entry(nbytes, last_access, offset)
+            for cover_id, size, nbytes, last_access, offset in self._conn.execute(
+                self._SELECT
+            )
+        }
+
+    def _loose_files(self) -> list[tuple[_Key, Path]]:
+        """Cover files directly under root, by the name path() gives them."""
+        found = []
+        for path in self._root.glob("*-*.jpg"):
+            cover_id, _, size = path.stem.partition("-")
+            if cover_id.isdigit() and not path.name.startswith("."):
+                found.append(((int(cover_id), size), path))
+        return found
+
+    # Storage hooks: one file per cover.
+
+    def _write(self, key: _Key, data: bytes) -> int:
+        """
+        Store the bytes (tmp + rename); returns the offset to index.
+
+        Each writer gets its own temp file, so two downloads of the same
+        cover never interleave; the last rename wins with a complete file.
+        """
+        path = self.path(*key)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self._root, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        tmp = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            tmp.replace(path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return 0
+
+    def _read_data(self, key: _Key) -> bytes | None:
+        try:
+            return self.path(*key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _discard(self, key: _Key, entry: _Entry) -> None:
+        """Free a dropped entry's bytes. Called without the lock."""
+        self.path(*key).unlink(missing_ok=True)
+
+    def _superseded(self, key: _Key, entry: _Entry) -> None:
+        """A put replaced `entry`. Called without the lock."""
+        # Nothing to do: the rename already replaced the file.
+
+    def _after_evict(self) -> None:
+        pass
+
+    def _adopt_existing(self) -> None:
+        """Index files cached before there was an index (one-off scan)."""
+        rows = []
+        for key, path in self._loose_files():
+            st = path.stat()
+            if st.st_size == 0:
+                continue
+            entry = _Entry(st.st_size, st.st_mtime)
+            self._files[key] = entry
+            rows.append(self._row(key, entry))
+        self._conn.executemany(self._UPSERT, rows)
+        self._conn.commit()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Final
+
+from library_app.model.db import CACHE_DB_PATH, connect
+from library_app.model.resilience import BREAKER_RESET_S
+
+
+class CoverUnavailableError(Exception):
+    """A recent attempt failed; not asking again until its TTL runs out."""
+
+
+class MissKind(Enum):
+    NOT_FOUND = "not_found"  # Open Library answered 404: there is no such cover
+    ERROR = "error"  # any other failure; worth another try soon
+    REFUSED = "refused"  # the circuit was open: nothing wrong with the cover
+
+
+MISS_TTL_S: Final[dict[MissKind, float]] = {
+    MissKind.NOT_FOUND: 7 * 24 * 3600.0,
+    MissKind.ERROR: 15 * 60.0,
+    # About when the breaker lets a trial call through again.
+    MissKind.REFUSED: BREAKER_RESET_S,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cover_misses (
+    cover_id  INTEGER NOT NULL,
+    size      TEXT    NOT NULL,
+    kind      TEXT    NOT NULL,
+    failed_at REAL    NOT NULL,
+    PRIMARY KEY (cover_id, size)
+)
+"""
+
+
+class CoverMisses:
+    """
+    Persistent negative cache: covers we recently failed to get.
+
+    Remembered per (cover_id, size) with the kind of failure, each kind with
+    its own TTL, so a restart does not re-request every missing cover. All
+    live entries are loaded up front: lookups happen while painting and
+    never touch the disk. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = CACHE_DB_PATH,
+        *,
+        ttl_s: dict[MissKind, float] | None = None,
+    ) -> None:
+        self._ttl_s = {**MISS_TTL_S, **(ttl_s or {})}
+        self._lock = threading.Lock()  # the in-memory entries
+        self._db_lock = threading.Lock()  # the connection
+        self._conn = connect(db_path, shared=True)
+        self._conn.execute(_SCHEMA)
+        self._misses: dict[tuple[int, str], tuple[MissKind, float]] = {}
+
+        now = time.time()
+        expired = []
+        for cover_id, size, kind_value, failed_at in self._conn.execute(
+            "SELECT cover_id, size, kind, failed_at FROM cover_misses"
+        ):
+            kind = MissKind(kind_value)
+            if now - failed_at < self._ttl_s[kind]:
+                self._misses[(cover_id, size)] = (kind, failed_at)
+            else:
+                expired.append((cover_id, size))
+        self._conn.executemany(
+            "DELETE FROM cover_misses WHERE cover_id = ? AND size = ?", expired
+        )
+        self._conn.commit()
+
+    def get(self, cover_id: int, size: str) -> MissKind | None:
+        """Why this cover is currently not worth requesting, if it is not."""
+        with self._lock:
+            entry = self._misses.get((cover_id, size))
+            if entry is None:
+                return None
+            kind, failed_at = entry
+            # An expired entry stays until forget() (the cover arrived) or
+            # the next start drops it.
+            return kind if time.time() - failed_at < self._ttl_s[kind] else None
+
+    def expires_in(self, cover_id: int, size: str) -> float | None:
+        """Seconds until this cover is worth requesting again; None if it is."""
+        with self._lock:
+            entry = self._misses.get((cover_id, size))
+            if entry is None:
+                return None
+            kind, failed_at = entry
+            left = failed_at + self._ttl_s[kind] - time.time()
+            return left if left > 0 else None
+
+    def record(self, cover_id: int, size: str, kind: MissKind) -> None:
+        now = time.time()
+        with self._lock:
+            self._misses[(cover_id, size)] = (kind, now)
+        # The commit happens outside _lock, so get() (called while painting)
+        # never waits on the disk.
+        with self._db_lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO cover_misses (cover_id, size, kind, failed_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (cover_id, size, kind.value, now),
+            )
+            self._conn.commit()
+
+    def forget(self, cover_id: int, size: str) -> None:
+        """The cover arrived after all."""
+        with self._lock:
+            if self._misses.pop((cover_id, size), None) is None:
+                return
+        with self._db_lock:
+            self._conn.execute(
+                "DELETE FROM cover_misses WHERE cover_id = ? AND size = ?",
+                (cover_id, size),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
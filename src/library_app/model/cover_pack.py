@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import BinaryIO, ClassVar, Final
+
+from library_app.model.cover_cache import COVER_CACHE_BUDGET, CoverCache, _Entry, _Key
+from library_app.model.db import CACHE_DB_PATH
+
+# Rewrite the pack once this share of it is garbage (evicted or replaced).
+COMPACT_DEAD_RATIO: Final[float] = 0.5
+# ...but not for a few stray thumbnails.
+_COMPACT_MIN_DEAD: Final[int] = 4 * 1024 * 1024
+# Covers appended past the mapping are read from the file until this much
+# has piled up; then the pack is mapped again.
+_REMAP_STEP: Final[int] = 1024 * 1024
+
+_META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cover_pack_meta (
+    id         INTEGER PRIMARY KEY CHECK (id = 0),
+    generation INTEGER NOT NULL
+)
+"""
+
+
+class PackedCoverCache(CoverCache):
+    """
+    Cover images appended to one pack file, read through mmap.
+
+    Same budget, index and LRU as CoverCache, but instead of one small file
+    per cover there is a single append-only covers-<generation>.pack; the
+    index records each cover's offset and length. Reads slice the mapping,
+    so a cached cover costs no open/read/close. Evicting only forgets an
+    entry; compact() rewrites the live entries into the next generation
+    once enough of the pack is garbage, and the generation switches in the
+    same transaction as the new offsets, so a crash leaves either pack
+    consistent with the index.
+
+    path() exists for callers that need a real file: it extracts the cover
+    under root/extracted on demand.
+    """
+
+    _SCHEMA: ClassVar[str] = """
+        CREATE TABLE IF NOT EXISTS cover_pack (
+            cover_id    INTEGER NOT NULL,
+            size        TEXT    NOT NULL,
+            offset      INTEGER NOT NULL,
+            bytes       INTEGER NOT NULL,
+            last_access REAL    NOT NULL,
+            PRIMARY KEY (cover_id, size)
+        )
+    """
+    _TABLE: ClassVar[str] = "cover_pack"
+    _SELECT: ClassVar[str] = (
+        "SELECT cover_id, size, bytes, last_access, offset FROM cover_pack"
+    )
+    _UPSERT: ClassVar[str] = """
+        INSERT OR REPLACE INTO cover_pack (cover_id, size, offset, bytes, last_access)
+        VALUES (:cover_id, :size, :offset, :bytes, :last_access)
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        db_path: Path = CACHE_DB_PATH,
+        *,
+        budget_bytes: int = COVER_CACHE_BUDGET,
+    ) -> None:
+        # Appends, compaction and close; taken before the other locks, never
+        # after. The append handle is only used under it.
+        self._pack_lock = threading.Lock()
+        # The mapping and the read handle; taken after _db_lock, before _lock.
+        # _generation only changes under both this and _lock.
+        self._map_lock = threading.Lock()
+        self._generation = 0
+        self._append: BinaryIO | None = None
+        self._reader: BinaryIO | None = None
+        self._map: mmap.mmap | None = None
+        self._dead = 0
+        super().__init__(root, db_path, budget_bytes=budget_bytes)
+
+    @property
+    def pack_path(self) -> Path:
+        return self._pack_file(self._generation)
+
+    @property
+    def dead_bytes(self) -> int:
+        with self._lock:
+            return self._dead
+
+    def path(self, cover_id: int, size: str) -> Path:
+        target = self._extracted((cover_id, size))
+        if not target.exists():
+            data = self._read_data((cover_id, size))
+            if data is not None:
+                target.parent.mkdir(exist_ok=True)
+                target.write_bytes(data)
+        return target
+
+    def put(self, cover_id: int, size: str, data: bytes) -> None:
+        # Held from append to index update, so compaction never misses one.
+        with self._pack_lock:
+            super().put(cover_id, size, data)
+
+    def compact(self) -> int:
+        """Rewrite the live entries into a new pack; returns bytes reclaimed."""
+        with self._pack_lock:
+            with self._lock:
+                if self._closed or self._dead == 0:
+                    return 0
+                live = sorted(
+                    ((k, e.offset, e.nbytes) for k, e in self._files.items()),
+                    key=lambda t: t[1],
+                )
+                old_generation = self._generation
+            old_size = self._append_end()
+            # Only appends change the pack, and they wait for _pack_lock, so
+            # the copy (from a mapping of its own) blocks no one.
+            generation = old_generation + 1
+            offsets: dict[_Key, int] = {}
+            with (
+                self._pack_file(old_generation).open("rb") as src,
+                mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as copy_from,
+                self._pack_file(generation).open("wb") as out,
+            ):
+                for key, offset, nbytes in live:
+                    offsets[key] = out.tell()
+                    out.write(copy_from[offset : offset + nbytes])
+                out.flush()
+                os.fsync(out.fileno())
+                new_size = out.tell()
+            append = self._pack_file(generation).open("ab")
+
+            # Held until the swap, so no _sync() writes an old offset back
+            # between the commit and the in-memory update.
+            with self._db_lock:
+                self._conn.executemany(
+                    f"UPDATE {self._TABLE} SET offset = ? WHERE cover_id = ? AND size = ?",
+                    [(offset, *key) for key, offset in offsets.items()],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cover_pack_meta (id, generation)"
+                    " VALUES (0, ?)",
+                    (generation,),
+                )
+                self._conn.commit()
+                with self._map_lock, self._lock:
+                    for key, offset in offsets.items():
+                        entry = self._files.get(key)
+                        if entry is not None:  # not evicted during the copy
+                            entry.offset = offset
+                    old_append, old_reader, old_map = (
+                        self._append,
+                        self._reader,
+                        self._map,
+                    )
+                    self._append, self._reader, self._map = append, None, None
+                    self._generation = generation
+                    self._dead = new_size - self._total
+
+            # Nothing can reach the old handles any more.
+            for handle in (old_map, old_reader, old_append):
+                if handle is not None:
+                    handle.close()
+            self._pack_file(old_generation).unlink(missing_ok=True)
+            return old_size - new_size
+
+    def close(self) -> None:
+        # Waits for a compaction still copying on the eviction thread.
+        with self._pack_lock:
+            super().close()
+            with self._map_lock:
+                self._close_pack()
+
+    def _extracted(self, key: _Key) -> Path:
+        return self._root / "extracted" / f"{key[0]}-{key[1]}.jpg"
+
+    def _pack_file(self, generation: int) -> Path:
+        return self._root / f"covers-{generation}.pack"
+
+    def _open_pack(self) -> None:
+        # Only from __init__; compact() opens the next generation itself.
+        self._append = self._pack_file(self._generation).open("ab")
+
+    def _close_pack(self) -> None:
+        # Caller holds _pack_lock and _map_lock.
+        for handle in (self._map, self._reader, self._append):
+            if handle is not None:
+                handle.close()
+        self._map = None
+        self._reader = None
+        self._append = None
+
+    def _append_end(self) -> int:
+        assert self._append is not None
+        return self._append.tell()
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        """Bytes [start, end) of the current pack. Caller holds _map_lock."""
+        if self._reader is None:
+            self._reader = self._pack_file(self._generation).open("rb")
+        mapped = 0 if self._map is None else len(self._map)
+        if end > mapped and (self._map is None or end - mapped >= _REMAP_STEP):
+            if self._map is not None:
+                self._map.close()
+            # The whole pack as it is now; later appends are read from the
+            # file until they are worth another mapping.
+            self._map = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+            mapped = len(self._map)
+        if self._map is not None and end <= mapped:
+            # One copy out of the page cache, no syscall: QImage.fromData in
+            # PySide6 does not accept a memoryview of the map itself.
+            return self._map[start:end]
+        self._reader.seek(start)
+        return self._reader.read(end - start)
+
+    def _load_index(self) -> dict[_Key, _Entry]:
+        self._conn.execute(_META_SCHEMA)
+        row = self._conn.execute(
+            "SELECT generation FROM cover_pack_meta WHERE id = 0"
+        ).fetchone()
+        self._generation = row[0] if row else 0
+        # Leftovers of a compaction that crashed before or after its commit.
+        for stray in self._root.glob("covers-*.pack"):
+            if stray != self.pack_path:
+                stray.unlink(missing_ok=True)
+        # Extracted copies are re-made on demand; they may be out of date.
+        shutil.rmtree(self._root / "extracted", ignore_errors=True)
+        self._open_pack()
+        end = self._append_end()
+
+        files = super()._load_index()
+        # An append the index never heard of is garbage; an index entry past
+        # the end of the pack (the file was truncated or replaced) is lost.
+        lost = [k for k, e in files.items() if e.offset + e.nbytes > end]
+        for key in lost:
+            del files[key]
+        self._conn.executemany(
+            f"DELETE FROM {self._TABLE} WHERE cover_id = ? AND size = ?", lost
+        )
+        self._conn.commit()
+        self._dead = end - sum(e.nbytes for e in files.values())
+        return files
+
+    # Storage hooks: one pack file.
+
+    def _write(self, key: _Key, data: bytes) -> int:
+        # Caller holds _pack_lock: appends are serialized.
+        assert self._append is not None
+        offset = self._append.tell()
+        self._append.write(data)
+        self._append.flush()  # visible to readers before it is indexed
+        return offset
+
+    def _read_data(self, key: _Key) -> bytes | None:
+        while True:
+            with self._lock:
+                entry = self._files.get(key)
+                if entry is None or self._closed:
+                    return None
+                generation, start = self._generation, entry.offset
+                end = start + entry.nbytes
+            with self._map_lock:
+                if self._closed:
+                    return None
+                if generation == self._generation:
+                    return self._read_range(start, end)
+            # Compacted in between: the offset is stale, look it up again.
+
+    def _discard(self, key: _Key, entry: _Entry) -> None:
+        with self._lock:
+            self._dead += entry.nbytes
+        self._extracted(key).unlink(missing_ok=True)
+
+    def _superseded(self, key: _Key, entry: _Entry) -> None:
+        self._discard(key, entry)
+
+    def _after_evict(self) -> None:
+        with self._lock:
+            worth_it = (
+                self._dead >= _COMPACT_MIN_DEAD
+                and self._dead >= COMPACT_DEAD_RATIO * (self._dead + self._total)
+            )
+        if worth_it:
+            self.compact()
+
+    def _adopt_existing(self) -> None:
+        """Move a per-file cover cache into the pack (one-off)."""
+        # The per-file index, if that cache ever ran here; its rows for the
+        # moved files go in the same transaction as the new ones.
+        loose_index = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (CoverCache._TABLE,),
+        ).fetchone()
+        for key, path in self._loose_files():
+            data = path.read_bytes()
+            if data:
+                with self._pack_lock:
+                    offset = self._write(key, data)
+                entry = _Entry(len(data), path.stat().st_mtime, offset)
+                self._files[key] = entry
+                self._conn.execute(self._UPSERT, self._row(key, entry))
+            if loose_index:
+                self._conn.execute(
+                    f"DELETE FROM {CoverCache._TABLE} WHERE cover_id = ? AND size = ?",
+                    key,
+                )
+            path.unlink()
+        self._conn.commit()
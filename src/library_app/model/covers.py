@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+import functools
+import os
+import threading
 from pathlib import Path
 
 import httpx
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QImage, QImageWriter
+
+from library_app.model.cover_cache import CoverCache, CoverStore
+from library_app.model.cover_pack import PackedCoverCache
+
+# List thumbnails, by device pixel ratio: 1x and a 2x tier for HiDPI screens.
+THUMB_SIZES: dict[int, tuple[int, int]] = {1: (32, 48), 2: (64, 96)}
 
 
 def _project_root() -> Path:
@@ -10,12 +21,42 @@ def _project_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
+@functools.cache
 def cover_cache_dir() -> Path:
+    # Created once, not on every lookup: lookups happen while painting.
     d = _project_root() / "data" / "covers"
     d.mkdir(parents=True, exist_ok=True)
     return d
 
 
+_cache: CoverStore | None = None
+_cache_lock = threading.Lock()
+
+
+def cover_cache() -> CoverStore:
+    """
+    The process-wide cover cache, opened on first use.
+
+    LIBRARY_COVER_STORE=pack keeps covers in one pack file instead of a file
+    per cover; existing covers move over on the first start.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if os.environ.get("LIBRARY_COVER_STORE") == "pack":
+                _cache = PackedCoverCache(cover_cache_dir())
+            else:
+                _cache = CoverCache(cover_cache_dir())
+        return _cache
+
+
+def set_cover_cache(cache: CoverStore | None) -> None:
+    """Use `cache` from now on (None: open the default one again lazily)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
 def cover_url(cover_id: int, *, size: str = "M") -> str:
     # Open Library Covers API: https://covers.openlibrary.org/
     # size: S, M, L
@@ -23,7 +64,93 @@ def cover_url(cover_id: int, *, size: str = "M") -> str:
 
 
 def cached_cover_path(cover_id: int, *, size: str = "M") -> Path:
-    return cover_cache_dir() / f"{cover_id}-{size}.jpg"
+    return cover_cache().path(cover_id, size)
+
+
+def is_cover_cached(cover_id: int, *, size: str = "M") -> bool:
+    """Answered from the cache index; no filesystem access."""
+    return cover_cache().contains(cover_id, size)
+
+
+def store_cover(cover_id: int, data: bytes, *, size: str = "M") -> None:
+    """Write downloaded bytes into the cache; may evict old covers."""
+    cover_cache().put(cover_id, size, data)
+
+
+def _thumb_size(scale: int) -> str:
+    w, h = THUMB_SIZES[scale]
+    return f"t{w}x{h}"
+
+
+def thumb_path(cover_id: int, *, scale: int = 1) -> Path:
+    return cover_cache().path(cover_id, _thumb_size(scale))
+
+
+def has_thumbnails(cover_id: int) -> bool:
+    cache = cover_cache()
+    return all(cache.contains(cover_id, _thumb_size(s)) for s in THUMB_SIZES)
+
+
+def _encode_jpeg(image: QImage) -> bytes:
+    buf = QBuffer()
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    writer = QImageWriter(buf, QByteArray(b"jpg"))
+    writer.setQuality(90)
+    if not writer.write(image):
+        raise OSError(f"could not encode thumbnail: {writer.errorString()}")
+    return bytes(buf.data().data())
+
+
+def ensure_thumbnails(cover_id: int, source: bytes) -> bool:
+    """
+    Pre-scale the cover `source` into every THUMB_SIZES tier, once.
+
+    The list then loads a few-KB image instead of decoding and smoothing a
+    full M-size JPEG while painting. Safe off the GUI thread (QImage only).
+    Returns False if `source` could not be decoded.
+    """
+    if has_thumbnails(cover_id):
+        return True
+    image = QImage.fromData(source)
+    if image.isNull():
+        return False
+    cache = cover_cache()
+    for scale, (w, h) in THUMB_SIZES.items():
+        thumb = image.scaled(
+            w,
+            h,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        cache.put(cover_id, _thumb_size(scale), _encode_jpeg(thumb))
+    return True
+
+
+def load_thumbnail(cover_id: int, *, scale: int = 1) -> QImage | None:
+    """Decode a stored thumbnail; None if there is none. Any thread."""
+    data = cover_cache().read(cover_id, _thumb_size(scale))
+    if data is None:
+        return None
+    image = QImage.fromData(data)
+    return None if image.isNull() else image
+
+
+def load_cover_image(
+    cover_id: int, width: int, height: int, *, size: str = "M"
+) -> QImage | None:
+    """Decode a cached cover and fit it in width x height device pixels."""
+    data = cover_cache().read(cover_id, size)
+    if data is None:
+        return None
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+    return image.scaled(
+        width,
+        height,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
 
 
 def fetch_cover_to_cache(cover_id: int, *, size: str = "M") -> Path | None:
@@ -31,12 +158,10 @@ def fetch_cover_to_cache(cover_id: int, *, size: str = "M") -> Path | None:
     Returns a local file path to a cached cover image.
     Downloads from Open Library only if missing.
     """
-    path = cached_cover_path(cover_id, size=size)
-    if path.exists() and path.stat().st_size > 0:
-        return path
+    if is_cover_cached(cover_id, size=size):
+        return cached_cover_path(cover_id, size=size)
 
     url = cover_url(cover_id, size=size)
-    tmp = path.with_suffix(path.suffix + ".tmp")
 
     try:
         with httpx.Client(timeout=15.0, follow_redirects=True) as client:
@@ -44,14 +169,8 @@ def fetch_cover_to_cache(cover_id: int, *, size: str = "M") -> Path | None:
             if r.status_code == 404:
                 return None
             r.raise_for_status()
-            tmp.write_bytes(r.content)
-        tmp.replace(path)
-        return path
+        store_cover(cover_id, r.content, size=size)
+        return cached_cover_path(cover_id, size=size)
     except Exception:
         # best-effort cache; controller can just show "No cover"
-        try:
-            if tmp.exists():
-                tmp.unlink()
-        except Exception:
-            pass
         return None
@@ -1,46 +1,87 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from pathlib import Path
 
+from library_app.model.migrations import migrate
+
 # NOTE: DB path currently depends on working directory.
 # For production / tests, consider anchoring to project root.
 # Simple, explicit location for learning purposes:
 # personal-library/data/library.db
 DB_PATH = Path.cwd() / "data" / "library.db"
 
+# Disposable caches (search results, cover bookkeeping) live apart from the
+# user's data: they must never block it, or be backed up with it.
+CACHE_DB_PATH = DB_PATH.parent / "cache.db"
+
+
+# Per-connection tuning. WAL lets readers on other threads keep going while a
+# writer commits; synchronous=NORMAL is durable enough in WAL mode and skips
+# an fsync per transaction.
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",  # KiB, i.e. ~16 MB page cache
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA temp_store = MEMORY",
+)
+
+# How long a writer waits on another writer's lock before "database is locked".
+_BUSY_TIMEOUT_S = 5.0
 
-def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+
+def connect(db_path: Path = DB_PATH, *, shared: bool = False) -> sqlite3.Connection:
+    """
+    Open a tuned connection.
+
+    `shared=True` lifts sqlite3's same-thread check; only use it when the
+    caller guarantees a single thread at a time (see ConnectionPool).
+    """
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(
+        db_path, timeout=_BUSY_TIMEOUT_S, check_same_thread=not shared
+    )
     conn.row_factory = sqlite3.Row
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+class ConnectionPool:
+    """
+    One connection per thread to the same database file.
+
+    sqlite3 connections must not be shared between threads, so each thread
+    (Qt main thread, QThreadPool workers) lazily gets its own. With WAL they
+    can all read concurrently while one of them writes.
+    """
+
+    def __init__(self, db_path: Path = DB_PATH) -> None:
+        self._db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns: list[sqlite3.Connection] = []
+
+    def connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            # shared=True only so close_all() may close it from another thread.
+            conn = connect(self._db_path, shared=True)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def close_all(self) -> None:
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+
 def init_db(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS items (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            media_type TEXT NOT NULL,
-            status TEXT NOT NULL,
-            rating INTEGER NULL,
-            notes TEXT NOT NULL DEFAULT ''
-        );
-        """
-    )
-    # Lightweight "migration": add columns if missing
-    for stmt in [
-        "ALTER TABLE items ADD COLUMN openlibrary_key TEXT NULL",
-        "ALTER TABLE items ADD COLUMN cover_id INTEGER NULL",
-        "ALTER TABLE items ADD COLUMN author TEXT NOT NULL DEFAULT ''",
-        "ALTER TABLE items ADD COLUMN first_publish_year INTEGER NULL",
-    ]:
-        try:
-            conn.execute(stmt)
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" not in str(e).lower():
-                raise
-
-    conn.commit()
+    # Cheap on an up-to-date database: a single PRAGMA read.
+    migrate(conn)
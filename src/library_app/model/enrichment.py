@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Final
+
+from library_app.model.entities import Item
+from library_app.model.ol_client import OpenLibraryClient
+from library_app.model.openlibrary import OLResult
+from library_app.model.repository import ItemRepository
+from library_app.model.writer import DbWriter
+
+ENRICH_BATCH_SIZE: Final[int] = 50  # work keys per search request
+ENRICH_PAUSE_S: Final[float] = 1.0  # between batches; the throttle
+ENRICH_MAX_AGE_S: Final[float] = 30 * 24 * 3600.0  # re-check monthly
+
+
+@dataclass(frozen=True)
+class EnrichProgress:
+    checked: int
+    updated: int
+
+
+def _apply(
+    repo: ItemRepository, items: list[Item], works: dict[str, OLResult], at: float
+) -> int:
+    """
+    Write one batch in one transaction; returns how many items changed.
+
+    Only author, year and cover are written, and only where Open Library
+    has a value: a blank answer never wipes what the user already has, and
+    anything edited while the batch was being fetched is left alone.
+    """
+    rows = [
+        (
+            item.id,
+            work.author or None,
+            work.first_publish_year or None,
+            work.cover_i or None,
+        )
+        for item in items
+        if item.openlibrary_key is not None
+        and (work := works.get(item.openlibrary_key)) is not None
+    ]
+    changed = repo.fill_metadata(rows)
+    # Stamp the whole batch, matched or not, so the next run skips it.
+    repo.mark_enriched((item.id for item in items), at)
+    return changed
+
+
+async def enrich_items(
+    *,
+    client: OpenLibraryClient,
+    writer: DbWriter,
+    on_progress: Callable[[EnrichProgress], None] | None = None,
+    batch_size: int = ENRICH_BATCH_SIZE,
+    pause_s: float = ENRICH_PAUSE_S,
+    max_age_s: float = ENRICH_MAX_AGE_S,
+) -> EnrichProgress:
+    """
+    Refresh author, year and cover of items linked to Open Library.
+
+    Walks items with an openlibrary_key that were not enriched in the last
+    `max_age_s`, `batch_size` at a time: one search request per batch, one
+    transaction per batch, then a `pause_s` rest so the job never competes
+    with interactive use. Cancel the task to stop it; finished batches stay
+    stamped, so the next run continues from there.
+    """
+    stale_before = time.time() - max_age_s
+    after_id = 0
+    progress = EnrichProgress(checked=0, updated=0)
+
+    while True:
+        batch = await asyncio.wrap_future(
+            writer.submit(
+                # partial, not a lambda: it binds this iteration's values.
+                partial(
+                    ItemRepository.items_to_enrich,
+                    stale_before=stale_before,
+                    after_id=after_id,
+                    limit=batch_size,
+                )
+            )
+        )
+        if not batch:
+            return progress
+        after_id = batch[-1].id
+
+        keys = [item.openlibrary_key for item in batch if item.openlibrary_key]
+        works = await client.works(keys)
+        now = time.time()
+        updated = await asyncio.wrap_future(
+            writer.submit(partial(_apply, items=batch, works=works, at=now))
+        )
+
+        progress = EnrichProgress(
+            checked=progress.checked + len(batch),
+            updated=progress.updated + updated,
+        )
+        if on_progress is not None:
+            on_progress(progress)
+        await asyncio.sleep(pause_s)
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.enums import ChangeOp, ImportOutcome, ItemStatus, MediaType
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Item:
     id: int
     title: str
@@ -17,3 +17,63 @@ class Item:
     first_publish_year: int | None = None
     openlibrary_key: str | None = None
     cover_id: int | None = None
+
+    def summary(self) -> ItemSummary:
+        return ItemSummary(
+            id=self.id,
+            title=self.title,
+            media_type=self.media_type,
+            status=self.status,
+            rating=self.rating,
+            cover_id=self.cover_id,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ItemSummary:
+    """
+    What a list row needs: no notes or other detail-only columns.
+
+    Slotted so a six-figure listing stays a small constant per row.
+    """
+
+    id: int
+    title: str
+    media_type: MediaType
+    status: ItemStatus
+    rating: int | None
+    cover_id: int | None
+
+
+@dataclass(frozen=True)
+class NewItem:
+    """An item that has not been saved yet (the database assigns its id)."""
+
+    title: str
+    media_type: MediaType
+    status: ItemStatus
+    rating: int | None = None
+    notes: str = ""
+    author: str = ""
+    first_publish_year: int | None = None
+    openlibrary_key: str | None = None
+    cover_id: int | None = None
+
+
+@dataclass(frozen=True)
+class ItemChange:
+    """Net effect on one item since a given point in the change feed."""
+
+    seq: int
+    item_id: int
+    op: ChangeOp
+
+
+@dataclass(frozen=True)
+class ImportLogEntry:
+    """Final outcome of one input line of a bulk import."""
+
+    line: int
+    query: str
+    outcome: ImportOutcome
+    item_id: int | None = None
@@ -13,3 +13,15 @@ class ItemStatus(Enum):
     BACKLOG = "backlog"
     IN_PROGRESS = "in_progress"
     DONE = "done"
+
+
+class ChangeOp(Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class ImportOutcome(Enum):
+    IMPORTED = "imported"
+    DUPLICATE = "duplicate"  # its openlibrary_key is already in the library
+    NOT_FOUND = "not_found"
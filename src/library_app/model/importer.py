@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import re
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+import httpx
+
+from library_app.model.entities import ImportLogEntry, NewItem
+from library_app.model.enums import ImportOutcome, ItemStatus, MediaType
+from library_app.model.ol_client import OpenLibraryClient
+from library_app.model.openlibrary import OLResult
+from library_app.model.repository import ItemRepository
+from library_app.model.resilience import CircuitOpenError
+from library_app.model.writer import DbWriter
+
+IMPORT_CONCURRENCY: Final[int] = 8
+IMPORT_RATE_PER_S: Final[float] = 10.0  # Open Library asks bulk clients to pace
+IMPORT_BATCH_SIZE: Final[int] = 200  # lines per transaction
+
+# CSV columns we know how to read, in order of preference.
+_CSV_COLUMNS = ("isbn", "isbn13", "isbn10", "title")
+_ISBN_RE = re.compile(r"(?:\d{9}[\dX]|\d{13})")
+# A lookup that fails this way counts as failed (retried by the next run)
+# instead of aborting the import: network/HTTP errors, the host's circuit
+# being open, and a body that is not the JSON we expect.
+_LOOKUP_ERRORS = (httpx.HTTPError, CircuitOpenError, ValueError)
+
+
+@dataclass(frozen=True)
+class ImportLine:
+    line: int  # 1-based line (CSV: record) number in the source file
+    query: str
+
+
+@dataclass(frozen=True)
+class ImportProgress:
+    total: int  # lines still to do when this run started
+    done: int
+    imported: int = 0
+    duplicates: int = 0
+    not_found: int = 0
+    failed: int = 0  # lookup errors; retried by the next run
+    skipped: int = 0  # finished by an earlier run of the same file
+
+
+def normalize_isbn(text: str) -> str | None:
+    """The bare ISBN-10/13 in `text`, or None if it is not one."""
+    candidate = re.sub(r"[\s-]", "", text).upper()
+    return candidate if _ISBN_RE.fullmatch(candidate) else None
+
+
+def lookup_query(text: str) -> str:
+    isbn = normalize_isbn(text)
+    return f"isbn:{isbn}" if isbn else text
+
+
+def read_import_file(path: Path) -> list[ImportLine]:
+    """
+    Read ISBNs or titles, one per line.
+
+    A .csv file uses its isbn (or title) column when it has a header naming
+    one, otherwise its first column. Blank lines and # comments are skipped.
+    """
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            return list(_read_csv(csv.reader(f)))
+        return [
+            ImportLine(number, text)
+            for number, raw in enumerate(f, start=1)
+            if (text := raw.strip()) and not text.startswith("#")
+        ]
+
+
+def _read_csv(rows: Iterator[list[str]]) -> Iterator[ImportLine]:
+    first = next(rows, None)
+    if first is None:
+        return
+    header = [cell.strip().lower() for cell in first]
+    column = next((header.index(c) for c in _CSV_COLUMNS if c in header), None)
+    first_number = 2
+    if column is None:  # no header: the first row is data
+        column, first_number = 0, 1
+        rows = iter([first, *rows])
+    for number, row in enumerate(rows, start=first_number):
+        text = row[column].strip() if column < len(row) else ""
+        if text and not text.startswith("#"):
+            yield ImportLine(number, text)
+
+
+def new_item_from_result(r: OLResult) -> NewItem:
+    return NewItem(
+        title=r.title,
+        media_type=MediaType.BOOK,
+        status=ItemStatus.BACKLOG,
+        notes="Imported from Open Library",
+        author=r.author,
+        first_publish_year=r.first_publish_year,
+        openlibrary_key=r.key or None,
+        cover_id=r.cover_i,
+    )
+
+
+class _RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate_per_s: float) -> None:
+        self._interval = 1.0 / rate_per_s
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _store(
+    repo: ItemRepository,
+    source: str,
+    resolved: list[tuple[ImportLine, OLResult | None]],
+) -> list[ImportLogEntry]:
+    """Insert one batch and log it; runs on the writer thread, in one commit."""
+    existing = repo.existing_openlibrary_keys(r.key for _, r in resolved if r and r.key)
+    log: list[ImportLogEntry] = []
+    new_lines: list[ImportLine] = []
+    new_items: list[NewItem] = []
+    for line, r in resolved:
+        if r is None or not r.title:
+            log.append(ImportLogEntry(line.line, line.query, ImportOutcome.NOT_FOUND))
+        elif r.key and r.key in existing:
+            log.append(ImportLogEntry(line.line, line.query, ImportOutcome.DUPLICATE))
+        else:
+            if r.key:
+                existing.add(r.key)  # the same work twice in one file
+            new_lines.append(line)
+            new_items.append(new_item_from_result(r))
+
+    ids = repo.add_items(new_items)
+    log.extend(
+        ImportLogEntry(line.line, line.query, ImportOutcome.IMPORTED, item_id)
+        for line, item_id in zip(new_lines, ids, strict=True)
+    )
+    repo.log_imports(source, log)
+    return log
+
+
+async def import_file(
+    path: Path,
+    *,
+    client: OpenLibraryClient,
+    writer: DbWriter,
+    on_progress: Callable[[ImportProgress], None] | None = None,
+    concurrency: int = IMPORT_CONCURRENCY,
+    rate_per_s: float = IMPORT_RATE_PER_S,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportProgress:
+    """
+    Resolve every line of `path` on Open Library and add the matches.
+
+    Lookups run `concurrency` at a time and start at most `rate_per_s` per
+    second; each `batch_size` lines are written in one transaction, while
+    the next batch is already being looked up. Works already in the library
+    (same openlibrary_key) are skipped.
+
+    Resumable: finished lines are recorded per file path in import_log, so
+    running the same file again only does what is left, including lines
+    whose lookup failed last time. `on_progress` is called after each batch
+    is committed, on the event loop thread.
+    """
+    source = str(path.resolve())
+    lines = read_import_file(path)
+    finished = await asyncio.wrap_future(
+        writer.submit(lambda repo: repo.imported_lines(source))
+    )
+    todo = [line for line in lines if line.line not in finished]
+
+    limiter = _RateLimiter(rate_per_s)
+    slots = asyncio.Semaphore(concurrency)
+    progress = ImportProgress(total=len(todo), done=0, skipped=len(lines) - len(todo))
+
+    async def resolve(line: ImportLine) -> OLResult | None | BaseException:
+        async with slots:
+            await limiter.wait()
+            try:
+                hits = await client.search(lookup_query(line.query), limit=1)
+            except _LOOKUP_ERRORS as e:
+                return e
+        return hits[0] if hits else None
+
+    async def write(
+        resolved: list[tuple[ImportLine, OLResult | None]], failed: int
+    ) -> None:
+        nonlocal progress
+        log = await asyncio.wrap_future(
+            writer.submit(lambda repo: _store(repo, source, resolved))
+        )
+        outcomes = [entry.outcome for entry in log]
+        progress = ImportProgress(
+            total=progress.total,
+            done=progress.done + len(resolved) + failed,
+            imported=progress.imported + outcomes.count(ImportOutcome.IMPORTED),
+            duplicates=progress.duplicates + outcomes.count(ImportOutcome.DUPLICATE),
+            not_found=progress.not_found + outcomes.count(ImportOutcome.NOT_FOUND),
+            failed=progress.failed + failed,
+            skipped=progress.skipped,
+        )
+        if on_progress is not None:
+            on_progress(progress)
+
+    pending: asyncio.Task[None] | None = None
+    for start in range(0, len(todo), batch_size):
+        chunk = todo[start : start + batch_size]
+        answers = await asyncio.gather(*(resolve(line) for line in chunk))
+        resolved = [
+            (line, answer)
+            for line, answer in zip(chunk, answers, strict=True)
+            if not isinstance(answer, BaseException)
+        ]
+        # Keep one batch in flight on the writer while the next is looked up.
+        if pending is not None:
+            await pending
+        pending = asyncio.create_task(write(resolved, len(chunk) - len(resolved)))
+    if pending is not None:
+        await pending
+    return progress
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable
+from typing import Final
+
+# Ordered schema steps. PRAGMA user_version records how many have been
+# applied, so each runs exactly once per database. Never edit or reorder a
+# released step; append a new one instead (and mirror it in schema.sql).
+Migration = Callable[[sqlite3.Connection], None]
+
+
+def _create_items(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            media_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            rating INTEGER NULL,
+            notes TEXT NOT NULL DEFAULT '',
+            author TEXT NOT NULL DEFAULT '',
+            first_publish_year INTEGER NULL,
+            openlibrary_key TEXT NULL,
+            cover_id INTEGER NULL
+        )
+        """
+    )
+    # Databases created before versioning may lack the later columns.
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+    for column, ddl in [
+        ("openlibrary_key", "openlibrary_key TEXT NULL"),
+        ("cover_id", "cover_id INTEGER NULL"),
+        ("author", "author TEXT NOT NULL DEFAULT ''"),
+        ("first_publish_year", "first_publish_year INTEGER NULL"),
+    ]:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE items ADD COLUMN {ddl}")
+
+
+def _unique_openlibrary_key(conn: sqlite3.Connection) -> None:
+    # Older databases never enforced uniqueness; keep the oldest copy's key.
+    conn.execute(
+        """
+        UPDATE items
+        SET openlibrary_key = NULL
+        WHERE openlibrary_key IS NOT NULL
+          AND id NOT IN (
+              SELECT MIN(id) FROM items
+              WHERE openlibrary_key IS NOT NULL
+              GROUP BY openlibrary_key
+          )
+        """
+    )
+    conn.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_items_openlibrary_key
+        ON items (openlibrary_key)
+        """
+    )
+
+
+def _hot_query_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_items_status ON items (status)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_items_media_type ON items (media_type)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_items_cover_id ON items (cover_id)")
+
+
+def _full_text_index(conn: sqlite3.Connection) -> None:
+    # External-content FTS5 table: the text lives only in `items`, the index
+    # is kept in sync by triggers, so search never scans rows in Python.
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+            title, author, notes,
+            content = 'items',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+            INSERT INTO items_fts (rowid, title, author, notes)
+            VALUES (new.id, new.title, new.author, new.notes);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+            INSERT INTO items_fts (items_fts, rowid, title, author, notes)
+            VALUES ('delete', old.id, old.title, old.author, old.notes);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS items_fts_au
+        AFTER UPDATE OF title, author, notes ON items BEGIN
+            INSERT INTO items_fts (items_fts, rowid, title, author, notes)
+            VALUES ('delete', old.id, old.title, old.author, old.notes);
+            INSERT INTO items_fts (rowid, title, author, notes)
+            VALUES (new.id, new.title, new.author, new.notes);
+        END
+        """
+    )
+    # Index whatever rows the library already holds.
+    conn.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+
+
+def _change_log(conn: sqlite3.Connection) -> None:
+    # Append-only feed of row changes, written by triggers so that writes from
+    # any connection or process (imports, enrichment) show up in the UI.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS item_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            op TEXT NOT NULL
+        )
+        """
+    )
+    for name, event, row in [
+        ("items_changes_ai", "INSERT", "new"),
+        ("items_changes_au", "UPDATE", "new"),
+        ("items_changes_ad", "DELETE", "old"),
+    ]:
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON items BEGIN
+                INSERT INTO item_changes (item_id, op)
+                VALUES ({row}.id, '{event.lower()}');
+            END
+            """
+        )
+
+
+def _sort_indexes(conn: sqlite3.Connection) -> None:
+    # Keyset pages seek on (sort expression, id). Plain indexes already end
+    # in the rowid, so (status) serves "status, id"; title and rating sort on
+    # expressions that need their own index. The status/media_type composites
+    # cover the filter bar combined with a title sort.
+    for ddl in [
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_title_nocase
+        ON items (title COLLATE NOCASE)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_items_rating ON items (IFNULL(rating, 0))",
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_status_title
+        ON items (status, title COLLATE NOCASE)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_media_type_title
+        ON items (media_type, title COLLATE NOCASE)
+        """,
+    ]:
+        conn.execute(ddl)
+
+
+def _import_log(conn: sqlite3.Connection) -> None:
+    # One row per input line of a bulk import that reached a final outcome.
+    # A re-run of the same file skips these lines, so an interrupted import
+    # resumes where it stopped. Lines that failed to resolve are not logged.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_log (
+            source TEXT NOT NULL,
+            line INTEGER NOT NULL,
+            query TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            item_id INTEGER NULL,
+            PRIMARY KEY (source, line)
+        )
+        """
+    )
+
+
+def _item_enrichment(conn: sqlite3.Connection) -> None:
+    # When each item's metadata was last refreshed from Open Library. Kept out
+    # of `items` so that stamping a row that did not change neither fires the
+    # change feed nor reindexes it for search.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS item_enrichment (
+            item_id INTEGER PRIMARY KEY,
+            enriched_at REAL NOT NULL
+        )
+        """
+    )
+
+
+MIGRATIONS: Final[tuple[Migration, ...]] = (
+    _create_items,
+    _unique_openlibrary_key,
+    _hot_query_indexes,
+    _full_text_index,
+    _change_log,
+    _sort_indexes,
+    _import_log,
+    _item_enrichment,
+)
+
+SCHEMA_VERSION: Final[int] = len(MIGRATIONS)
+
+
+def _user_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    """
+    Bring the database up to SCHEMA_VERSION.
+
+    Each step runs in its own IMMEDIATE transaction together with the
+    user_version bump, so a crash mid-way leaves a consistent version and
+    two processes starting at once cannot both apply the same step.
+    """
+    current = _user_version(conn)
+    if current >= SCHEMA_VERSION:
+        return
+
+    if conn.in_transaction:
+        conn.commit()
+    for number, step in enumerate(MIGRATIONS[current:], start=current + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if _user_version(conn) < number:
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
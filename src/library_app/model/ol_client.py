@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Any, Final
+
+import httpx
+from PySide6.QtGui import QImage
+
+from library_app.model.cover_misses import (
+    CoverMisses,
+    CoverUnavailableError,
+    MissKind,
+)
+from library_app.model.covers import (
+    cover_cache,
+    cover_url,
+    ensure_thumbnails,
+    has_thumbnails,
+    is_cover_cached,
+    load_cover_image,
+    load_thumbnail,
+    store_cover,
+)
+from library_app.model.openlibrary import (
+    SEARCH_URL,
+    OLResult,
+    parse_search,
+    search_params,
+    works_query,
+)
+from library_app.model.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    SingleFlight,
+    retry,
+)
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2]).
+_HTTP2: Final[bool] = importlib.util.find_spec("h2") is not None
+
+MAX_CONCURRENCY: Final[int] = 16
+MAX_PER_HOST: Final[int] = 6
+
+
+class OpenLibraryClient:
+    """
+    Async Open Library client sharing one long-lived httpx.AsyncClient.
+
+    Keep-alive (and HTTP/2 when available) means searches and cover
+    downloads reuse connections instead of paying a TCP+TLS handshake each.
+    A global semaphore bounds requests in flight and a per-host one keeps
+    us polite to each Open Library host.
+
+    Identical concurrent searches or cover downloads share one request
+    (single-flight). Transient failures are retried with jittered backoff,
+    and a per-host circuit breaker fails fast while a host is unhealthy.
+
+    Every coroutine must run on the same event loop (util.async_loop).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_per_host: int = MAX_PER_HOST,
+        timeout: float = 15.0,
+        misses: CoverMisses | None = None,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._max_per_host = max_per_host
+        self._timeout = timeout
+        self._misses = misses
+        # Created lazily, on the event loop that will use them.
+        self._client: httpx.AsyncClient | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._searches: SingleFlight[tuple[str, int, int]] = SingleFlight()
+        self._covers: SingleFlight[tuple[int, str]] = SingleFlight()
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=self._timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self._max_concurrency,
+                    max_keepalive_connections=self._max_concurrency,
+                    keepalive_expiry=60.0,
+                ),
+            )
+            self._slots = asyncio.Semaphore(self._max_concurrency)
+        return self._client
+
+    async def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET with retries; 4xx other than 408/429 come back as responses."""
+        client = self._http()
+        slots = self._slots
+        assert slots is not None
+        host = httpx.URL(url).host
+        host_slots = self._host_slots.setdefault(
+            host, asyncio.Semaphore(self._max_per_host)
+        )
+        breaker = self._breakers.setdefault(host, CircuitBreaker())
+
+        async def attempt() -> httpx.Response:
+            async with slots, host_slots:
+                r = await client.get(url, **kwargs)
+            if r.status_code in (408, 429) or r.status_code >= 500:
+                r.raise_for_status()  # transient: let retry() have another go
+            return r
+
+        return await retry(attempt, breaker=breaker)
+
+    async def search(
+        self, query: str, *, limit: int = 25, offset: int = 0
+    ) -> list[OLResult]:
+        """One page of results; a page shorter than `limit` is the last."""
+        query = query.strip()
+        if not query:
+            return []
+
+        async def fetch() -> list[OLResult]:
+            params = search_params(query, limit=limit, offset=offset)
+            r = await self._get(SEARCH_URL, params=params)
+            r.raise_for_status()
+            data: dict[str, Any] = r.json()
+            return parse_search(data)
+
+        return await self._searches.do((query, limit, offset), fetch)
+
+    async def works(self, keys: list[str]) -> dict[str, OLResult]:
+        """Current search data for many works in one request, by key."""
+        if not keys:
+            return {}
+        results = await self.search(works_query(keys), limit=len(keys))
+        return {r.key: r for r in results if r.key}
+
+    async def fetch_cover(self, cover_id: int, *, size: str = "M") -> bool:
+        """
+        Async twin of covers.fetch_cover_to_cache: is the cover cached now?
+
+        False if Open Library has none. With a CoverMisses store, a recent
+        404 answers False and a recent failure raises CoverUnavailableError,
+        both without a request. Read it back through the cover cache; with
+        the pack backend there is no file path to hand out.
+        """
+        if is_cover_cached(cover_id, size=size):
+            if size == "M" and not has_thumbnails(cover_id):
+                # Cached before the thumbnail tier existed, or they were evicted.
+                await asyncio.to_thread(_thumbnail_cached, cover_id)
+            return True
+
+        misses = self._misses
+        if misses is not None:
+            kind = misses.get(cover_id, size)
+            if kind is MissKind.NOT_FOUND:
+                return False
+            if kind is not None:
+                raise CoverUnavailableError(f"cover {cover_id}-{size} failed recently")
+
+        async def remember(kind: MissKind) -> None:
+            if misses is not None:
+                await asyncio.to_thread(misses.record, cover_id, size, kind)
+
+        async def download() -> bool:
+            try:
+                r = await self._get(cover_url(cover_id, size=size))
+                if r.status_code != 404:
+                    r.raise_for_status()
+                    # Keep disk writes (and thumbnail scaling) off the event loop.
+                    await asyncio.to_thread(_store, cover_id, r.content, size)
+            except CircuitOpenError:
+                # Not this cover's fault: hold it back until the breaker
+                # tries the host again.
+                await remember(MissKind.REFUSED)
+                raise
+            except Exception:
+                # Retries used up, a 403, a full disk: asking again right
+                # away would only fail the same way.
+                await remember(MissKind.ERROR)
+                raise
+            if r.status_code == 404:
+                await remember(MissKind.NOT_FOUND)
+                return False
+            if misses is not None:  # an expired miss, if any, is over
+                await asyncio.to_thread(misses.forget, cover_id, size)
+            return True
+
+        # The table and the detail pane often want the same cover at once.
+        return await self._covers.do((cover_id, size), download)
+
+    async def fetch_thumbnail(self, cover_id: int, *, scale: int = 1) -> QImage | None:
+        """
+        The list thumbnail, downloaded if needed and decoded off the loop.
+
+        QImage (unlike QPixmap) may be built on any thread; the GUI only
+        wraps it with QPixmap.fromImage.
+        """
+        if not await self.fetch_cover(cover_id):
+            return None
+        return await asyncio.to_thread(load_thumbnail, cover_id, scale=scale)
+
+    async def fetch_cover_image(
+        self, cover_id: int, *, width: int, height: int, size: str = "M"
+    ) -> QImage | None:
+        """The cover decoded and scaled to fit width x height, off the loop."""
+        if not await self.fetch_cover(cover_id, size=size):
+            return None
+        return await asyncio.to_thread(
+            load_cover_image, cover_id, width, height, size=size
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _store(cover_id: int, data: bytes, size: str) -> None:
+    store_cover(cover_id, data, size=size)
+    if size == "M":  # the list's thumbnails are scaled from the M cover
+        ensure_thumbnails(cover_id, data)
+
+
+def _thumbnail_cached(cover_id: int) -> None:
+    data = cover_cache().read(cover_id, "M")
+    if data is not None:
+        ensure_thumbnails(cover_id, data)
@@ -5,6 +5,11 @@ from typing import Any
 
 import httpx
 
+SEARCH_URL = "https://openlibrary.org/search.json"
+
+# Use explicit fields (Open Library changed /search.json defaults in 2025)
+SEARCH_FIELDS = "key,title,author_name,first_publish_year,edition_count,cover_i"
+
 
 @dataclass(frozen=True)
 class OLResult:
@@ -16,24 +21,21 @@ class OLResult:
     cover_i: int | None  # used for covers API
 
 
-def search_openlibrary(query: str, *, limit: int = 25) -> list[OLResult]:
-    query = query.strip()
-    if not query:
-        return []
+def search_params(query: str, *, limit: int, offset: int = 0) -> dict[str, str]:
+    # https://openlibrary.org/search.json?q=...&offset=...
+    params = {"q": query, "limit": str(limit), "fields": SEARCH_FIELDS}
+    if offset:
+        params["offset"] = str(offset)
+    return params
 
-    # Use explicit fields (Open Library changed /search.json defaults in 2025)
-    # https://openlibrary.org/search.json?q=...
-    params = {
-        "q": query,
-        "limit": str(limit),
-        "fields": "key,title,author_name,first_publish_year,edition_count,cover_i",
-    }
 
-    with httpx.Client(timeout=10.0) as client:
-        r = client.get("https://openlibrary.org/search.json", params=params)
-        r.raise_for_status()
-        data: dict[str, Any] = r.json()
+def works_query(keys: list[str]) -> str:
+    """A search query matching exactly these work keys ("/works/OL1W")."""
+    quoted = " OR ".join(f'"{key}"' for key in keys)
+    return f"key:({quoted})"
 
+
+def parse_search(data: dict[str, Any]) -> list[OLResult]:
     docs = data.get("docs", [])
     out: list[OLResult] = []
     for d in docs:
@@ -50,3 +52,20 @@ def search_openlibrary(query: str, *, limit: int = 25) -> list[OLResult]:
             )
         )
     return out
+
+
+def search_openlibrary(
+    query: str, *, limit: int = 25, offset: int = 0
+) -> list[OLResult]:
+    """Blocking one-off search; the app itself uses OpenLibraryClient."""
+    query = query.strip()
+    if not query:
+        return []
+
+    with httpx.Client(timeout=10.0) as client:
+        params = search_params(query, limit=limit, offset=offset)
+        r = client.get(SEARCH_URL, params=params)
+        r.raise_for_status()
+        data: dict[str, Any] = r.json()
+
+    return parse_search(data)
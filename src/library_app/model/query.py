@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+
+from library_app.model.entities import ItemSummary
+from library_app.model.enums import ItemStatus, MediaType
+
+
+class SortKey(Enum):
+    ADDED = "added"
+    TITLE = "title"
+    MEDIA_TYPE = "media_type"
+    STATUS = "status"
+    RATING = "rating"
+
+
+# SQL sort expression per key. Each one has a matching index (see
+# migrations.py); the expressions must stay textually identical to the
+# indexed ones or SQLite will not use them.
+SORT_SQL: dict[SortKey, str] = {
+    SortKey.ADDED: "id",
+    SortKey.TITLE: "title COLLATE NOCASE",
+    SortKey.MEDIA_TYPE: "media_type",
+    SortKey.STATUS: "status",
+    SortKey.RATING: "IFNULL(rating, 0)",
+}
+
+
+@dataclass(frozen=True)
+class ItemSort:
+    key: SortKey = SortKey.ADDED
+    descending: bool = True
+
+
+@dataclass(frozen=True)
+class ItemFilter:
+    status: ItemStatus | None = None
+    media_type: MediaType | None = None
+    min_rating: int | None = None
+
+    def is_empty(self) -> bool:
+        return self.status is None and self.media_type is None and not self.min_rating
+
+    def matches(self, item: ItemSummary) -> bool:
+        if self.status is not None and item.status is not self.status:
+            return False
+        if self.media_type is not None and item.media_type is not self.media_type:
+            return False
+        return not self.min_rating or (item.rating or 0) >= self.min_rating
+
+
+def sort_value(item: ItemSummary, key: SortKey) -> int | str:
+    """Python mirror of SORT_SQL, used for keyset cursors and row placement."""
+    if key is SortKey.TITLE:
+        # NOCASE only folds ASCII; lower() is close enough for placement.
+        return item.title.lower()
+    if key is SortKey.MEDIA_TYPE:
+        return item.media_type.value
+    if key is SortKey.STATUS:
+        return item.status.value
+    if key is SortKey.RATING:
+        return item.rating or 0
+    return item.id
+
+
+def sorts_before(a: ItemSummary, b: ItemSummary, sort: ItemSort) -> bool:
+    """True if `a` comes before `b` in `sort` order (ties broken on id)."""
+    ka = (sort_value(a, sort.key), a.id)
+    kb = (sort_value(b, sort.key), b.id)
+    return ka > kb if sort.descending else ka < kb
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import json
+import re
 import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from typing import Any, Final, cast
 
-from library_app.model.db import connect, init_db
-from library_app.model.entities import Item
-from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.cache import CacheStats, LruCache
+from library_app.model.db import ConnectionPool, init_db
+from library_app.model.entities import (
+    ImportLogEntry,
+    Item,
+    ItemChange,
+    ItemSummary,
+    NewItem,
+)
+from library_app.model.enums import ChangeOp, ItemStatus, MediaType
+from library_app.model.query import SORT_SQL, ItemFilter, ItemSort, SortKey, sort_value
 
 _ITEM_COLUMNS = """
     id,
@@ -20,45 +33,406 @@ _ITEM_COLUMNS = """
     cover_id
 """
 
+# List-view projection: what ItemTableModel shows, without notes.
+_SUMMARY_COLUMNS = """
+    id,
+    title,
+    media_type,
+    status,
+    rating,
+    cover_id
+"""
+
+_INSERT_SQL: Final[str] = """
+    INSERT INTO items (title, media_type, status, rating, notes,
+                       author, first_publish_year, openlibrary_key, cover_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE_SQL: Final[str] = """
+    UPDATE items
+    SET title = ?,
+        media_type = ?,
+        status = ?,
+        rating = ?,
+        notes = ?,
+        author = ?,
+        first_publish_year = ?,
+        openlibrary_key = ?,
+        cover_id = ?
+    WHERE id = ?
+"""
+
 _UNSET: Final[object] = object()
 
+# Value -> member tables; indexing a dict is much cheaper than Enum(value).
+_MEDIA_TYPES: Final[dict[str, MediaType]] = {m.value: m for m in MediaType}
+_STATUSES: Final[dict[str, ItemStatus]] = {s.value: s for s in ItemStatus}
+
+# Column weights for bm25(): a title hit outranks an author hit, which
+# outranks a mention somewhere in the notes.
+_FTS_WEIGHTS: Final[str] = "10.0, 5.0, 1.0"
+
+_FTS_TOKEN_RE: Final = re.compile(r"\w+")
+
+# Rows per keyset page; large enough to fill a tall window, small enough
+# that fetching one never stalls the UI.
+PAGE_SIZE: Final[int] = 200
+
+DEFAULT_SORT: Final[ItemSort] = ItemSort()
+
+# Items kept in the identity map; covers a few pages of browsing.
+ITEM_CACHE_SIZE: Final[int] = 2048
+
 
 class ItemRepository:
     """
     Persistence boundary (SQLite).
     """
 
-    def __init__(self, conn: sqlite3.Connection | None = None) -> None:
-        # Allow injecting a test connection (e.g. sqlite3.connect(":memory:"))
-        self._conn = conn if conn is not None else connect()
+    def __init__(
+        self,
+        conn: sqlite3.Connection | None = None,
+        *,
+        pool: ConnectionPool | None = None,
+    ) -> None:
+        # Allow injecting a test connection (e.g. sqlite3.connect(":memory:"));
+        # otherwise every thread gets its own connection from the pool.
+        self._fixed_conn = conn
+        self._pool = pool if pool is not None or conn is not None else ConnectionPool()
+        self._local = threading.local()
+        # Read-through identity map; every write through this repository
+        # invalidates the ids it touches.
+        self._cache: LruCache[int, Item] = LruCache(ITEM_CACHE_SIZE)
         init_db(self._conn)
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._fixed_conn is not None:
+            return self._fixed_conn
+        assert self._pool is not None
+        return self._pool.connection()
+
+    @property
+    def _batch_depth(self) -> int:
+        # Transactions belong to a connection, and connections to a thread.
+        return cast(int, getattr(self._local, "batch_depth", 0))
+
+    @_batch_depth.setter
+    def _batch_depth(self, value: int) -> None:
+        self._local.batch_depth = value
+
+    @property
+    def _pending_invalidations(self) -> set[int]:
+        pending = getattr(self._local, "pending_invalidations", None)
+        if pending is None:
+            pending = self._local.pending_invalidations = set()
+        return cast(set[int], pending)
+
+    def _invalidate(self, item_id: int) -> None:
+        """
+        Drop `item_id` from the cache once the write is committed.
+
+        Inside a batch the row is not visible to other connections yet: a
+        reader there would cache the old row right after an invalidation,
+        so the ids wait for the outermost commit.
+        """
+        if self._batch_depth:
+            self._pending_invalidations.add(item_id)
+        else:
+            self._cache.invalidate(item_id)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close_all()
+
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats()
+
+    def _query(self, sql: str, params: tuple[object, ...] = ()) -> sqlite3.Cursor:
+        # Plain tuples instead of sqlite3.Row: the decoders below unpack rows
+        # positionally, which skips a by-name lookup per column.
+        cur = self._conn.cursor()
+        cur.row_factory = None
+        return cur.execute(sql, params)
+
+    @staticmethod
+    def _summary_from_row(row: Any) -> ItemSummary:
+        # Column order follows _SUMMARY_COLUMNS.
+        item_id, title, media_type, status, rating, cover_id = row
+        return ItemSummary(
+            item_id,
+            title,
+            _MEDIA_TYPES[media_type],
+            _STATUSES[status],
+            rating,
+            cover_id,
+        )
+
+    def _decode_rows(self, rows: Iterable[Any]) -> list[Item]:
+        # Decoded rows are complete items, so they double as cache entries.
+        items = [self._item_from_row(row) for row in rows]
+        for item in items:
+            self._cache.put(item.id, item)
+        return items
+
     @staticmethod
     def _item_from_row(row: Any) -> Item:
-        # DB stores enum values as strings; convert back to enums for Item.
+        # Column order follows _ITEM_COLUMNS. DB stores enum values as
+        # strings; the lookup dicts convert them without Enum.__call__.
+        (
+            item_id,
+            title,
+            media_type,
+            status,
+            rating,
+            notes,
+            author,
+            first_publish_year,
+            openlibrary_key,
+            cover_id,
+        ) = row
         return Item(
-            id=cast(int, row["id"]),
-            title=cast(str, row["title"]),
-            media_type=MediaType(cast(str, row["media_type"])),
-            status=ItemStatus(cast(str, row["status"])),
-            rating=cast(int | None, row["rating"]),
-            notes=cast(str, row["notes"]) if row["notes"] is not None else "",
-            author=cast(str, row["author"]) if row["author"] is not None else "",
-            first_publish_year=cast(int | None, row["first_publish_year"]),
-            openlibrary_key=cast(str | None, row["openlibrary_key"]),
-            cover_id=cast(int | None, row["cover_id"]),
+            item_id,
+            title,
+            _MEDIA_TYPES[media_type],
+            _STATUSES[status],
+            rating,
+            notes if notes is not None else "",
+            author if author is not None else "",
+            first_publish_year,
+            openlibrary_key,
+            cover_id,
         )
 
+    @staticmethod
+    def _insert_params(item: NewItem) -> tuple[object, ...]:
+        return (
+            item.title,
+            item.media_type.value,
+            item.status.value,
+            item.rating,
+            item.notes,
+            item.author,
+            item.first_publish_year,
+            item.openlibrary_key,
+            item.cover_id,
+        )
+
+    @staticmethod
+    def _update_params(item: Item) -> tuple[object, ...]:
+        return (
+            item.title,
+            item.media_type.value,
+            item.status.value,
+            item.rating,
+            item.notes,
+            item.author,
+            item.first_publish_year,
+            item.openlibrary_key,
+            item.cover_id,
+            item.id,
+        )
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group writes into one transaction.
+
+        Write methods called inside the block skip their own commit; the
+        outermost block commits once on success and rolls everything back if
+        it (or the commit) raises. Nested blocks simply join the outer
+        transaction.
+        """
+        conn = self._conn
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                conn.rollback()
+                # Reads inside the transaction may have cached rolled-back rows.
+                self._pending_invalidations.clear()
+                self._cache.clear()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            pending = self._pending_invalidations
+            try:
+                conn.commit()
+            except BaseException:
+                # SQLITE_BUSY, disk full...: the transaction is still open and
+                # would otherwise be committed along with the next batch.
+                conn.rollback()
+                pending.clear()
+                self._cache.clear()
+                raise
+            for item_id in pending:
+                self._cache.invalidate(item_id)
+            pending.clear()
+
+    @contextmanager
+    def savepoint(self) -> Iterator[None]:
+        """
+        A step inside batch() that can fail on its own.
+
+        If the block raises, only its writes are undone and the surrounding
+        batch carries on (the exception still propagates).
+        """
+        conn = self._conn
+        if not conn.in_transaction:
+            # A bare SAVEPOINT would open its own transaction and RELEASE
+            # would then commit it; keep it nested in a real one.
+            conn.execute("BEGIN")
+        conn.execute("SAVEPOINT repo_step")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK TO repo_step")
+            conn.execute("RELEASE repo_step")
+            self._cache.clear()
+            raise
+        conn.execute("RELEASE repo_step")
+
     def list_items(self) -> list[Item]:
-        rows = self._conn.execute(
+        rows = self._query(
             f"""
             SELECT {_ITEM_COLUMNS}
             FROM items
             ORDER BY id DESC
             """
         ).fetchall()
+        # Bulk dumps bypass the cache; they would only evict the working set.
         return [self._item_from_row(row) for row in rows]
 
+    def list_items_page(
+        self,
+        *,
+        after: ItemSummary | None = None,
+        limit: int = PAGE_SIZE,
+        sort: ItemSort = DEFAULT_SORT,
+        filters: ItemFilter | None = None,
+    ) -> list[ItemSummary]:
+        """
+        Return one page of list rows in `sort` order (default: newest first).
+
+        Keyset pagination: pass the last row of the previous page as `after`
+        and the query seeks past its (sort key, id) pair on an index, so every
+        page costs the same no matter how deep into the table it is. Sorting
+        and filtering both happen in SQL; nothing is sorted in Python.
+        """
+        expr = SORT_SQL[sort.key]
+        direction = "DESC" if sort.descending else "ASC"
+        where, params = self._filter_sql(filters)
+        if after is not None:
+            # NOCASE comparison needs the stored title, not a folded copy.
+            value = (
+                after.title
+                if sort.key is SortKey.TITLE
+                else sort_value(after, sort.key)
+            )
+            op = "<" if sort.descending else ">"
+            if sort.key is SortKey.ADDED:
+                where.append(f"id {op} ?")
+                params.append(after.id)
+            else:
+                # The row-value test alone makes SQLite scan the index from
+                # the start; the redundant range term lets it seek instead.
+                where.append(f"{expr} {op}= ? AND ({expr}, id) {op} (?, ?)")
+                params.extend([value, value, after.id])
+
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        order_sql = (
+            f"id {direction}"
+            if sort.key is SortKey.ADDED
+            else f"{expr} {direction}, id {direction}"
+        )
+        rows = self._query(
+            f"""
+            SELECT {_SUMMARY_COLUMNS}
+            FROM items
+            {where_sql}
+            ORDER BY {order_sql}
+            LIMIT ?
+            """,
+            (*params, limit),
+        ).fetchall()
+        return [self._summary_from_row(row) for row in rows]
+
+    @staticmethod
+    def _filter_sql(filters: ItemFilter | None) -> tuple[list[str], list[object]]:
+        where: list[str] = []
+        params: list[object] = []
+        if filters is None:
+            return where, params
+        if filters.status is not None:
+            where.append("status = ?")
+            params.append(filters.status.value)
+        if filters.media_type is not None:
+            where.append("media_type = ?")
+            params.append(filters.media_type.value)
+        if filters.min_rating:
+            where.append(f"{SORT_SQL[SortKey.RATING]} >= ?")
+            params.append(filters.min_rating)
+        return where, params
+
+    def search(
+        self, query: str, limit: int = 100, *, filters: ItemFilter | None = None
+    ) -> list[ItemSummary]:
+        """
+        Full-text search over title, author and notes, best match first.
+
+        Each word of `query` is matched as a prefix and all words must match,
+        so typing "hob tol" finds "The Hobbit" by Tolkien.
+        """
+        match = self._fts_match_expr(query)
+        if not match:
+            return []
+
+        where, params = self._filter_sql(filters)
+        if not where:
+            # Let FTS5 stop after the top `limit` hits.
+            rows = self._query(
+                f"""
+                SELECT {_SUMMARY_COLUMNS}
+                FROM items
+                JOIN (
+                    SELECT rowid AS hit_id, bm25(items_fts, {_FTS_WEIGHTS}) AS score
+                    FROM items_fts
+                    WHERE items_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ?
+                ) AS hits ON items.id = hits.hit_id
+                ORDER BY hits.score
+                """,
+                (match, limit),
+            ).fetchall()
+        else:
+            # Filters apply to the joined rows, so the limit has to come last.
+            rows = self._query(
+                f"""
+                SELECT {_SUMMARY_COLUMNS}
+                FROM items
+                JOIN (
+                    SELECT rowid AS hit_id, bm25(items_fts, {_FTS_WEIGHTS}) AS score
+                    FROM items_fts
+                    WHERE items_fts MATCH ?
+                ) AS hits ON items.id = hits.hit_id
+                WHERE {" AND ".join(where)}
+                ORDER BY hits.score
+                LIMIT ?
+                """,
+                (match, *params, limit),
+            ).fetchall()
+        return [self._summary_from_row(row) for row in rows]
+
+    @staticmethod
+    def _fts_match_expr(query: str) -> str:
+        # Quote every token so user input can never be parsed as FTS5 syntax.
+        tokens = _FTS_TOKEN_RE.findall(query)
+        return " ".join(f'"{t}"*' for t in tokens)
+
     def add_item(
         self,
         title: str,
@@ -72,32 +446,48 @@ class ItemRepository:
         openlibrary_key: str | None = None,
         cover_id: int | None = None,
     ) -> int:
-        cur = self._conn.execute(
-            """
-            INSERT INTO items (title, media_type, status, rating, notes,
-                               author, first_publish_year, openlibrary_key, cover_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                title,
-                media_type.value,
-                status.value,
-                rating,
-                notes,
-                author,
-                first_publish_year,
-                openlibrary_key,
-                cover_id,
-            ),
-        )
-        self._conn.commit()
+        with self.batch():
+            cur = self._conn.execute(
+                _INSERT_SQL,
+                (
+                    title,
+                    media_type.value,
+                    status.value,
+                    rating,
+                    notes,
+                    author,
+                    first_publish_year,
+                    openlibrary_key,
+                    cover_id,
+                ),
+            )
         lastrowid = cur.lastrowid
         if lastrowid is None:
             raise RuntimeError("SQLite insert succeeded but cursor.lastrowid is None")
         return int(lastrowid)
 
+    def add_items(self, items: Iterable[NewItem]) -> list[int]:
+        """
+        Insert many items in one transaction; returns their new ids in order.
+        """
+        params = [self._insert_params(item) for item in items]
+        if not params:
+            return []
+
+        with self.batch():
+            self._conn.executemany(_INSERT_SQL, params)
+            # The write lock is held for the whole statement, so AUTOINCREMENT
+            # hands out consecutive ids ending at last_insert_rowid().
+            row = self._conn.execute("SELECT last_insert_rowid()").fetchone()
+        last_id = int(row[0])
+        return list(range(last_id - len(params) + 1, last_id + 1))
+
     def get_item(self, item_id: int) -> Item | None:
-        row = self._conn.execute(
+        cached = self._cache.get(item_id)
+        if cached is not None:
+            return cached
+
+        row = self._query(
             f"""
             SELECT {_ITEM_COLUMNS}
             FROM items
@@ -108,7 +498,31 @@ class ItemRepository:
 
         if row is None:
             return None
-        return self._item_from_row(row)
+        return self._decode_rows([row])[0]
+
+    def get_items(self, item_ids: Iterable[int]) -> dict[int, Item]:
+        """Load several items in one query; missing ids are simply absent."""
+        found: dict[int, Item] = {}
+        ids: list[int] = []
+        for item_id in item_ids:
+            cached = self._cache.get(item_id)
+            if cached is not None:
+                found[item_id] = cached
+            else:
+                ids.append(item_id)
+        if not ids:
+            return found
+        # json_each keeps this a single statement however many ids there are.
+        rows = self._query(
+            f"""
+            SELECT {_ITEM_COLUMNS}
+            FROM items
+            WHERE id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(ids),),
+        ).fetchall()
+        found.update((item.id, item) for item in self._decode_rows(rows))
+        return found
 
     def update_item(
         self,
@@ -128,57 +542,223 @@ class ItemRepository:
         Update an item.
 
         Extra fields default to "keep existing" so the UI can update the basics
-        without accidentally wiping author/year/cover metadata.
-        """
-        if (
-            author is _UNSET
-            or first_publish_year is _UNSET
-            or openlibrary_key is _UNSET
-            or cover_id is _UNSET
-        ):
-            existing = self.get_item(item_id)
-            if existing is None:
-                return  # or raise, but "no-op if missing" is fine for now
-
-            if author is _UNSET:
-                author = existing.author
-            if first_publish_year is _UNSET:
-                first_publish_year = existing.first_publish_year
-            if openlibrary_key is _UNSET:
-                openlibrary_key = existing.openlibrary_key
-            if cover_id is _UNSET:
-                cover_id = existing.cover_id
-
-        self._conn.execute(
-            """
-            UPDATE items
-            SET title = ?,
-                media_type = ?,
-                status = ?,
-                rating = ?,
-                notes = ?,
-                author = ?,
-                first_publish_year = ?,
-                openlibrary_key = ?,
-                cover_id = ?
-            WHERE id = ?
-            """,
-            (
-                title,
-                media_type.value,
-                status.value,
-                rating,
-                notes,
-                cast(str | None, author),
-                cast(int | None, first_publish_year),
-                cast(str | None, openlibrary_key),
-                cast(int | None, cover_id),
-                item_id,
-            ),
-        )
-        self._conn.commit()
+        without accidentally wiping author/year/cover metadata. Only columns
+        that were passed are written: nothing is read first, so a concurrent
+        change to the others (enrichment, another process) is never undone
+        with a stale copy.
+        """
+        assignments: dict[str, object] = {
+            "title": title,
+            "media_type": media_type.value,
+            "status": status.value,
+            "rating": rating,
+            "notes": notes,
+        }
+        extras = {
+            "author": author,
+            "first_publish_year": first_publish_year,
+            "openlibrary_key": openlibrary_key,
+            "cover_id": cover_id,
+        }
+        assignments.update((k, v) for k, v in extras.items() if v is not _UNSET)
+
+        # Column names come from the literal dicts above, never from input.
+        set_sql = ", ".join(f"{column} = ?" for column in assignments)
+        with self.batch():
+            self._conn.execute(
+                f"UPDATE items SET {set_sql} WHERE id = ?",
+                (*assignments.values(), item_id),
+            )
+        self._invalidate(item_id)
+
+    def update_items(self, items: Iterable[Item]) -> int:
+        """
+        Write back many full items in one transaction; returns rows changed.
+        """
+        params = [self._update_params(item) for item in items]
+        if not params:
+            return 0
+
+        with self.batch():
+            cur = self._conn.executemany(_UPDATE_SQL, params)
+        for p in params:
+            self._invalidate(cast(int, p[-1]))
+        return cur.rowcount
 
     def delete_item(self, item_id: int) -> bool:
-        cur = self._conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
-        self._conn.commit()
+        with self.batch():
+            cur = self._conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+        self._invalidate(item_id)
         return cur.rowcount > 0
+
+    def delete_items(self, item_ids: Iterable[int]) -> int:
+        """
+        Delete many items in one transaction; returns how many were removed.
+        """
+        params = [(item_id,) for item_id in item_ids]
+        if not params:
+            return 0
+
+        with self.batch():
+            cur = self._conn.executemany("DELETE FROM items WHERE id = ?", params)
+        for (item_id,) in params:
+            self._invalidate(item_id)
+        return cur.rowcount
+
+    def data_version(self) -> int:
+        """
+        Changes whenever another connection commits to the database.
+
+        Cheap enough to poll: it never touches table pages.
+        """
+        return int(self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def latest_change_seq(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM item_changes"
+        ).fetchone()
+        return int(row[0])
+
+    def changes_since(self, seq: int) -> list[ItemChange]:
+        """
+        Net changes after `seq`, one per item, ordered by their last change.
+
+        An item inserted and later updated in the window is reported as an
+        insert; anything deleted in the window is reported as a delete.
+        Changed ids are dropped from the item cache, which is how writes made
+        by other connections or processes reach it.
+        """
+        rows = self._conn.execute(
+            """
+            SELECT seq, item_id, op
+            FROM item_changes
+            WHERE seq > ?
+            ORDER BY seq
+            """,
+            (seq,),
+        ).fetchall()
+
+        net: dict[int, ItemChange] = {}
+        for change_seq, item_id, op_value in rows:
+            op = ChangeOp(op_value)
+            prev = net.pop(item_id, None)
+            if (
+                prev is not None
+                and prev.op is ChangeOp.INSERT
+                and op is ChangeOp.UPDATE
+            ):
+                op = ChangeOp.INSERT
+            net[item_id] = ItemChange(seq=int(change_seq), item_id=item_id, op=op)
+        for item_id in net:
+            self._invalidate(item_id)
+        return list(net.values())
+
+    def prune_changes(self, upto_seq: int) -> None:
+        """Drop feed entries every reader has already consumed."""
+        with self.batch():
+            self._conn.execute("DELETE FROM item_changes WHERE seq <= ?", (upto_seq,))
+
+    def existing_openlibrary_keys(self, keys: Iterable[str]) -> set[str]:
+        """The subset of `keys` some item already carries."""
+        wanted = list(set(keys))
+        if not wanted:
+            return set()
+        rows = self._query(
+            """
+            SELECT openlibrary_key
+            FROM items
+            WHERE openlibrary_key IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(wanted),),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def imported_lines(self, source: str) -> set[int]:
+        """Lines of `source` a previous import already finished."""
+        rows = self._query(
+            "SELECT line FROM import_log WHERE source = ?", (source,)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def log_imports(self, source: str, entries: Iterable[ImportLogEntry]) -> None:
+        params = [
+            (source, e.line, e.query, e.outcome.value, e.item_id) for e in entries
+        ]
+        if not params:
+            return
+        with self.batch():
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO import_log
+                    (source, line, query, outcome, item_id)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                params,
+            )
+
+    def items_to_enrich(
+        self, *, stale_before: float, after_id: int = 0, limit: int = 50
+    ) -> list[Item]:
+        """
+        Items with an openlibrary_key not enriched since `stale_before`
+        (a Unix time), in id order after `after_id`.
+        """
+        rows = self._query(
+            f"""
+            SELECT {_ITEM_COLUMNS}
+            FROM items
+            LEFT JOIN item_enrichment e ON e.item_id = items.id
+            WHERE items.openlibrary_key IS NOT NULL
+              AND (e.enriched_at IS NULL OR e.enriched_at < ?)
+              AND items.id > ?
+            ORDER BY items.id
+            LIMIT ?
+            """,
+            (stale_before, after_id, limit),
+        ).fetchall()
+        return self._decode_rows(rows)
+
+    def fill_metadata(
+        self, rows: Iterable[tuple[int, str | None, int | None, int | None]]
+    ) -> int:
+        """
+        Set author, first_publish_year and cover_id from (id, author, year,
+        cover) rows; returns how many items actually changed.
+
+        None leaves a column as it is, and no other column is touched, so
+        edits made since the rows were read are kept.
+        """
+        params = [
+            {"id": item_id, "author": author, "year": year, "cover": cover}
+            for item_id, author, year, cover in rows
+        ]
+        if not params:
+            return 0
+        with self.batch():
+            cur = self._conn.executemany(
+                """
+                UPDATE items
+                SET author = coalesce(:author, author),
+                    first_publish_year = coalesce(:year, first_publish_year),
+                    cover_id = coalesce(:cover, cover_id)
+                WHERE id = :id
+                  AND (author IS NOT coalesce(:author, author)
+                       OR first_publish_year IS NOT coalesce(:year, first_publish_year)
+                       OR cover_id IS NOT coalesce(:cover, cover_id))
+                """,
+                params,
+            )
+        for p in params:
+            self._invalidate(cast(int, p["id"]))
+        return cur.rowcount
+
+    def mark_enriched(self, item_ids: Iterable[int], at: float) -> None:
+        params = [(item_id, at) for item_id in item_ids]
+        if not params:
+            return
+        with self.batch():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO item_enrichment (item_id, enriched_at) "
+                "VALUES (?, ?)",
+                params,
+            )
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, Final, Generic, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+RETRY_ATTEMPTS: Final[int] = 4
+RETRY_BASE_S: Final[float] = 0.5
+RETRY_MAX_S: Final[float] = 8.0
+
+BREAKER_THRESHOLD: Final[int] = 5  # consecutive transient failures
+BREAKER_RESET_S: Final[float] = 30.0
+
+# Worth another try: rate limited, or the server (or a proxy) is struggling.
+_TRANSIENT_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Refused without trying: the host failed too often just now."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _TRANSIENT_STATUS
+    # Timeouts, refused/reset connections, DNS hiccups.
+    return isinstance(exc, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a host is unhealthy.
+
+    After `threshold` transient failures in a row the circuit opens and
+    calls are refused for `reset_s`. Then one trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    Event-loop only; no locking.
+    """
+
+    def __init__(
+        self, *, threshold: int = BREAKER_THRESHOLD, reset_s: float = BREAKER_RESET_S
+    ) -> None:
+        self._threshold = threshold
+        self._reset_s = reset_s
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_call(self) -> None:
+        if self._opened_at is None:
+            return
+        if self._trial_running or time.monotonic() - self._opened_at < self._reset_s:
+            raise CircuitOpenError("Open Library looks unhealthy; retrying later")
+        self._trial_running = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_running = False
+        if self._opened_at is not None or self._failures >= self._threshold:
+            self._opened_at = time.monotonic()
+
+    def abandon(self) -> None:
+        """The call never finished (cancelled): let another trial through."""
+        self._trial_running = False
+
+
+async def retry(
+    call: Callable[[], Awaitable[T]],
+    *,
+    breaker: CircuitBreaker | None = None,
+    attempts: int = RETRY_ATTEMPTS,
+    base_s: float = RETRY_BASE_S,
+    max_s: float = RETRY_MAX_S,
+) -> T:
+    """
+    Run `call`, retrying transient failures with jittered exponential backoff.
+
+    "Full jitter": the n-th wait is uniform in [0, min(max_s, base_s * 2**n)],
+    so clients that failed together do not come back together. Other errors
+    (and CircuitOpenError) propagate at once.
+    """
+    for attempt in range(attempts):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await call()
+        except Exception as e:
+            if not is_transient(e):
+                if breaker is not None:
+                    breaker.record_success()  # the host answered
+                raise
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_s, base_s * 2**attempt)))
+        except BaseException:
+            # Cancelled mid-call: no verdict on the host, but a half-open
+            # trial must not stay "running" forever.
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+    raise AssertionError("unreachable")
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future[Any]
+    waiters: int = field(default=0)
+
+
+class SingleFlight(Generic[K]):
+    """
+    Coalesce concurrent calls with the same key into one.
+
+    The first caller starts the work; callers arriving while it runs await
+    the same result (or exception). Cancelling one waiter does not disturb
+    the others; the work itself is cancelled once nobody waits for it.
+    Event-loop only.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[K, _Flight] = {}
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: K, call: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            new = _Flight(asyncio.ensure_future(call()))
+            new.task.add_done_callback(lambda _: self._forget(key, new))
+            self._flights[key] = flight = new
+
+        flight.waiters += 1
+        try:
+            result: T = await asyncio.shield(flight.task)
+            return result
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: K, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
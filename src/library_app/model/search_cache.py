@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import astuple, dataclass
+from pathlib import Path
+
+from library_app.model.db import CACHE_DB_PATH, connect
+from library_app.model.openlibrary import SEARCH_FIELDS, OLResult
+
+SEARCH_TTL_S = 24 * 3600.0  # served as-is for a day...
+SEARCH_MAX_STALE_S = 30 * 24 * 3600.0  # ...then shown while refreshing
+SEARCH_CACHE_SIZE = 1000  # pages
+
+# Bump when the table layout changes; the cache is then simply rebuilt.
+# (user_version of cache.db belongs to this table; other caches there use
+# CREATE IF NOT EXISTS only.)
+_CACHE_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    query       TEXT    NOT NULL,
+    lim         INTEGER NOT NULL,
+    start       INTEGER NOT NULL,  -- result offset of this page
+    fields      TEXT    NOT NULL,
+    results     TEXT    NOT NULL,  -- JSON array of OLResult tuples
+    fetched_at  REAL    NOT NULL,
+    last_access REAL    NOT NULL,
+    PRIMARY KEY (query, lim, start, fields)
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_cache_last_access
+ON search_cache(last_access);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Case and whitespace never change Open Library's answer."""
+    return " ".join(query.casefold().split())
+
+
+@dataclass(frozen=True, slots=True)
+class CachedSearch:
+    results: list[OLResult]
+    fetched_at: float
+    stale: bool  # past the TTL: show it, but fetch a fresh copy too
+
+
+@dataclass(frozen=True)
+class SearchCacheStats:
+    hits: int
+    stale_hits: int
+    misses: int
+    evictions: int
+    size: int
+    lookup_ms: float  # mean time to answer get()
+    fetch_ms: float  # mean network time reported through put()
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from disk, stale ones included."""
+        total = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / total if total else 0.0
+
+
+class SearchCache:
+    """
+    Open Library search pages persisted in SQLite, with TTL and LRU cap.
+
+    Entries younger than `ttl_s` are fresh. Older ones, up to `max_stale_s`,
+    are returned flagged `stale` so the caller can render them at once and
+    revalidate in the background (stale-while-revalidate). Past that they
+    count as misses. `max_entries` bounds the table; the least recently
+    read pages go first.
+
+    Thread-safe: one connection guarded by a lock. A lookup is a single
+    primary-key read and never writes: access times are kept in memory and
+    written with the next put() (or at close), so the GUI thread does not
+    wait on other writers to cache.db.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = CACHE_DB_PATH,
+        *,
+        ttl_s: float = SEARCH_TTL_S,
+        max_stale_s: float = SEARCH_MAX_STALE_S,
+        max_entries: int = SEARCH_CACHE_SIZE,
+    ) -> None:
+        self._ttl_s = ttl_s
+        self._max_stale_s = max_stale_s
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = connect(db_path, shared=True)
+        self._init_schema()
+        # Pages read since the last flush -> when.
+        self._touched: dict[tuple[str, int, int, str], float] = {}
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lookup_s = 0.0
+        self._lookups = 0
+        self._fetch_s = 0.0
+        self._fetches = 0
+
+    def _init_schema(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _CACHE_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS search_cache")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {_CACHE_VERSION}")
+        self._conn.commit()
+
+    def get(self, query: str, *, limit: int, offset: int = 0) -> CachedSearch | None:
+        started = time.perf_counter()
+        now = time.time()
+        key = (normalize_query(query), limit, offset, SEARCH_FIELDS)
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT results, fetched_at FROM search_cache
+                WHERE query = ? AND lim = ? AND start = ? AND fields = ?
+                """,
+                key,
+            ).fetchone()
+
+            age = now - row[1] if row is not None else None
+            if age is None or age > self._max_stale_s:
+                self._misses += 1
+                hit = None
+            else:
+                self._touched[key] = now
+                stale = age > self._ttl_s
+                if stale:
+                    self._stale_hits += 1
+                else:
+                    self._hits += 1
+                hit = CachedSearch(
+                    results=[OLResult(*r) for r in json.loads(row[0])],
+                    fetched_at=row[1],
+                    stale=stale,
+                )
+
+            self._lookup_s += time.perf_counter() - started
+            self._lookups += 1
+        return hit
+
+    def put(
+        self,
+        query: str,
+        *,
+        limit: int,
+        offset: int = 0,
+        results: list[OLResult],
+        fetch_s: float | None = None,
+    ) -> None:
+        """
+        Store fresh results; `fetch_s` (network time) feeds the stats.
+
+        This commits, so keep it off the GUI thread.
+        """
+        now = time.time()
+        payload = json.dumps([astuple(r) for r in results])
+        with self._lock:
+            # Recent reads count before anything is evicted.
+            self._flush_access()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO search_cache
+                    (query, lim, start, fields, results, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    normalize_query(query),
+                    limit,
+                    offset,
+                    SEARCH_FIELDS,
+                    payload,
+                    now,
+                    now,
+                ),
+            )
+            cur = self._conn.execute(
+                """
+                DELETE FROM search_cache WHERE rowid IN (
+                    SELECT rowid FROM search_cache
+                    ORDER BY last_access DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._max_entries,),
+            )
+            self._evictions += max(cur.rowcount, 0)
+            self._conn.commit()
+
+            if fetch_s is not None:
+                self._fetch_s += fetch_s
+                self._fetches += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def stats(self) -> SearchCacheStats:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+            lookups, fetches = max(self._lookups, 1), max(self._fetches, 1)
+            return SearchCacheStats(
+                hits=self._hits,
+                stale_hits=self._stale_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=size[0],
+                lookup_ms=1000 * self._lookup_s / lookups,
+                fetch_ms=1000 * self._fetch_s / fetches,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
+
+    def _flush_access(self) -> None:
+        # Caller holds the lock and commits.
+        if not self._touched:
+            return
+        self._conn.executemany(
+            """
+            UPDATE search_cache SET last_access = ?
+            WHERE query = ? AND lim = ? AND start = ? AND fields = ?
+            """,
+            [(at, *key) for key, at in self._touched.items()],
+        )
+        self._touched.clear()
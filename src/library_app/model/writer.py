@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Final, TypeVar
+
+from library_app.model.repository import ItemRepository
+
+T = TypeVar("T")
+
+# How long the writer waits for more requests after the first one arrives
+# before committing. Short enough to be invisible in the UI, long enough to
+# fold a burst of edits into a single fsync.
+GROUP_WINDOW_S: Final[float] = 0.005
+MAX_GROUP: Final[int] = 256
+
+
+@dataclass(frozen=True)
+class _Request:
+    fn: Callable[[ItemRepository], Any]
+    future: Future[Any]
+
+
+@dataclass(frozen=True)
+class WriterStats:
+    requests: int
+    commits: int
+
+
+_STOP: Final = object()
+
+
+class DbWriter:
+    """
+    Single writer thread with group commit.
+
+    All writes go through submit(); the thread owns the write connection
+    (via the repository's per-thread pool), so the Qt event loop never
+    waits on a commit. Requests arriving within GROUP_WINDOW_S of each other
+    share one transaction, each in its own savepoint so a failing request
+    does not undo the others. Futures resolve only after the commit.
+    """
+
+    def __init__(
+        self,
+        repo: ItemRepository,
+        *,
+        window_s: float = GROUP_WINDOW_S,
+        max_group: int = MAX_GROUP,
+    ) -> None:
+        self._repo = repo
+        self._window_s = window_s
+        self._max_group = max_group
+        self._queue: queue.SimpleQueue[_Request | object] = queue.SimpleQueue()
+        self._requests = 0
+        self._commits = 0
+        self._thread = threading.Thread(
+            target=self._run, name="library-db-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, fn: Callable[[ItemRepository], T]) -> Future[T]:
+        future: Future[T] = Future()
+        self._queue.put(_Request(fn, future))
+        return future
+
+    def stats(self) -> WriterStats:
+        return WriterStats(requests=self._requests, commits=self._commits)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Finish everything already queued, then stop the thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            group = [first]
+            deadline = time.monotonic() + self._window_s
+            while len(group) < self._max_group:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stopping = True
+                    break
+                group.append(nxt)
+            self._commit_group([r for r in group if isinstance(r, _Request)])
+
+    def _commit_group(self, group: list[_Request]) -> None:
+        outcomes: list[tuple[_Request, bool, Any]] = []
+        try:
+            with self._repo.batch():
+                for req in group:
+                    if not req.future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with self._repo.savepoint():
+                            result = req.fn(self._repo)
+                    except Exception as e:  # reported through the future
+                        outcomes.append((req, False, e))
+                    else:
+                        outcomes.append((req, True, result))
+        except Exception as e:  # the commit itself failed: nothing was written
+            for req, _, _ in outcomes:
+                req.future.set_exception(e)
+            return
+
+        self._requests += len(outcomes)
+        self._commits += 1
+        for req, ok, value in outcomes:
+            if ok:
+                req.future.set_result(value)
+            else:
+                req.future.set_exception(value)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import traceback
+from concurrent.futures import Future
 from typing import Any, Callable
 
 from PySide6.QtCore import QObject, QRunnable, Signal, Slot
@@ -10,6 +11,7 @@ class WorkerSignals(QObject):
     result = Signal(object)
     error = Signal(str)
     finished = Signal()
+    progress = Signal(object)  # optional, for long jobs; emit from any thread
 
 
 class Worker(QRunnable):
@@ -33,3 +35,52 @@ class Worker(QRunnable):
             self.signals.result.emit(out)
         finally:
             self.signals.finished.emit()
+
+
+# Signal objects for futures still in flight; dropped once delivered.
+_watched: set[WorkerSignals] = set()
+
+
+def watch_future(
+    future: Future[Any],
+    signals: WorkerSignals | None = None,
+    *,
+    on_result: Callable[[Any], None] | None = None,
+    on_error: Callable[[str], None] | None = None,
+    on_finished: Callable[[], None] | None = None,
+) -> WorkerSignals:
+    """
+    Bridge a concurrent.futures.Future into Qt signals.
+
+    Create this on the GUI thread: the future usually completes on another
+    thread, and Qt then queues the signals back to the receivers' thread.
+    Same result/error/finished contract as Worker.
+
+    Hand the receivers in (as `on_*`, or connected to `signals` beforehand):
+    the future may finish before this returns (one already done reports
+    right here), and a signal connected afterwards would miss it. Pass
+    `signals` also when the job needed them before it started (e.g. to
+    report progress).
+    """
+    if signals is None:
+        signals = WorkerSignals()
+    if on_result is not None:
+        signals.result.connect(on_result)
+    if on_error is not None:
+        signals.error.connect(on_error)
+    if on_finished is not None:
+        signals.finished.connect(on_finished)
+    _watched.add(signals)
+    signals.finished.connect(lambda: _watched.discard(signals))
+
+    def _done(f: Future[Any]) -> None:
+        if not f.cancelled():
+            exc = f.exception()
+            if exc is None:
+                signals.result.emit(f.result())
+            else:
+                signals.error.emit("".join(traceback.format_exception(exc)))
+        signals.finished.emit()
+
+    future.add_done_callback(_done)
+    return signals
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import QSize, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtWidgets import (
     QComboBox,
     QFormLayout,
@@ -21,14 +20,22 @@ from PySide6.QtWidgets import (
 
 from library_app.model.entities import Item
 from library_app.model.enums import ItemStatus, MediaType
+from library_app.view.pixmap_cache import PixmapCache, PixmapKey
 from library_app.view.types import ItemFormData
 
 
 class ItemDetailWidget(QGroupBox):
     save_requested = Signal()
 
-    def __init__(self, parent: QWidget | None = None) -> None:
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        *,
+        pixmap_cache: PixmapCache | None = None,
+    ) -> None:
         super().__init__("Details", parent)
+        # Fitted covers, so going back to an item does not decode it again.
+        self._pixmaps = pixmap_cache if pixmap_cache is not None else PixmapCache()
 
         self._item_id: int | None = None
 
@@ -144,21 +151,48 @@ class ItemDetailWidget(QGroupBox):
         self.cover_label.setPixmap(QPixmap())
         self.cover_label.setText("No cover")
 
-    def set_cover_path(self, path: Path | None) -> None:
-        if path is None or not path.exists():
-            self.clear_cover()
-            return
+    def cover_target_size(self) -> QSize:
+        """Device pixels a decoded cover should be scaled to, to fit as is."""
+        ratio = self.cover_label.devicePixelRatioF()
+        size = self.cover_label.size()
+        return QSize(round(size.width() * ratio), round(size.height() * ratio))
+
+    def cover_key(self, cover_id: int) -> PixmapKey:
+        """Cache key of `cover_id` fitted to the label as it is now."""
+        size = self.cover_target_size()
+        return (
+            cover_id,
+            f"{size.width()}x{size.height()}",
+            self.cover_label.devicePixelRatioF(),
+        )
 
-        pix = QPixmap(str(path))
-        if pix.isNull():
+    def show_cached_cover(self, key: PixmapKey) -> bool:
+        """Show the cover from the pixmap cache; False if it is not there."""
+        pix = self._pixmaps.get(key)
+        if pix is None:
+            return False
+        self._show_pixmap(pix)
+        return True
+
+    def set_cover_image(
+        self, image: QImage | None, *, key: PixmapKey | None = None
+    ) -> None:
+        """
+        Show a cover already decoded and scaled (cover_target_size) off-thread.
+
+        With `key` (from cover_key() when it was requested) it is also kept
+        in the pixmap cache.
+        """
+        if image is None:
             self.clear_cover()
             return
 
-        # Fit nicely in the label while keeping aspect
-        pix = pix.scaled(
-            self.cover_label.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
+        pix = QPixmap.fromImage(image)
+        pix.setDevicePixelRatio(self.cover_label.devicePixelRatioF())
+        if key is not None:
+            self._pixmaps.put(key, pix)
+        self._show_pixmap(pix)
+
+    def _show_pixmap(self, pix: QPixmap) -> None:
         self.cover_label.setText("")
         self.cover_label.setPixmap(pix)
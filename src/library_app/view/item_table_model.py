@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from collections import OrderedDict
 from typing import Any
 
 from PySide6.QtCore import (
@@ -8,12 +7,25 @@ from PySide6.QtCore import (
     QModelIndex,
     QPersistentModelIndex,
     Qt,
+    QTimer,
     Signal,
 )
-from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QPixmap
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QGuiApplication,
+    QImage,
+    QPainter,
+    QPen,
+    QPixmap,
+)
 
-from library_app.model.covers import cached_cover_path
-from library_app.model.entities import Item
+from library_app.model.cover_misses import CoverMisses, MissKind
+from library_app.model.entities import ItemSummary
+from library_app.model.query import ItemSort, SortKey, sort_value, sorts_before
+from library_app.model.repository import PAGE_SIZE
+from library_app.view.pixmap_cache import PixmapCache, PixmapKey
+from library_app.view.types import PageLoader
 
 
 class ItemTableModel(QAbstractTableModel):
@@ -21,22 +33,244 @@ class ItemTableModel(QAbstractTableModel):
     cover_requested = Signal(int)  # cover_id
     _THUMB_W = 32
     _THUMB_H = 48
+    _PAGE_SIZE = PAGE_SIZE  # one keyset page, as the repository reads it
+    # Header section -> SQL sort key, parallel to HEADERS.
+    _SORT_KEYS = (SortKey.TITLE, SortKey.MEDIA_TYPE, SortKey.STATUS, SortKey.RATING)
 
-    def __init__(self, items: list[Item] | None = None) -> None:
+    def __init__(
+        self,
+        items: list[ItemSummary] | None = None,
+        *,
+        pixmap_cache: PixmapCache | None = None,
+    ) -> None:
         super().__init__()
-        self._items: list[Item] = items or []
+        self._items: list[ItemSummary] = items or []
+        # Indexes so single-row edits and cover updates never scan the list.
+        self._row_by_id: dict[int, int] = {}
+        self._ids_by_cover: dict[int, set[int]] = {}
+        self._reindex()
+        # Lazy paging: rows are pulled from the loader as the view scrolls.
+        self._loader: PageLoader | None = None
+        self._exhausted = True
+        # Keyset cursor: the last row the loader returned, as it returned it.
+        # Rows edited since may have moved, so _items[-1] will not do.
+        self._cursor: ItemSummary | None = None
+        # None = natural order: newest first when paging, rank for search hits.
+        self._sort: ItemSort | None = None
         self._thumb_loading = self._make_placeholder("…")
         self._thumb_missing = self._make_placeholder("×")
         self._cover_requested: set[int] = set()
         self._cover_failed: set[int] = set()
-        self._pix_lru: OrderedDict[int, QPixmap] = OrderedDict()
-        self._pix_lru_max = 128  # tweak later if you want
+        # Persistent record of covers that recently failed; see set_cover_misses.
+        self._cover_misses: CoverMisses | None = None
+        # 2x thumbnails on HiDPI screens, drawn at the same logical size.
+        app = QGuiApplication.instance()
+        ratio = app.devicePixelRatio() if isinstance(app, QGuiApplication) else 1.0
+        self._thumb_scale = 2 if ratio > 1 else 1
+        # Decoded thumbnails, bounded by bytes; shared with the detail pane.
+        self._pixmaps = pixmap_cache if pixmap_cache is not None else PixmapCache()
+
+    def set_items(self, items: list[ItemSummary]) -> None:
+        self.beginResetModel()
+        self._loader = None
+        self._exhausted = True
+        self._cursor = None
+        self._items = self._sorted(items)
+        self._reindex()
+        self.endResetModel()
 
-    def set_items(self, items: list[Item]) -> None:
+    def set_page_loader(self, loader: PageLoader) -> None:
+        """
+        Switch to lazy mode: only the first page is fetched now, the rest
+        arrives through canFetchMore/fetchMore as the view scrolls.
+        """
         self.beginResetModel()
-        self._items = items
+        self._loader = loader
+        self._items = loader(after=None, limit=self._PAGE_SIZE, sort=self._page_sort)
+        self._exhausted = len(self._items) < self._PAGE_SIZE
+        self._cursor = self._items[-1] if self._items else None
+        self._reindex()
         self.endResetModel()
 
+    def canFetchMore(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> bool:  # noqa: N802
+        if parent.isValid():
+            return False
+        return self._loader is not None and not self._exhausted
+
+    def fetchMore(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> None:  # noqa: N802
+        if not self.canFetchMore(parent) or self._loader is None:
+            return
+        page = self._loader(
+            after=self._cursor, limit=self._PAGE_SIZE, sort=self._page_sort
+        )
+        if len(page) < self._PAGE_SIZE:
+            self._exhausted = True
+        if page:
+            self._cursor = page[-1]
+        # A row that changed between pages may already be here.
+        page = [item for item in page if item.id not in self._row_by_id]
+        if not page:
+            return
+        first = len(self._items)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._items.extend(page)
+        self._reindex(first)
+        self.endInsertRows()
+
+    @property
+    def _page_sort(self) -> ItemSort:
+        return self._sort if self._sort is not None else ItemSort()
+
+    def sort(
+        self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ) -> None:
+        """
+        Re-order by a header column.
+
+        Paged rows are re-fetched from SQL in the new order (first page only),
+        never sorted in memory. A plain item list (search hits, a few hundred
+        at most) is sorted in place.
+        """
+        if 0 <= column < len(self._SORT_KEYS):
+            sort: ItemSort | None = ItemSort(
+                self._SORT_KEYS[column],
+                descending=order == Qt.SortOrder.DescendingOrder,
+            )
+        else:
+            sort = None
+        if sort == self._sort:
+            return
+        self._sort = sort
+
+        if self._loader is not None:
+            self.set_page_loader(self._loader)
+        else:
+            self.set_items(self._items)
+
+    def _sorted(self, items: list[ItemSummary]) -> list[ItemSummary]:
+        sort = self._sort
+        if sort is None:
+            return items
+        return sorted(
+            items,
+            key=lambda i: (sort_value(i, sort.key), i.id),
+            reverse=sort.descending,
+        )
+
+    def insert_sorted(self, item: ItemSummary) -> int | None:
+        """
+        Insert a row where the current ordering puts it; returns the row.
+
+        Returns None (and inserts nothing) if the row belongs past the pages
+        fetched so far: it will arrive with a later page instead.
+        """
+        if self._past_fetched(item):
+            return None
+        return self.insert_item(item, self._sorted_row(item))
+
+    def _sorted_row(self, item: ItemSummary) -> int:
+        """Where `item` goes among the current rows (binary search)."""
+        sort = self._page_sort
+        lo, hi = 0, len(self._items)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if sorts_before(self._items[mid], item, sort):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _past_fetched(self, item: ItemSummary) -> bool:
+        """True if `item` sorts after the last page fetched so far."""
+        cursor = self._cursor
+        return (
+            self.canFetchMore()
+            and cursor is not None
+            and sorts_before(cursor, item, self._page_sort)
+        )
+
+    def insert_item(self, item: ItemSummary, row: int = 0) -> int:
+        """Insert one row (or update it if already present); returns its row."""
+        existing = self._row_by_id.get(item.id)
+        if existing is not None:
+            self.update_item(item)
+            return existing
+
+        row = max(0, min(row, len(self._items)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.insert(row, item)
+        self._reindex(row)
+        self.endInsertRows()
+        return row
+
+    def update_item(self, item: ItemSummary) -> bool:
+        """
+        Replace a row that is present; False if it is not.
+
+        In a sorted list a changed sort key moves the row to its new place
+        (selection follows it), or drops it if that place is past the pages
+        fetched so far: it will arrive with a later page instead.
+        """
+        row = self._row_by_id.get(item.id)
+        if row is None:
+            return False
+
+        old = self._items[row]
+        key = self._page_sort.key
+        if self._ordered and sort_value(old, key) != sort_value(item, key):
+            if self._past_fetched(item):
+                self.remove_item(item.id)
+                return True
+            row = self._move(row, item)
+
+        self._items[row] = item
+        if old.cover_id != item.cover_id:
+            self._unindex_cover(old)
+            self._index_cover(item)
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.HEADERS) - 1)
+        )
+        return True
+
+    @property
+    def _ordered(self) -> bool:
+        # Paged rows are in _page_sort order; search hits only when sorted
+        # by a header (otherwise by rank, which cannot be recomputed here).
+        return self._loader is not None or self._sort is not None
+
+    def _move(self, row: int, item: ItemSummary) -> int:
+        """Move the row at `row` to where `item` sorts; returns its new row."""
+        old = self._items.pop(row)
+        target = self._sorted_row(item)
+        self._items.insert(row, old)
+        if target == row:
+            return row
+        # beginMoveRows counts the destination before the row is taken out.
+        self.beginMoveRows(
+            QModelIndex(), row, row, QModelIndex(), target + (target > row)
+        )
+        self._items.insert(target, self._items.pop(row))
+        self._reindex(min(row, target))
+        self.endMoveRows()
+        return target
+
+    def remove_item(self, item_id: int) -> bool:
+        row = self._row_by_id.get(item_id)
+        if row is None:
+            return False
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self._items.pop(row)
+        del self._row_by_id[item_id]
+        self._unindex_cover(item)
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
     def rowCount(
         self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
     ) -> int:  # noqa: N802
@@ -87,29 +321,27 @@ class ItemTableModel(QAbstractTableModel):
             if not cover_id:
                 return None  # or: return self._thumb_missing
 
-            # LRU hit
-            pix = self._lru_get(cover_id)
+            # 1. Cache hit
+            pix = self._pixmaps.get(self._thumb_key(cover_id))
             if pix is not None:
                 return pix
 
             # 2. Failed cover → permanent placeholder
             if cover_id in self._cover_failed:
                 return self._thumb_missing
+            # ... also when Open Library said so recently (until its TTL).
+            # Any other recent failure is temporary: keep "loading" without
+            # asking again; set_cover_retryable() repaints once it is due.
+            misses = self._cover_misses
+            kind = misses.get(cover_id, "M") if misses is not None else None
+            if kind is MissKind.NOT_FOUND:
+                return self._thumb_missing
+            if kind is not None:
+                return self._thumb_loading
 
-            path = cached_cover_path(cover_id, size="M")
-            if path.exists() and path.stat().st_size > 0:
-                pix = QPixmap(str(path))
-                if not pix.isNull():
-                    pix = pix.scaled(
-                        self._THUMB_W,
-                        self._THUMB_H,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation,
-                    )
-                    self._lru_put(cover_id, pix)
-                    return pix
-
-            # Request once, show loading placeholder
+            # Nothing is read or decoded while painting: a worker decodes the
+            # thumbnail and set_cover_image() hands it over. Until then (and
+            # after an eviction from the cache) the row shows the loading placeholder.
             if cover_id not in self._cover_requested:
                 self._cover_requested.add(cover_id)
                 self.cover_requested.emit(cover_id)
@@ -118,21 +350,90 @@ class ItemTableModel(QAbstractTableModel):
 
         return None
 
-    def item_at(self, row: int) -> Item | None:
+    def item_at(self, row: int) -> ItemSummary | None:
         if 0 <= row < len(self._items):
             return self._items[row]
         return None
 
-    def set_cover_ready(self, cover_id: int, ok: bool) -> None:
-        if not ok:
+    def row_for_id(self, item_id: int) -> int | None:
+        # Only rows fetched so far are indexed.
+        return self._row_by_id.get(item_id)
+
+    @property
+    def thumb_scale(self) -> int:
+        """Device pixel ratio the thumbnails should be decoded for."""
+        return self._thumb_scale
+
+    def set_cover_image(self, cover_id: int, image: QImage | None) -> None:
+        """
+        A requested thumbnail is decoded (None: there is no cover).
+
+        Only the cheap QPixmap.fromImage upload happens here, on the GUI
+        thread.
+        """
+        self._cover_requested.discard(cover_id)
+        if image is None:
             self._cover_failed.add(cover_id)
+        else:
+            pix = QPixmap.fromImage(image)
+            pix.setDevicePixelRatio(self._thumb_scale)
+            self._pixmaps.put(self._thumb_key(cover_id), pix)
+        self._repaint_cover(cover_id)
 
-        # refresh rows that use this cover_id
-        self._pix_lru.pop(cover_id, None)
-        for row, item in enumerate(self._items):
-            if item.cover_id == cover_id:
-                idx = self.index(row, 0)
-                self.dataChanged.emit(idx, idx, [int(Qt.ItemDataRole.DecorationRole)])
+    def set_cover_misses(self, misses: CoverMisses) -> None:
+        """Skip requests for covers known to be missing or failing."""
+        self._cover_misses = misses
+
+    def set_cover_retryable(self, cover_id: int) -> None:
+        """
+        The download failed for now; ask again once the miss store allows.
+
+        The rows keep the loading placeholder meanwhile, and are repainted
+        (which asks again) when the miss expires.
+        """
+        self._cover_requested.discard(cover_id)
+        misses = self._cover_misses
+        delay = misses.expires_in(cover_id, "M") if misses is not None else None
+        if delay is not None:
+            QTimer.singleShot(
+                int(delay * 1000) + 1, self, lambda: self._repaint_cover(cover_id)
+            )
+        else:
+            self._repaint_cover(cover_id)
+
+    def _repaint_cover(self, cover_id: int) -> None:
+        for item_id in self._ids_by_cover.get(cover_id, ()):
+            idx = self.index(self._row_by_id[item_id], 0)
+            self.dataChanged.emit(idx, idx, [int(Qt.ItemDataRole.DecorationRole)])
+
+    def _reindex(self, start: int = 0) -> None:
+        """
+        Refresh row numbers from `start` on (rows before it did not move).
+
+        A full rebuild (start=0) also rebuilds the cover index; partial
+        calls index the cover of any row not seen before.
+        """
+        if start == 0:
+            self._row_by_id.clear()
+            self._ids_by_cover.clear()
+        for row in range(start, len(self._items)):
+            item = self._items[row]
+            if item.id not in self._row_by_id:
+                self._index_cover(item)
+            self._row_by_id[item.id] = row
+
+    def _index_cover(self, item: ItemSummary) -> None:
+        if item.cover_id:
+            self._ids_by_cover.setdefault(item.cover_id, set()).add(item.id)
+
+    def _unindex_cover(self, item: ItemSummary) -> None:
+        if not item.cover_id:
+            return
+        ids = self._ids_by_cover.get(item.cover_id)
+        if ids is not None:
+            ids.discard(item.id)
+            if not ids:
+                del self._ids_by_cover[item.cover_id]
 
     def _make_placeholder(self, mark: str) -> QPixmap:
         pix = QPixmap(self._THUMB_W, self._THUMB_H)
@@ -154,16 +455,5 @@ class ItemTableModel(QAbstractTableModel):
         p.end()
         return pix
 
-    def _lru_get(self, cover_id: int) -> QPixmap | None:
-        pix = self._pix_lru.get(cover_id)
-        if pix is None:
-            return None
-        # mark as recently used
-        self._pix_lru.move_to_end(cover_id)
-        return pix
-
-    def _lru_put(self, cover_id: int, pix: QPixmap) -> None:
-        self._pix_lru[cover_id] = pix
-        self._pix_lru.move_to_end(cover_id)
-        while len(self._pix_lru) > self._pix_lru_max:
-            self._pix_lru.popitem(last=False)  # evict least-recently-used
+    def _thumb_key(self, cover_id: int) -> PixmapKey:
+        return (cover_id, f"t{self._THUMB_W}x{self._THUMB_H}", self._thumb_scale)
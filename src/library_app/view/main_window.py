@@ -2,13 +2,17 @@ from __future__ import annotations
 
 from typing import cast
 
-from PySide6.QtCore import QSize, Signal
-from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtCore import QEvent, QSize, Qt, Signal
+from PySide6.QtGui import QAction, QGuiApplication, QKeySequence
 from PySide6.QtWidgets import (
     QAbstractItemView,
+    QComboBox,
+    QHBoxLayout,
     QHeaderView,
     QLabel,
+    QLineEdit,
     QMainWindow,
+    QSpinBox,
     QSplitter,
     QStatusBar,
     QTableView,
@@ -17,9 +21,13 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from library_app.model.entities import Item
+from library_app.model.entities import ItemSummary
+from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.query import ItemFilter
 from library_app.view.item_detail_widget import ItemDetailWidget
 from library_app.view.item_table_model import ItemTableModel
+from library_app.view.pixmap_cache import PixmapCache
+from library_app.view.types import PageLoader
 
 THUMB_W = 32
 THUMB_H = 48
@@ -29,6 +37,9 @@ ROW_H = THUMB_H + 6  # padding so it doesn’t touch borders
 class MainWindow(QMainWindow):
     add_item_requested = Signal()
     search_online_requested = Signal()
+    import_list_requested = Signal()
+    enrich_requested = Signal()
+    filter_changed = Signal(str)
 
     def __init__(self) -> None:
         super().__init__()
@@ -43,6 +54,18 @@ class MainWindow(QMainWindow):
         self.search_action = QAction("Search Online", self)
         self.search_action.triggered.connect(self.search_online_requested.emit)
 
+        self.import_action = QAction("Import List…", self)
+        self.import_action.setStatusTip(
+            "Add books from a CSV or text file of ISBNs or titles"
+        )
+        self.import_action.triggered.connect(self.import_list_requested.emit)
+
+        self.enrich_action = QAction("Refresh Metadata", self)
+        self.enrich_action.setStatusTip(
+            "Update author, year and cover from Open Library in the background"
+        )
+        self.enrich_action.triggered.connect(self.enrich_requested.emit)
+
         self.delete_action = QAction("Delete", self)
         self.delete_action.setShortcut(QKeySequence.StandardKey.Delete)
         self.delete_action.setStatusTip("Delete the selected item")
@@ -51,6 +74,8 @@ class MainWindow(QMainWindow):
         menu = self.menuBar().addMenu("Actions")
         menu.addAction(self.add_action)
         menu.addAction(self.search_action)
+        menu.addAction(self.import_action)
+        menu.addAction(self.enrich_action)
         menu.addSeparator()
         menu.addAction(self.delete_action)
 
@@ -64,10 +89,44 @@ class MainWindow(QMainWindow):
         self._headline.setStyleSheet("font-size: 18px; font-weight: 600;")
         layout.addWidget(self._headline)
 
+        self.filter_edit = QLineEdit(self)
+        self.filter_edit.setPlaceholderText("Filter by title, author or notes…")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.filter_changed.emit)
+
+        self.status_filter = QComboBox(self)
+        self.status_filter.addItem("Any status", None)
+        for st in ItemStatus:
+            self.status_filter.addItem(st.value, st)
+
+        self.type_filter = QComboBox(self)
+        self.type_filter.addItem("Any type", None)
+        for mt in MediaType:
+            self.type_filter.addItem(mt.value, mt)
+
+        self.rating_filter = QSpinBox(self)
+        self.rating_filter.setRange(0, 5)
+        self.rating_filter.setPrefix("Rating ≥ ")
+        self.rating_filter.setSpecialValueText("Any rating")
+
+        for combo in (self.status_filter, self.type_filter):
+            combo.currentIndexChanged.connect(self._emit_filter_changed)
+        self.rating_filter.valueChanged.connect(self._emit_filter_changed)
+
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(self.filter_edit, 1)
+        filter_row.addWidget(self.status_filter)
+        filter_row.addWidget(self.type_filter)
+        filter_row.addWidget(self.rating_filter)
+        layout.addLayout(filter_row)
+
         splitter = QSplitter(self)
         splitter.setChildrenCollapsible(False)
 
         self.table = QTableView(self)
+        # No indicator = natural order (newest first); clicking a header asks
+        # the model to re-page in that column's order.
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.DescendingOrder)
         self.table.setSortingEnabled(True)
         self.table.setIconSize(QSize(THUMB_W, THUMB_H))
         self.table.verticalHeader().setDefaultSectionSize(ROW_H)
@@ -80,7 +139,9 @@ class MainWindow(QMainWindow):
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.horizontalHeader().setStretchLastSection(True)
 
-        self.detail = ItemDetailWidget(self)
+        # One byte budget for every decoded cover on screen.
+        self.pixmap_cache = PixmapCache()
+        self.detail = ItemDetailWidget(self, pixmap_cache=self.pixmap_cache)
 
         splitter.addWidget(self.table)
         splitter.addWidget(self.detail)
@@ -89,7 +150,7 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(splitter)
 
-        self.table_model = ItemTableModel([])
+        self.table_model = ItemTableModel([], pixmap_cache=self.pixmap_cache)
         self.table.setModel(self.table_model)
 
         self.table.selectionModel().selectionChanged.connect(
@@ -98,13 +159,58 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(root)
 
+        # Give decoded covers back while nobody looks at them.
+        app = QGuiApplication.instance()
+        if isinstance(app, QGuiApplication):
+            app.applicationStateChanged.connect(self._on_app_state_changed)
+
+    def changeEvent(self, event: QEvent) -> None:  # noqa: N802
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange and self.isMinimized():
+            self._trim_pixmaps()
+
+    def _on_app_state_changed(self, state: Qt.ApplicationState) -> None:
+        if state in (
+            Qt.ApplicationState.ApplicationHidden,
+            Qt.ApplicationState.ApplicationSuspended,
+        ):
+            self._trim_pixmaps()
+
+    def _trim_pixmaps(self) -> None:
+        # Keep a quarter: the first screenful comes back without decoding.
+        self.pixmap_cache.trim(self.pixmap_cache.budget_bytes // 4)
+
+    def set_enrich_running(self, running: bool) -> None:
+        self.enrich_action.setText(
+            "Stop Metadata Refresh" if running else "Refresh Metadata"
+        )
+
     def set_status(self, text: str) -> None:
         self._status.showMessage(text)
 
-    def set_items(self, items: list[Item]) -> None:
+    def set_items(self, items: list[ItemSummary]) -> None:
         self.table_model.set_items(items)
         self.table.resizeColumnsToContents()
 
+    def set_item_loader(self, loader: PageLoader) -> None:
+        # Columns are sized from the first page only; later pages stream in.
+        self.table_model.set_page_loader(loader)
+        self.table.resizeColumnsToContents()
+
+    def filter_text(self) -> str:
+        return self.filter_edit.text().strip()
+
+    def current_filters(self) -> ItemFilter:
+        rating = self.rating_filter.value()
+        return ItemFilter(
+            status=self.status_filter.currentData(),
+            media_type=self.type_filter.currentData(),
+            min_rating=rating or None,
+        )
+
+    def _emit_filter_changed(self) -> None:
+        self.filter_changed.emit(self.filter_edit.text())
+
     def _on_selection_changed(self) -> None:
         self.delete_action.setEnabled(self.selected_item_id() is not None)
 
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Final
+
+from PySide6.QtGui import QPixmap
+
+PIXMAP_CACHE_BUDGET: Final[int] = 64 * 1024 * 1024  # bytes of pixel data
+
+# (cover_id, size, device pixel ratio). `size` names the rendition: a
+# thumbnail tier like "t32x48", or "WxH" device pixels for a fitted cover.
+PixmapKey = tuple[int, str, float]
+
+
+@dataclass(frozen=True)
+class PixmapCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    budget: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def pixmap_bytes(pix: QPixmap) -> int:
+    return pix.width() * pix.height() * max(pix.depth(), 8) // 8
+
+
+class PixmapCache:
+    """
+    Decoded covers shared by the list and the detail pane, bounded by bytes.
+
+    A count cap either thrashes (a tall window shows 100+ thumbnails) or
+    lets a few detail-size covers eat the memory; this one evicts least
+    recently used pixmaps once their pixel data passes `budget_bytes`. A
+    single pixmap bigger than a quarter of the budget is not kept at all.
+    trim() drops down to a lower target when memory is tight. GUI thread
+    only, like QPixmap itself.
+    """
+
+    def __init__(self, budget_bytes: int = PIXMAP_CACHE_BUDGET) -> None:
+        self._budget = budget_bytes
+        self._pixmaps: OrderedDict[PixmapKey, QPixmap] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    def get(self, key: PixmapKey) -> QPixmap | None:
+        pix = self._pixmaps.get(key)
+        if pix is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._pixmaps.move_to_end(key)
+        return pix
+
+    def put(self, key: PixmapKey, pix: QPixmap) -> None:
+        self.discard(key)
+        size = pixmap_bytes(pix)
+        if size > self._budget // 4:
+            return
+        self._pixmaps[key] = pix
+        self._bytes += size
+        self._evict_to(self._budget)
+
+    def discard(self, key: PixmapKey) -> None:
+        pix = self._pixmaps.pop(key, None)
+        if pix is not None:
+            self._bytes -= pixmap_bytes(pix)
+
+    def trim(self, target_bytes: int = 0) -> int:
+        """Evict down to `target_bytes` (e.g. when hidden); returns bytes freed."""
+        before = self._bytes
+        self._evict_to(target_bytes)
+        return before - self._bytes
+
+    def clear(self) -> None:
+        self._pixmaps.clear()
+        self._bytes = 0
+
+    def stats(self) -> PixmapCacheStats:
+        return PixmapCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._pixmaps),
+            bytes=self._bytes,
+            budget=self._budget,
+        )
+
+    def _evict_to(self, target: int) -> None:
+        while self._bytes > target and self._pixmaps:
+            _, pix = self._pixmaps.popitem(last=False)
+            self._bytes -= pixmap_bytes(pix)
+            self._evictions += 1
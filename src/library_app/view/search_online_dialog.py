@@ -1,24 +1,29 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import (
     QDialog,
     QHBoxLayout,
     QLabel,
     QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from library_app.model.openlibrary import OLResult
+from library_app.view.search_results_model import SearchResultsModel
 
 
 class SearchOnlineDialog(QDialog):
     search_requested = Signal(str)
+    more_requested = Signal(str, int)  # query, offset of the next page
     import_requested = Signal(object)  # OLResult
+    # Typing pauses this long before a search goes out.
+    _DEBOUNCE_MS = 300
+    # Shorter queries only search on Enter / the button: too broad to be useful.
+    _MIN_AUTO_CHARS = 3
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -29,19 +34,30 @@ class SearchOnlineDialog(QDialog):
         self.query_edit.setPlaceholderText("Search books (e.g. The Hobbit)")
 
         self.search_btn = QPushButton("Search")
-        self.search_btn.clicked.connect(
-            lambda: self.search_requested.emit(self.query_edit.text())
-        )
+        self.search_btn.clicked.connect(self._search_now)
+        self.search_btn.setDefault(True)  # Enter searches right away
+
+        # Search as you type, once the user pauses.
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self._DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._on_debounced)
+        self.query_edit.textChanged.connect(lambda _: self._debounce.start())
+
+        self.busy_label = QLabel("")
 
         top = QHBoxLayout()
         top.addWidget(QLabel("Query:"))
         top.addWidget(self.query_edit, 1)
+        top.addWidget(self.busy_label)
         top.addWidget(self.search_btn)
 
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(
-            ["Title", "Author", "Year", "Editions", "Key"]
-        )
+        # Rows arrive a page at a time as the table is scrolled down.
+        self.results_model = SearchResultsModel()
+        self.results_model.more_requested.connect(self._on_more_requested)
+
+        self.table = QTableView()
+        self.table.setModel(self.results_model)
         self.table.setSelectionBehavior(self.table.SelectionBehavior.SelectRows)
         self.table.setSelectionMode(self.table.SelectionMode.SingleSelection)
 
@@ -49,50 +65,80 @@ class SearchOnlineDialog(QDialog):
         self.import_btn.setEnabled(False)
         self.import_btn.clicked.connect(self._on_import)
 
-        self.table.itemSelectionChanged.connect(self._on_selection_changed)
+        self.table.selectionModel().selectionChanged.connect(self._on_selection_changed)
 
         layout = QVBoxLayout(self)
         layout.addLayout(top)
         layout.addWidget(self.table, 1)
         layout.addWidget(self.import_btn)
 
-        self._results: list[OLResult] = []
+        # Bumped per search; replies tagged with an older one are dropped.
+        self._generation = 0
+        self._last_query: str | None = None
         self.query_edit.setFocus()
 
+    def begin_search(self) -> int:
+        """Start a new search generation; earlier ones become stale."""
+        self._generation += 1
+        return self._generation
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self._generation
+
     def set_busy(self, busy: bool) -> None:
-        self.search_btn.setEnabled(not busy)
-        self.query_edit.setEnabled(not busy)
-
-    def set_results(self, results: list[OLResult]) -> None:
-        self._results = results
-        self.table.setRowCount(0)
-        for r in results:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(r.title))
-            self.table.setItem(row, 1, QTableWidgetItem(r.author))
-            self.table.setItem(
-                row,
-                2,
-                QTableWidgetItem(
-                    "" if r.first_publish_year is None else str(r.first_publish_year)
-                ),
-            )
-            self.table.setItem(
-                row,
-                3,
-                QTableWidgetItem(
-                    "" if r.edition_count is None else str(r.edition_count)
-                ),
-            )
-            self.table.setItem(row, 4, QTableWidgetItem(r.key))
-        self.import_btn.setEnabled(False)
+        # The query box stays editable: typing supersedes the running search.
+        self.busy_label.setText("Searching…" if busy else "")
+
+    def show_page(
+        self,
+        generation: int,
+        offset: int,
+        results: list[OLResult],
+        *,
+        exhausted: bool,
+    ) -> None:
+        """Show one page of hits; pages of an outdated search are dropped."""
+        if not self.is_current(generation):
+            return
+        if offset == 0:
+            self.results_model.set_results(results, exhausted=exhausted)
+            self.import_btn.setEnabled(False)
+        else:
+            self.results_model.append_page(offset, results, exhausted=exhausted)
+
+    def page_failed(self, generation: int) -> None:
+        if self.is_current(generation):
+            self.results_model.stop_paging()
+
+    def _search_now(self) -> None:
+        self._debounce.stop()
+        self._request(self.query_edit.text(), force=True)
+
+    def _on_debounced(self) -> None:
+        text = self.query_edit.text()
+        if len(text.strip()) >= self._MIN_AUTO_CHARS:
+            self._request(text, force=False)
+
+    def _request(self, text: str, *, force: bool) -> None:
+        query = " ".join(text.split())
+        # Typing "dune" -> "dune " -> "dune" should not search three times.
+        if not query or (query == self._last_query and not force):
+            return
+        self._last_query = query
+        self.search_requested.emit(query)
+
+    def _on_more_requested(self, offset: int) -> None:
+        if self._last_query:
+            self.more_requested.emit(self._last_query, offset)
 
     def _on_selection_changed(self) -> None:
-        self.import_btn.setEnabled(len(self.table.selectedItems()) > 0)
+        self.import_btn.setEnabled(self.table.selectionModel().hasSelection())
 
     def _on_import(self) -> None:
-        row = self.table.currentRow()
-        if row < 0 or row >= len(self._results):
-            return
-        self.import_requested.emit(self._results[row])
+        result = self.results_model.result_at(self.table.currentIndex().row())
+        if result is not None:
+            self.import_requested.emit(result)
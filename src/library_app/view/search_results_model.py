@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Any
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+    Signal,
+)
+
+from library_app.model.openlibrary import OLResult
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """
+    Open Library hits, appended a page at a time.
+
+    Pages come from the network, so fetchMore cannot block: it emits
+    `more_requested(offset)` and the page arrives later through
+    append_page(). Until then (or after a failure) no further page is asked
+    for.
+    """
+
+    HEADERS = ["Title", "Author", "Year", "Editions", "Key"]
+    more_requested = Signal(int)  # offset of the next page
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._results: list[OLResult] = []
+        self._keys: set[str] = set()
+        # Raw hits received so far: the next page's offset. Can exceed
+        # len(self._results) when a page overlaps the previous one.
+        self._fetched = 0
+        self._exhausted = True
+        self._loading = False
+
+    def set_results(self, results: list[OLResult], *, exhausted: bool) -> None:
+        self.beginResetModel()
+        self._results = []
+        self._keys.clear()
+        self._add(results)
+        self._fetched = len(results)
+        self._exhausted = exhausted
+        self._loading = False
+        self.endResetModel()
+
+    def append_page(
+        self, offset: int, results: list[OLResult], *, exhausted: bool
+    ) -> None:
+        """Add the page starting at `offset`; ignored if it is not the next one."""
+        if offset != self._fetched:
+            return  # reset (or re-fetched) since it was asked for
+        self._loading = False
+        self._fetched += len(results)
+        self._exhausted = exhausted
+
+        # Results shift while paging; do not show the same work twice.
+        fresh = [r for r in results if not r.key or r.key not in self._keys]
+        if not fresh:
+            return
+        first = len(self._results)
+        self.beginInsertRows(QModelIndex(), first, first + len(fresh) - 1)
+        self._add(fresh)
+        self.endInsertRows()
+
+    def stop_paging(self) -> None:
+        """A page failed: keep what is shown and stop asking for more."""
+        self._loading = False
+        self._exhausted = True
+
+    def _add(self, results: list[OLResult]) -> None:
+        self._results.extend(results)
+        self._keys.update(r.key for r in results if r.key)
+
+    def result_at(self, row: int) -> OLResult | None:
+        if 0 <= row < len(self._results):
+            return self._results[row]
+        return None
+
+    def canFetchMore(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> bool:  # noqa: N802
+        if parent.isValid():
+            return False
+        return not self._exhausted and not self._loading
+
+    def fetchMore(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> None:  # noqa: N802
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        self.more_requested.emit(self._fetched)
+
+    def rowCount(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self._results)
+
+    def columnCount(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:  # noqa: N802
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal and 0 <= section < len(
+            self.HEADERS
+        ):
+            return self.HEADERS[section]
+        return None
+
+    def data(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        role: int = int(Qt.ItemDataRole.DisplayRole),
+    ) -> Any:  # noqa: N802
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        r = self._results[index.row()]
+        col = index.column()
+        if col == 0:
+            return r.title
+        if col == 1:
+            return r.author
+        if col == 2:
+            return "" if r.first_publish_year is None else str(r.first_publish_year)
+        if col == 3:
+            return "" if r.edition_count is None else str(r.edition_count)
+        if col == 4:
+            return r.key
+        return None
@@ -1,6 +1,8 @@
-from typing import TypedDict
+from typing import Protocol, TypedDict
 
+from library_app.model.entities import ItemSummary
 from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.query import ItemSort
 
 
 class ItemFormData(TypedDict):
@@ -9,3 +11,11 @@ class ItemFormData(TypedDict):
     status: ItemStatus
     rating: int | None
     notes: str
+
+
+class PageLoader(Protocol):
+    """Fetches the page of rows following `after` (None = first page)."""
+
+    def __call__(
+        self, *, after: ItemSummary | None, limit: int, sort: ItemSort
+    ) -> list[ItemSummary]: ...
@@ -1,11 +1,13 @@
 # tests/conftest.py
 from __future__ import annotations
 
+import os
 import sqlite3
 from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
+from PySide6.QtWidgets import QApplication
 
 
 def _apply_schema(conn: sqlite3.Connection, schema_path: Path) -> None:
@@ -25,3 +27,11 @@ def db_conn(tmp_path: Path) -> Iterator[sqlite3.Connection]:
 
     yield conn
     conn.close()
+
+
+@pytest.fixture(scope="session")
+def qt_app() -> QApplication:
+    # QPixmap and widgets need an application; no display is needed offscreen.
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance()
+    return app if isinstance(app, QApplication) else QApplication([])
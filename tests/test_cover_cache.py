@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from library_app.model.cover_cache import CoverCache
+
+
+def _open(tmp_path: Path, budget: int = 10_000) -> CoverCache:
+    return CoverCache(tmp_path / "covers", tmp_path / "cache.db", budget_bytes=budget)
+
+
+def test_index_answers_lookups_and_survives_restart(tmp_path: Path) -> None:
+    cache = _open(tmp_path)
+    cache.put(1, "M", b"x" * 100)
+    assert cache.contains(1, "M")
+    assert not cache.contains(1, "L")
+    assert cache.total_bytes == 100
+    cache.close()
+
+    cache = _open(tmp_path)
+    assert cache.contains(1, "M")
+    assert cache.read(1, "M") == b"x" * 100
+
+    # A file removed behind the index is noticed on read, then forgotten.
+    cache.path(1, "M").unlink()
+    assert cache.read(1, "M") is None
+    assert not cache.contains(1, "M")
+    assert cache.total_bytes == 0
+    cache.close()
+
+
+def test_eviction_drops_least_recently_used(tmp_path: Path) -> None:
+    cache = _open(tmp_path, budget=1000)
+    for cover_id in (1, 2, 3):
+        cache.put(cover_id, "M", b"x" * 300)
+        time.sleep(0.01)
+    assert cache.read(1, "M") is not None  # 2 is now the oldest
+
+    cache.put(4, "M", b"x" * 300)  # 1200 bytes: over budget
+    deadline = time.monotonic() + 5
+    while cache.total_bytes > 1000 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert cache.total_bytes <= 900
+    assert not cache.contains(2, "M")
+    assert not cache.path(2, "M").exists()
+    assert cache.contains(1, "M") and cache.contains(4, "M")
+    cache.close()
+
+
+def test_files_cached_before_the_index_are_adopted(tmp_path: Path) -> None:
+    root = tmp_path / "covers"
+    root.mkdir()
+    (root / "5-M.jpg").write_bytes(b"x" * 50)
+    (root / "5-t32x48.jpg").write_bytes(b"x" * 5)
+
+    cache = _open(tmp_path)
+    assert cache.contains(5, "M") and cache.contains(5, "t32x48")
+    assert cache.total_bytes == 55
+    cache.close()
+
+
+def test_lookups_do_not_wait_for_index_writes(tmp_path: Path) -> None:
+    cache = _open(tmp_path)
+    cache.put(1, "M", b"x" * 100)
+
+    def answers_promptly(cover_id: int) -> bool:
+        found: list[bool] = []
+        probe = threading.Thread(
+            target=lambda: found.append(cache.contains(cover_id, "M"))
+        )
+        probe.start()
+        probe.join(timeout=1)
+        return found == [True]
+
+    # As if a commit were stuck on a slow disk: stores and drops queue up
+    # behind the connection, lookups must not.
+    with cache._db_lock:
+        store = threading.Thread(target=cache.put, args=(2, "M", b"y" * 100))
+        store.start()
+        drop = threading.Thread(target=cache._drop, args=([(1, "M")],))
+        drop.start()
+        deadline = time.monotonic() + 5
+        while not answers_promptly(2) or cache.contains(1, "M"):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    store.join(timeout=5)
+    drop.join(timeout=5)
+    cache.close()
+
+    cache = _open(tmp_path)  # the index caught up once the lock was free
+    assert cache.contains(2, "M")
+    assert not cache.contains(1, "M")
+    assert not cache.path(1, "M").exists()
+    cache.close()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from library_app.model.cover_misses import CoverMisses, MissKind
+
+
+def test_cover_misses_persist_across_sessions(tmp_path: Path) -> None:
+    db = tmp_path / "cache.db"
+    misses = CoverMisses(db)
+    misses.record(1, "M", MissKind.NOT_FOUND)
+    misses.record(2, "M", MissKind.ERROR)
+    misses.close()
+
+    reopened = CoverMisses(db)
+    assert reopened.get(1, "M") is MissKind.NOT_FOUND
+    assert reopened.get(2, "M") is MissKind.ERROR
+    assert reopened.get(1, "S") is None  # sizes are tracked separately
+
+    reopened.forget(2, "M")
+    assert reopened.get(2, "M") is None
+    reopened.close()
+
+
+def test_cover_misses_expire_per_kind(tmp_path: Path) -> None:
+    db = tmp_path / "cache.db"
+    misses = CoverMisses(db)
+    misses.record(1, "M", MissKind.NOT_FOUND)
+    misses.record(2, "M", MissKind.ERROR)
+    misses.close()
+
+    short_errors = CoverMisses(
+        db, ttl_s={MissKind.NOT_FOUND: 3600.0, MissKind.ERROR: 0.0}
+    )
+    assert short_errors.get(1, "M") is MissKind.NOT_FOUND
+    assert short_errors.get(2, "M") is None
+    short_errors.close()
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from library_app.model import cover_pack
+from library_app.model.cover_cache import CoverCache
+from library_app.model.cover_pack import PackedCoverCache
+
+
+def _open(tmp_path: Path, budget: int = 10_000) -> PackedCoverCache:
+    return PackedCoverCache(
+        tmp_path / "covers", tmp_path / "cache.db", budget_bytes=budget
+    )
+
+
+def test_pack_round_trip_and_restart(tmp_path: Path) -> None:
+    cache = _open(tmp_path)
+    cache.put(1, "M", b"a" * 100)
+    cache.put(2, "M", b"b" * 50)
+    cache.put(1, "M", b"c" * 80)  # replaced: the old bytes are garbage
+    assert cache.read(1, "M") == b"c" * 80
+    assert cache.dead_bytes == 100
+    cache.close()
+
+    cache = _open(tmp_path)
+    assert cache.read(1, "M") == b"c" * 80
+    assert cache.read(2, "M") == b"b" * 50
+    assert sorted(p.name for p in cache.root.iterdir()) == ["covers-0.pack"]
+
+    # Callers that need a file get one extracted from the pack.
+    assert cache.path(2, "M").read_bytes() == b"b" * 50
+    assert not cache.path(3, "M").exists()
+    cache.close()
+
+
+def test_compaction_keeps_live_entries(tmp_path: Path) -> None:
+    cache = _open(tmp_path)
+    for cover_id in range(10):
+        cache.put(cover_id, "M", bytes([cover_id]) * 100)
+    for cover_id in range(0, 10, 2):
+        cache.put(cover_id, "M", bytes([cover_id + 100]) * 10)
+    old_pack = cache.pack_path
+
+    assert cache.compact() == 500
+    assert cache.dead_bytes == 0
+    assert not old_pack.exists()
+    assert cache.pack_path.stat().st_size == cache.total_bytes == 550
+    cache.close()
+
+    cache = _open(tmp_path)  # the new generation and offsets were saved
+    for cover_id in range(10):
+        if cover_id % 2 == 0:
+            assert cache.read(cover_id, "M") == bytes([cover_id + 100]) * 10
+        else:
+            assert cache.read(cover_id, "M") == bytes([cover_id]) * 100
+    cache.close()
+
+
+def test_eviction_compacts_the_pack(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cover_pack, "_COMPACT_MIN_DEAD", 0)
+    monkeypatch.setattr(cover_pack, "COMPACT_DEAD_RATIO", 0.1)
+    cache = _open(tmp_path, budget=1000)
+    for cover_id in range(11):  # the last one starts a background eviction
+        cache.put(cover_id, "M", bytes([cover_id]) * 100)
+
+    deadline = time.monotonic() + 5
+    while (cache.total_bytes > 900 or cache.dead_bytes) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.total_bytes <= 900
+    assert cache.dead_bytes == 0
+    assert cache.pack_path.stat().st_size == cache.total_bytes
+    assert cache.read(10, "M") == bytes([10]) * 100
+    assert not cache.contains(0, "M")
+    cache.close()
+
+
+def test_loose_files_move_into_the_pack(tmp_path: Path) -> None:
+    root = tmp_path / "covers"
+    root.mkdir()
+    (root / "5-M.jpg").write_bytes(b"x" * 50)
+
+    cache = _open(tmp_path)
+    assert cache.read(5, "M") == b"x" * 50
+    assert not (root / "5-M.jpg").exists()
+    cache.close()
+
+
+def test_moving_from_the_file_cache_drops_its_index_rows(tmp_path: Path) -> None:
+    files = CoverCache(tmp_path / "covers", tmp_path / "cache.db")
+    files.put(5, "M", b"x" * 50)
+    files.close()
+
+    cache = _open(tmp_path)
+    assert cache.read(5, "M") == b"x" * 50
+    cache.close()
+
+    # Going back finds no stale entries for files that are gone.
+    files = CoverCache(tmp_path / "covers", tmp_path / "cache.db")
+    assert not files.contains(5, "M")
+    assert files.total_bytes == 0
+    files.close()
+
+
+class _WatchedConnection:
+    """Checks, on every commit, that the in-memory lock is free."""
+
+    def __init__(self, conn: sqlite3.Connection, cache: PackedCoverCache) -> None:
+        self._conn = conn
+        self._cache = cache
+        self.commits = 0
+
+    def commit(self) -> None:
+        assert not self._cache._lock.locked()
+        self.commits += 1
+        self._conn.commit()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+def test_compaction_commits_without_holding_up_lookups(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = _open(tmp_path)
+    for cover_id in range(10):
+        cache.put(cover_id, "M", bytes([cover_id]) * 100)
+        cache.put(cover_id, "M", bytes([cover_id]) * 50)
+    conn = _WatchedConnection(cache._conn, cache)
+    monkeypatch.setattr(cache, "_conn", conn)
+
+    assert cache.compact() == 1000
+    assert conn.commits == 1
+    assert [cache.read(i, "M") for i in range(10)] == [
+        bytes([i]) * 50 for i in range(10)
+    ]
+    cache.close()
+
+
+def test_reads_during_compaction_see_live_bytes(tmp_path: Path) -> None:
+    cache = _open(tmp_path, budget=1_000_000)
+    for cover_id in range(50):
+        cache.put(cover_id, "M", bytes([cover_id]) * 100)
+    wrong: list[int] = []
+    done = threading.Event()
+
+    def read_all() -> None:
+        while not done.is_set():
+            for cover_id in range(1, 50, 2):
+                if cache.read(cover_id, "M") != bytes([cover_id]) * 100:
+                    wrong.append(cover_id)
+
+    reader = threading.Thread(target=read_all)
+    reader.start()
+    for _ in range(20):
+        for cover_id in range(0, 50, 2):
+            cache.put(cover_id, "M", bytes([cover_id]) * 10)
+        assert cache.compact() > 0
+    done.set()
+    reader.join()
+    assert wrong == []
+    cache.close()
+
+
+def test_appends_are_read_without_remapping_each_time(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cover_pack, "_REMAP_STEP", 1000)
+    cache = _open(tmp_path)
+    cache.put(1, "M", b"a" * 100)
+    assert cache.read(1, "M") == b"a" * 100
+    mapping = cache._map
+
+    cache.put(2, "M", b"b" * 500)  # past the mapping: read from the file
+    assert cache.read(2, "M") == b"b" * 500
+    assert cache._map is mapping
+
+    cache.put(3, "M", b"c" * 500)  # enough piled up to map again
+    assert cache.read(3, "M") == b"c" * 500
+    assert cache._map is not mapping
+    assert cache.read(1, "M") == b"a" * 100
+    cache.close()
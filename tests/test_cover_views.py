@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtTest import QTest
+
+from library_app.model.cover_misses import CoverMisses, MissKind
+from library_app.model.entities import ItemSummary
+from library_app.model.enums import ItemStatus, MediaType
+from library_app.view.item_detail_widget import ItemDetailWidget
+from library_app.view.item_table_model import ItemTableModel
+from library_app.view.pixmap_cache import PixmapCache
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+_DECORATION = Qt.ItemDataRole.DecorationRole
+
+
+def _image(w: int, h: int) -> QImage:
+    image = QImage(w, h, QImage.Format.Format_RGB32)
+    image.fill(QColor(30, 30, 200))
+    return image
+
+
+def test_table_shows_loading_placeholder_until_the_thumbnail_is_decoded() -> None:
+    model = ItemTableModel(
+        [
+            ItemSummary(1, "Dune", MediaType.BOOK, ItemStatus.DONE, None, 7),
+            ItemSummary(2, "Emma", MediaType.BOOK, ItemStatus.DONE, None, 8),
+        ]
+    )
+    requested: list[int] = []
+    model.cover_requested.connect(requested.append)
+    dune, emma = model.index(0, 0), model.index(1, 0)
+
+    loading = model._thumb_loading.cacheKey()
+    assert model.data(dune, _DECORATION).cacheKey() == loading
+    assert model.data(dune, _DECORATION).cacheKey() == loading
+    assert requested == [7]  # asked for once, not on every paint
+
+    model.set_cover_image(7, _image(32, 48))
+    thumb = model.data(dune, _DECORATION)
+    assert thumb.cacheKey() != loading
+    assert (thumb.width(), thumb.height()) == (32, 48)
+
+    model.data(emma, _DECORATION)
+    model.set_cover_image(8, None)  # there is no cover
+    missing = model.data(emma, _DECORATION)
+    assert missing.cacheKey() == model._thumb_missing.cacheKey()
+    assert requested == [7, 8]  # and it is not asked for again
+
+
+def test_only_a_missing_cover_shows_the_missing_placeholder(tmp_path: Path) -> None:
+    misses = CoverMisses(tmp_path / "cache.db", ttl_s={MissKind.REFUSED: 0.05})
+    misses.record(7, "M", MissKind.NOT_FOUND)
+    misses.record(8, "M", MissKind.ERROR)
+    misses.record(9, "M", MissKind.REFUSED)
+    model = ItemTableModel(
+        [
+            ItemSummary(i, str(i), MediaType.BOOK, ItemStatus.DONE, None, i)
+            for i in (7, 8, 9)
+        ]
+    )
+    model.set_cover_misses(misses)
+    requested: list[int] = []
+    model.cover_requested.connect(requested.append)
+    missing, loading = model._thumb_missing.cacheKey(), model._thumb_loading.cacheKey()
+
+    def shown(row: int) -> int:
+        return int(model.data(model.index(row, 0), _DECORATION).cacheKey())
+
+    # A failed download is not "no cover": it keeps loading, unasked.
+    assert [shown(0), shown(1), shown(2)] == [missing, loading, loading]
+    assert requested == []
+
+    # Once the refusal runs out, the row is repainted and asks again.
+    repainted: list[int] = []
+    model.dataChanged.connect(lambda top, bottom: repainted.append(top.row()))
+    model.set_cover_retryable(9)
+    assert repainted == []
+    QTest.qWait(200)
+    assert repainted == [2]
+    assert shown(2) == loading
+    assert requested == [9]
+    misses.close()
+
+
+def test_detail_pane_caches_covers_fitted_to_the_label() -> None:
+    pixmaps = PixmapCache()
+    detail = ItemDetailWidget(pixmap_cache=pixmaps)
+    detail.cover_label.resize(150, 250)
+    ratio = detail.cover_label.devicePixelRatioF()
+
+    size = detail.cover_target_size()
+    assert (size.width(), size.height()) == (round(150 * ratio), round(250 * ratio))
+    key = detail.cover_key(7)
+    assert key == (7, f"{size.width()}x{size.height()}", ratio)
+    assert not detail.show_cached_cover(key)
+
+    detail.set_cover_image(_image(size.width(), size.height()), key=key)
+    assert pixmaps.get(key) is not None
+    assert detail.cover_label.text() == ""
+
+    detail.set_cover_image(None)
+    assert detail.cover_label.text() == "No cover"
+    assert detail.show_cached_cover(key)  # back to it: no decode needed
+    assert detail.cover_label.pixmap().deviceIndependentSize().width() == 150
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QBuffer, QIODevice
+from PySide6.QtGui import QColor, QImage
+
+from library_app.model import covers
+from library_app.model.cover_cache import CoverCache
+from library_app.model.cover_pack import PackedCoverCache
+
+
+@pytest.fixture(params=[CoverCache, PackedCoverCache])
+def cover_dir(tmp_path: Path, request: pytest.FixtureRequest) -> Iterator[Path]:
+    cache = request.param(tmp_path / "covers", tmp_path / "cache.db")
+    covers.set_cover_cache(cache)
+    yield cache.root
+    covers.set_cover_cache(None)
+    cache.close()
+
+
+def _jpeg(w: int, h: int) -> bytes:
+    image = QImage(w, h, QImage.Format.Format_RGB32)
+    image.fill(QColor(200, 30, 30))
+    buf = QBuffer()
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    assert image.save(buf, "JPG")  # type: ignore[call-overload]
+    return bytes(buf.data().data())
+
+
+def test_thumbnails_are_scaled_once_per_tier(cover_dir: Path) -> None:
+    source = _jpeg(180, 270)
+
+    assert not covers.has_thumbnails(7)
+    assert covers.ensure_thumbnails(7, source)
+
+    assert covers.has_thumbnails(7)
+    for scale, (w, h) in covers.THUMB_SIZES.items():
+        thumb = covers.load_thumbnail(7, scale=scale)
+        assert thumb is not None
+        assert (thumb.width(), thumb.height()) == (w, h)
+    assert not list(cover_dir.glob(".*tmp*"))
+
+
+def test_undecodable_cover_yields_no_thumbnails(cover_dir: Path) -> None:
+    assert not covers.ensure_thumbnails(8, b"not a jpeg")
+    assert not covers.has_thumbnails(8)
+
+
+def test_cover_image_is_fitted_to_the_box(cover_dir: Path) -> None:
+    covers.store_cover(9, _jpeg(120, 180))
+
+    fitted = covers.load_cover_image(9, 60, 120)
+    assert fitted is not None
+    assert (fitted.width(), fitted.height()) == (60, 90)  # aspect ratio kept
+
+    assert covers.load_cover_image(10, 60, 120) is None  # not cached
+    covers.store_cover(11, b"not a jpeg")
+    assert covers.load_cover_image(11, 60, 120) is None
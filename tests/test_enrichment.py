@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from library_app.model.db import ConnectionPool
+from library_app.model.enrichment import EnrichProgress, enrich_items
+from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.ol_client import OpenLibraryClient
+from library_app.model.openlibrary import OLResult
+from library_app.model.repository import ItemRepository
+from library_app.model.writer import DbWriter
+
+
+class FakeClient(OpenLibraryClient):
+    def __init__(self, works: dict[str, OLResult]) -> None:
+        super().__init__()
+        self._works = works
+        self.requested: list[list[str]] = []
+
+    async def works(self, keys: list[str]) -> dict[str, OLResult]:
+        self.requested.append(keys)
+        return {k: self._works[k] for k in keys if k in self._works}
+
+
+def _run(writer: DbWriter, client: FakeClient) -> EnrichProgress:
+    return asyncio.run(
+        enrich_items(client=client, writer=writer, batch_size=2, pause_s=0)
+    )
+
+
+def test_enrich_fills_metadata_and_skips_fresh_rows(tmp_path: Path) -> None:
+    repo = ItemRepository(pool=ConnectionPool(tmp_path / "e.db"))
+    dune = repo.add_item(
+        title="Dune",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        author="F. Herbert",
+        openlibrary_key="/works/OL1W",
+    )
+    repo.add_item(
+        title="Emma",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        openlibrary_key="/works/OL2W",
+    )
+    repo.add_item(title="Local", media_type=MediaType.MOVIE, status=ItemStatus.DONE)
+    writer = DbWriter(repo)
+
+    client = FakeClient(
+        {"/works/OL1W": OLResult("/works/OL1W", "Dune", "", 1965, 3, 42)}
+    )
+    first = _run(writer, client)
+
+    assert (first.checked, first.updated) == (2, 1)
+    item = repo.get_item(dune)
+    assert item is not None
+    # A blank author from Open Library does not wipe the local one.
+    assert (item.author, item.first_publish_year, item.cover_id) == (
+        "F. Herbert",
+        1965,
+        42,
+    )
+
+    again = FakeClient({})
+    assert _run(writer, again) == EnrichProgress(checked=0, updated=0)
+    assert again.requested == []
+    writer.close(timeout=5)
+    repo.close()
+
+
+class EditingClient(FakeClient):
+    """Edits the item while its batch is being fetched, as the user might."""
+
+    def __init__(self, works: dict[str, OLResult], repo: ItemRepository) -> None:
+        super().__init__(works)
+        self._repo = repo
+
+    async def works(self, keys: list[str]) -> dict[str, OLResult]:
+        for item in self._repo.list_items():
+            self._repo.update_item(
+                item.id,
+                title=item.title,
+                media_type=item.media_type,
+                status=ItemStatus.DONE,
+                rating=5,
+                notes="edited meanwhile",
+            )
+        return await super().works(keys)
+
+
+def test_enrich_keeps_edits_made_during_the_fetch(tmp_path: Path) -> None:
+    repo = ItemRepository(pool=ConnectionPool(tmp_path / "e.db"))
+    dune = repo.add_item(
+        title="Dune",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.BACKLOG,
+        openlibrary_key="/works/OL1W",
+    )
+    writer = DbWriter(repo)
+
+    client = EditingClient(
+        {"/works/OL1W": OLResult("/works/OL1W", "Dune", "F. Herbert", 1965, 3, 42)},
+        repo,
+    )
+    assert _run(writer, client).updated == 1
+
+    item = repo.get_item(dune)
+    assert item is not None
+    assert (item.status, item.rating, item.notes) == (
+        ItemStatus.DONE,
+        5,
+        "edited meanwhile",
+    )
+    assert (item.author, item.first_publish_year, item.cover_id) == (
+        "F. Herbert",
+        1965,
+        42,
+    )
+    writer.close(timeout=5)
+    repo.close()
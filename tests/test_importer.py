@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from library_app.model.db import ConnectionPool
+from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.importer import (
+    ImportProgress,
+    import_file,
+    lookup_query,
+    read_import_file,
+)
+from library_app.model.ol_client import OpenLibraryClient
+from library_app.model.openlibrary import OLResult
+from library_app.model.repository import ItemRepository
+from library_app.model.resilience import CircuitOpenError
+from library_app.model.writer import DbWriter
+
+
+class FakeClient(OpenLibraryClient):
+    def __init__(self, failing: set[str] | None = None) -> None:
+        super().__init__()
+        self.failing = failing or set()
+        self.queries: list[str] = []
+
+    async def search(
+        self, query: str, *, limit: int = 25, offset: int = 0
+    ) -> list[OLResult]:
+        self.queries.append(query)
+        if query in self.failing:
+            raise httpx.ConnectError("offline")
+        if query == "nothing":
+            return []
+        key = f"/works/{query.replace(':', '_').replace(' ', '_')}"
+        return [OLResult(key, query.title(), "Someone", 2000, 1, None)]
+
+
+class RefusingClient(FakeClient):
+    """Open Library is "down": an open circuit, or a body that is not JSON."""
+
+    async def search(
+        self, query: str, *, limit: int = 25, offset: int = 0
+    ) -> list[OLResult]:
+        if query == "emma":
+            raise CircuitOpenError("Open Library looks unhealthy; retrying later")
+        if query == "ulysses":
+            raise ValueError("Expecting value: line 1 column 1 (char 0)")
+        return await super().search(query, limit=limit, offset=offset)
+
+
+def _run(path: Path, writer: DbWriter, client: FakeClient) -> ImportProgress:
+    return asyncio.run(
+        import_file(path, client=client, writer=writer, rate_per_s=1000, batch_size=2)
+    )
+
+
+def test_read_import_file_uses_csv_header_column(tmp_path: Path) -> None:
+    path = tmp_path / "books.csv"
+    path.write_text("Title,ISBN\nDune,978-0-441-17271-9\nNo isbn,\n", encoding="utf-8")
+
+    lines = read_import_file(path)
+
+    assert [(line.line, line.query) for line in lines] == [(2, "978-0-441-17271-9")]
+    assert lookup_query(lines[0].query) == "isbn:9780441172719"
+    assert lookup_query("The Hobbit") == "The Hobbit"
+
+
+def test_import_dedupes_and_resumes(tmp_path: Path) -> None:
+    repo = ItemRepository(pool=ConnectionPool(tmp_path / "i.db"))
+    repo.add_item(
+        title="Dune",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        openlibrary_key="/works/dune",
+    )
+    writer = DbWriter(repo)
+    path = tmp_path / "list.txt"
+    path.write_text("dune\n# comment\nemma\nnothing\nemma\nulysses\n", encoding="utf-8")
+
+    first = _run(path, writer, FakeClient(failing={"ulysses"}))
+    assert (first.imported, first.duplicates, first.not_found, first.failed) == (
+        1,
+        2,
+        1,
+        1,
+    )
+
+    client = FakeClient()
+    second = _run(path, writer, client)
+    assert client.queries == ["ulysses"]  # only the failed line is retried
+    assert (second.imported, second.skipped) == (1, 4)
+
+    titles = sorted(item.title for item in repo.list_items())
+    assert titles == ["Dune", "Emma", "Ulysses"]
+    writer.close(timeout=5)
+    repo.close()
+
+
+def test_import_counts_refused_lookups_as_failed(tmp_path: Path) -> None:
+    repo = ItemRepository(pool=ConnectionPool(tmp_path / "i.db"))
+    writer = DbWriter(repo)
+    path = tmp_path / "list.txt"
+    path.write_text("dune\nemma\nulysses\n", encoding="utf-8")
+
+    progress = _run(path, writer, RefusingClient())
+    assert (progress.imported, progress.failed, progress.done) == (1, 2, 3)
+    assert [item.title for item in repo.list_items()] == ["Dune"]
+    writer.close(timeout=5)
+    repo.close()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, Qt
+
+from library_app.model.entities import ItemSummary
+from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.query import ItemSort, sorts_before
+from library_app.view.item_table_model import ItemTableModel
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+
+def _item(item_id: int, title: str, cover_id: int | None = None) -> ItemSummary:
+    return ItemSummary(item_id, title, MediaType.BOOK, ItemStatus.DONE, None, cover_id)
+
+
+def _assert_indexed(model: ItemTableModel) -> None:
+    """The id -> row and cover -> ids indexes match the rows exactly."""
+    rows = [model.item_at(row) for row in range(model.rowCount())]
+    assert model._row_by_id == {
+        item.id: row for row, item in enumerate(rows) if item is not None
+    }
+    by_cover: dict[int, set[int]] = {}
+    for item in rows:
+        if item is not None and item.cover_id:
+            by_cover.setdefault(item.cover_id, set()).add(item.id)
+    assert model._ids_by_cover == by_cover
+
+
+def test_indexes_follow_inserts_and_removals() -> None:
+    model = ItemTableModel([_item(1, "A", 10), _item(2, "B"), _item(3, "C", 10)])
+    _assert_indexed(model)
+
+    assert model.insert_item(_item(4, "D", 11), row=1) == 1
+    _assert_indexed(model)
+    assert model.row_for_id(2) == 2
+
+    # Inserting a row that is already there updates it in place.
+    assert model.insert_item(_item(4, "D2", 11), row=3) == 1
+    assert model.rowCount() == 4
+    _assert_indexed(model)
+
+    assert model.remove_item(1)
+    assert not model.remove_item(1)
+    _assert_indexed(model)
+    assert model._ids_by_cover[10] == {3}
+
+    assert model.remove_item(3)
+    _assert_indexed(model)
+    assert 10 not in model._ids_by_cover
+
+
+def test_cover_change_moves_the_row_between_covers() -> None:
+    model = ItemTableModel([_item(1, "A", 10), _item(2, "B", 10)])
+
+    assert model.update_item(_item(1, "A", 12))
+    _assert_indexed(model)
+    assert model._ids_by_cover == {10: {2}, 12: {1}}
+
+    assert model.update_item(_item(2, "B", None))
+    _assert_indexed(model)
+    assert model._ids_by_cover == {12: {1}}
+    assert not model.update_item(_item(99, "Nope"))
+
+
+def test_a_decoded_cover_repaints_only_its_rows() -> None:
+    model = ItemTableModel(
+        [_item(1, "A", 10), _item(2, "B", 11), _item(3, "C", 10), _item(4, "D")]
+    )
+    model.insert_item(_item(5, "E", 10), row=0)  # shifts every row down
+    repainted: list[int] = []
+
+    def on_changed(top: QModelIndex, bottom: QModelIndex) -> None:
+        repainted.extend(range(top.row(), bottom.row() + 1))
+
+    model.dataChanged.connect(on_changed)
+    model.set_cover_image(10, None)
+    assert sorted(repainted) == [0, 1, 3]  # items 5, 1 and 3
+
+
+class Store:
+    """A keyset-paged listing over a dict, like list_items_page."""
+
+    def __init__(self, titles: str) -> None:
+        self.items = {i: _item(i, t) for i, t in enumerate(titles, start=1)}
+
+    def __call__(
+        self, *, after: ItemSummary | None, limit: int, sort: ItemSort
+    ) -> list[ItemSummary]:
+        rows = sorted(
+            self.items.values(),
+            key=lambda i: (i.title.lower(), i.id),
+            reverse=sort.descending,
+        )
+        if after is not None:
+            rows = [i for i in rows if sorts_before(after, i, sort)]
+        return rows[:limit]
+
+    def rename(self, item_id: int, title: str) -> ItemSummary:
+        self.items[item_id] = replace(self.items[item_id], title=title)
+        return self.items[item_id]
+
+
+def _paged(store: Store) -> ItemTableModel:
+    model = ItemTableModel()
+    model._PAGE_SIZE = 3
+    model.set_page_loader(store)
+    model.sort(0, Qt.SortOrder.AscendingOrder)  # Title, re-paged from the store
+    return model
+
+
+def _scroll_to_end(model: ItemTableModel) -> list[str]:
+    while model.canFetchMore():
+        model.fetchMore()
+    _assert_indexed(model)
+    return [model.data(model.index(r, 0)) for r in range(model.rowCount())]
+
+
+def test_paging_follows_the_sort_order() -> None:
+    model = _paged(Store("DBAC"))
+    assert model.rowCount() == 3
+    assert _scroll_to_end(model) == ["A", "B", "C", "D"]
+
+    model.sort(0, Qt.SortOrder.DescendingOrder)
+    assert _scroll_to_end(model) == ["D", "C", "B", "A"]
+
+
+def test_renaming_the_last_fetched_row_loses_no_pages() -> None:
+    store = Store("ABCDEFGHIJ")
+    model = _paged(store)
+
+    # "C" now belongs far past the fetched pages: it arrives with them.
+    assert model.update_item(store.rename(3, "Zed"))
+    assert model.row_for_id(3) is None
+    assert _scroll_to_end(model) == list("ABDEFGHIJ") + ["Zed"]
+
+
+def test_renaming_a_row_moves_it_without_duplicates() -> None:
+    store = Store("ABCDEFGHIJ")
+    model = _paged(store)
+
+    selected = QPersistentModelIndex(model.index(0, 0))
+    assert model.update_item(store.rename(1, "Bb"))
+    assert model.row_for_id(1) == 1  # moved after "B", within the page
+    assert selected.row() == 1  # and the selection went with it
+    assert model.update_item(store.rename(1, "Zed"))
+    assert _scroll_to_end(model) == list("BCDEFGHIJ") + ["Zed"]
+
+    assert model.remove_item(1)
+    assert model.row_for_id(1) is None
+    assert "Zed" not in _scroll_to_end(model)
+
+
+def test_inserts_past_the_fetched_pages_wait_for_them() -> None:
+    store = Store("ABDE")
+    model = _paged(store)
+
+    store.items[5] = _item(5, "C")
+    assert model.insert_sorted(store.items[5]) == 2
+    store.items[6] = _item(6, "F")
+    assert model.insert_sorted(store.items[6]) is None
+    assert _scroll_to_end(model) == list("ABCDEF")
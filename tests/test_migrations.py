@@ -0,0 +1,59 @@
+# tests/test_migrations.py
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from library_app.model.migrations import SCHEMA_VERSION, migrate
+
+
+def _schema_objects(conn: sqlite3.Connection) -> set[tuple[str, str]]:
+    rows = conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+    ).fetchall()
+    return {(row[0], row[1]) for row in rows}
+
+
+def _columns(conn: sqlite3.Connection) -> list[tuple[str, str, int]]:
+    return [(r[1], r[2], r[3]) for r in conn.execute("PRAGMA table_info(items)")]
+
+
+def test_migrations_match_schema_sql(db_conn: sqlite3.Connection) -> None:
+    fresh = sqlite3.connect(":memory:")
+    migrate(fresh)
+
+    assert fresh.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert db_conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert _schema_objects(fresh) == _schema_objects(db_conn)
+    assert _columns(fresh) == _columns(db_conn)
+
+
+def test_migrate_upgrades_legacy_database(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    # Shape written by the old try/ALTER init_db, with a duplicated key.
+    conn.executescript(
+        """
+        CREATE TABLE items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            media_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            rating INTEGER NULL,
+            notes TEXT NOT NULL DEFAULT ''
+        );
+        ALTER TABLE items ADD COLUMN openlibrary_key TEXT NULL;
+        INSERT INTO items (title, media_type, status, openlibrary_key)
+        VALUES ('Dune', 'book', 'done', '/works/OL1W'),
+               ('Dune again', 'book', 'done', '/works/OL1W');
+        """
+    )
+
+    migrate(conn)
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    keys = conn.execute("SELECT openlibrary_key FROM items ORDER BY id").fetchall()
+    assert keys == [("/works/OL1W",), (None,)]
+    hits = conn.execute(
+        "SELECT rowid FROM items_fts WHERE items_fts MATCH 'again'"
+    ).fetchall()
+    assert hits == [(2,)]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from library_app.model import covers, ol_client
+from library_app.model.cover_cache import CoverCache
+from library_app.model.cover_misses import (
+    CoverMisses,
+    CoverUnavailableError,
+    MissKind,
+)
+from library_app.model.ol_client import OpenLibraryClient
+from library_app.model.resilience import CircuitOpenError
+
+
+class FakeClient(OpenLibraryClient):
+    """Answers every GET with `status`, or raises `error`."""
+
+    def __init__(
+        self, misses: CoverMisses, *, status: int = 200, error: Exception | None = None
+    ) -> None:
+        super().__init__(misses=misses)
+        self.status = status
+        self.error = error
+        self.requests = 0
+
+    async def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        self.requests += 1
+        if self.error is not None:
+            raise self.error
+        return httpx.Response(
+            self.status, content=b"jpeg", request=httpx.Request("GET", url)
+        )
+
+
+@pytest.fixture
+def misses(tmp_path: Path) -> Iterator[CoverMisses]:
+    cache = CoverCache(tmp_path / "covers", tmp_path / "cache.db")
+    covers.set_cover_cache(cache)
+    store = CoverMisses(tmp_path / "cache.db")
+    yield store
+    store.close()
+    covers.set_cover_cache(None)
+    cache.close()
+
+
+def _disk_full(*args: object, **kwargs: object) -> None:
+    raise OSError(28, "No space left on device")
+
+
+@pytest.mark.parametrize(
+    ("status", "error", "store_fails", "kind"),
+    [
+        (200, CircuitOpenError("open"), False, MissKind.REFUSED),
+        (403, None, False, MissKind.ERROR),
+        (200, None, True, MissKind.ERROR),
+    ],
+    ids=["circuit-open", "forbidden", "disk-full"],
+)
+def test_any_failed_cover_download_is_not_retried_at_once(
+    misses: CoverMisses,
+    monkeypatch: pytest.MonkeyPatch,
+    status: int,
+    error: Exception | None,
+    store_fails: bool,
+    kind: MissKind,
+) -> None:
+    if store_fails:
+        monkeypatch.setattr(ol_client, "store_cover", _disk_full)
+    client = FakeClient(misses, status=status, error=error)
+
+    with pytest.raises((CircuitOpenError, httpx.HTTPStatusError, OSError)):
+        asyncio.run(client.fetch_cover(5))
+    assert misses.get(5, "M") is kind
+
+    # The next paint asks again: refused without a request.
+    with pytest.raises(CoverUnavailableError):
+        asyncio.run(client.fetch_cover(5))
+    assert client.requests == 1
+
+
+def test_not_found_cover_is_remembered(misses: CoverMisses) -> None:
+    client = FakeClient(misses, status=404)
+
+    assert not asyncio.run(client.fetch_cover(6))
+    assert not asyncio.run(client.fetch_cover(6))
+    assert misses.get(6, "M") is MissKind.NOT_FOUND
+    assert client.requests == 1
+
+
+def test_downloaded_cover_clears_its_expired_miss(
+    misses: CoverMisses, tmp_path: Path
+) -> None:
+    db = tmp_path / "cache.db"
+    expiring = CoverMisses(db, ttl_s={MissKind.NOT_FOUND: 0.0, MissKind.ERROR: 0.0})
+    expiring.record(7, "M", MissKind.ERROR)
+
+    assert asyncio.run(FakeClient(expiring).fetch_cover(7))
+    expiring.close()
+
+    # Gone from the database too, not just expired.
+    reopened = CoverMisses(db)
+    assert reopened.get(7, "M") is None
+    reopened.close()
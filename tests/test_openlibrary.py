@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+
+from library_app.model.openlibrary import OLResult, parse_search
+from library_app.util.async_loop import AsyncLoop
+
+
+def test_parse_search_tolerates_missing_fields() -> None:
+    data = {
+        "docs": [
+            {
+                "key": "/works/OL1W",
+                "title": "Dune",
+                "author_name": ["Frank Herbert"],
+                "first_publish_year": 1965,
+                "edition_count": 3,
+                "cover_i": 42,
+            },
+            {"key": "/works/OL2W", "title": "Untitled"},
+        ]
+    }
+
+    results = parse_search(data)
+
+    assert results[0] == OLResult(
+        key="/works/OL1W",
+        title="Dune",
+        author="Frank Herbert",
+        first_publish_year=1965,
+        edition_count=3,
+        cover_i=42,
+    )
+    assert results[1].author == ""
+    assert results[1].cover_i is None
+
+
+def test_async_loop_runs_coroutines_off_thread() -> None:
+    loop = AsyncLoop()
+
+    async def double(x: int) -> int:
+        await asyncio.sleep(0)
+        return x * 2
+
+    try:
+        assert loop.submit(double(21)).result(timeout=5) == 42
+    finally:
+        loop.close(timeout=5)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+from PySide6.QtGui import QPixmap
+
+from library_app.view.pixmap_cache import PixmapCache, pixmap_bytes
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+
+def _pix(w: int, h: int) -> QPixmap:
+    pix = QPixmap(w, h)
+    pix.fill()
+    return pix
+
+
+def test_evicts_least_recently_used_by_bytes() -> None:
+    one = pixmap_bytes(_pix(32, 48))
+    cache = PixmapCache(budget_bytes=one * 4)
+    for cover_id in range(4):
+        cache.put((cover_id, "t32x48", 1.0), _pix(32, 48))
+    assert cache.get((0, "t32x48", 1.0)) is not None  # 1 is now the oldest
+
+    cache.put((4, "t32x48", 1.0), _pix(32, 48))
+
+    assert cache.get((1, "t32x48", 1.0)) is None
+    assert cache.get((0, "t32x48", 1.0)) is not None
+    assert cache.get((0, "t32x48", 2.0)) is None  # other dpr, other entry
+    stats = cache.stats()
+    assert (stats.entries, stats.bytes, stats.evictions) == (4, one * 4, 1)
+    assert (stats.hits, stats.misses) == (2, 2)
+
+
+def test_oversized_pixmaps_are_not_kept_and_trim_frees() -> None:
+    cache = PixmapCache(budget_bytes=pixmap_bytes(_pix(100, 100)))
+    cache.put((1, "100x100", 1.0), _pix(100, 100))
+    assert cache.get((1, "100x100", 1.0)) is None
+
+    cache.put((2, "t32x48", 1.0), _pix(32, 48))
+    assert cache.trim() == pixmap_bytes(_pix(32, 48))
+    assert cache.stats().entries == 0
@@ -2,8 +2,16 @@
 from __future__ import annotations
 
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
 
-from library_app.model.enums import ItemStatus, MediaType
+import pytest
+
+from library_app.model.db import ConnectionPool
+from library_app.model.entities import NewItem
+from library_app.model.enums import ChangeOp, ItemStatus, MediaType
+from library_app.model.query import ItemFilter, ItemSort, SortKey
 from library_app.model.repository import ItemRepository
 
 
@@ -77,3 +85,306 @@ def test_delete_item(db_conn: sqlite3.Connection) -> None:
 
     repo.delete_item(item_id)
     assert repo.get_item(item_id) is None
+
+
+def test_list_items_page_seeks_past_cursor(db_conn: sqlite3.Connection) -> None:
+    repo = ItemRepository(db_conn)
+    ids = [
+        repo.add_item(title=f"T{i}", media_type=MediaType.BOOK, status=ItemStatus.DONE)
+        for i in range(5)
+    ]
+
+    first = repo.list_items_page(limit=2)
+    second = repo.list_items_page(after=first[-1], limit=2)
+    third = repo.list_items_page(after=second[-1], limit=2)
+
+    assert [i.id for i in first + second + third] == ids[::-1]
+    assert len(third) == 1
+    assert repo.list_items_page(after=third[-1], limit=2) == []
+
+
+def test_search_ranks_title_hits_and_tracks_writes(db_conn: sqlite3.Connection) -> None:
+    repo = ItemRepository(db_conn)
+    in_notes = repo.add_item(
+        title="Dune",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        notes="better than the hobbit",
+    )
+    in_title = repo.add_item(
+        title="The Hobbit",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        author="J.R.R. Tolkien",
+    )
+
+    assert [i.id for i in repo.search("hobb")] == [in_title, in_notes]
+    assert [i.id for i in repo.search("hobbit tolk")] == [in_title]
+    assert repo.search('"') == []
+
+    repo.update_item(
+        in_notes,
+        title="Dune",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        rating=None,
+        notes="",
+    )
+    repo.delete_item(in_title)
+    assert repo.search("hobbit") == []
+
+
+def test_bulk_add_update_delete(db_conn: sqlite3.Connection) -> None:
+    repo = ItemRepository(db_conn)
+    existing = repo.add_item(
+        title="Old", media_type=MediaType.BOOK, status=ItemStatus.DONE
+    )
+
+    ids = repo.add_items(
+        NewItem(
+            title=f"Bulk {i}", media_type=MediaType.COMIC, status=ItemStatus.BACKLOG
+        )
+        for i in range(3)
+    )
+    assert ids == [existing + 1, existing + 2, existing + 3]
+    items = [i for i in (repo.get_item(item_id) for item_id in ids) if i is not None]
+    assert [i.title for i in items] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+
+    changed = repo.update_items(replace(i, status=ItemStatus.DONE) for i in items)
+    assert changed == 3
+    assert {i.status for i in repo.list_items()} == {ItemStatus.DONE}
+
+    assert repo.delete_items([ids[0], ids[1], 10_000]) == 2
+    assert [i.id for i in repo.list_items()] == [ids[2], existing]
+
+
+def test_batch_commits_once_and_rolls_back_on_error(
+    db_conn: sqlite3.Connection,
+) -> None:
+    repo = ItemRepository(db_conn)
+
+    with pytest.raises(RuntimeError), repo.batch():
+        repo.add_item(title="A", media_type=MediaType.BOOK, status=ItemStatus.DONE)
+        repo.add_item(title="B", media_type=MediaType.BOOK, status=ItemStatus.DONE)
+        raise RuntimeError("boom")
+    assert repo.list_items() == []
+
+    with repo.batch():
+        repo.add_item(title="A", media_type=MediaType.BOOK, status=ItemStatus.DONE)
+        assert db_conn.in_transaction
+    assert not db_conn.in_transaction
+    assert len(repo.list_items()) == 1
+
+
+def test_pool_reads_from_worker_thread_during_write(tmp_path: Path) -> None:
+    pool = ConnectionPool(tmp_path / "pool.db")
+    repo = ItemRepository(pool=pool)
+    repo.add_item(title="Seen", media_type=MediaType.BOOK, status=ItemStatus.DONE)
+
+    mode = pool.connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with repo.batch():
+            repo.add_item(
+                title="Pending", media_type=MediaType.BOOK, status=ItemStatus.DONE
+            )
+            # The uncommitted write neither blocks nor leaks into the reader.
+            titles = executor.submit(lambda: [i.title for i in repo.list_items()])
+            assert titles.result(timeout=5) == ["Seen"]
+        worker_conn = executor.submit(pool.connection).result()
+
+    assert worker_conn is not pool.connection()
+    assert [i.title for i in repo.list_items()] == ["Pending", "Seen"]
+    repo.close()
+
+
+def test_changes_since_reports_net_changes(db_conn: sqlite3.Connection) -> None:
+    repo = ItemRepository(db_conn)
+    kept = repo.add_item(
+        title="Kept", media_type=MediaType.BOOK, status=ItemStatus.DONE
+    )
+    start = repo.latest_change_seq()
+
+    added = repo.add_item(
+        title="New", media_type=MediaType.BOOK, status=ItemStatus.DONE
+    )
+    gone = repo.add_item(
+        title="Gone", media_type=MediaType.BOOK, status=ItemStatus.DONE
+    )
+    for item_id in (added, kept):
+        repo.update_item(
+            item_id,
+            title="Edited",
+            media_type=MediaType.BOOK,
+            status=ItemStatus.DONE,
+            rating=None,
+            notes="",
+        )
+    repo.delete_item(gone)
+
+    changes = repo.changes_since(start)
+    assert [(c.item_id, c.op) for c in changes] == [
+        (added, ChangeOp.INSERT),
+        (kept, ChangeOp.UPDATE),
+        (gone, ChangeOp.DELETE),
+    ]
+    assert changes[-1].seq == repo.latest_change_seq()
+
+    repo.prune_changes(changes[-1].seq)
+    assert repo.changes_since(0) == []
+    assert set(repo.get_items([kept, added, gone])) == {kept, added}
+
+
+def test_item_cache_serves_reads_and_drops_on_write(
+    db_conn: sqlite3.Connection,
+) -> None:
+    repo = ItemRepository(db_conn)
+    item_id = repo.add_item(
+        title="Cached", media_type=MediaType.BOOK, status=ItemStatus.DONE
+    )
+
+    first = repo.get_item(item_id)
+    assert repo.get_item(item_id) is first
+    stats = repo.cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    # update_item writes through without reading, then invalidates.
+    repo.update_item(
+        item_id,
+        title="Fresh",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        rating=None,
+        notes="",
+    )
+    assert repo.cache_stats().hits == 1
+    item = repo.get_item(item_id)
+    assert item is not None and item.title == "Fresh"
+
+    # Writes that bypass the repository arrive through the change feed.
+    db_conn.execute("UPDATE items SET title = 'External' WHERE id = ?", (item_id,))
+    assert repo.get_item(item_id) == item
+    repo.changes_since(0)
+    item = repo.get_item(item_id)
+    assert item is not None and item.title == "External"
+
+
+def test_batch_rolls_back_when_the_commit_fails(
+    db_conn: sqlite3.Connection,
+) -> None:
+    repo = ItemRepository(db_conn)
+    # A deferred foreign key is only checked at COMMIT, which then fails.
+    db_conn.executescript(
+        """
+        PRAGMA foreign_keys = ON;
+        CREATE TABLE parent (id INTEGER PRIMARY KEY);
+        CREATE TABLE child (
+            pid INTEGER REFERENCES parent (id) DEFERRABLE INITIALLY DEFERRED
+        );
+        """
+    )
+
+    with pytest.raises(sqlite3.IntegrityError), repo.batch():
+        repo.add_item(title="Lost", media_type=MediaType.BOOK, status=ItemStatus.DONE)
+        db_conn.execute("INSERT INTO child (pid) VALUES (99)")
+    assert not db_conn.in_transaction
+
+    # The failed group must not ride along with the next commit.
+    with repo.batch():
+        repo.add_item(title="Kept", media_type=MediaType.BOOK, status=ItemStatus.DONE)
+    assert [i.title for i in repo.list_items()] == ["Kept"]
+
+
+def test_cache_drops_rows_only_once_their_batch_commits(tmp_path: Path) -> None:
+    repo = ItemRepository(pool=ConnectionPool(tmp_path / "c.db"))
+    item_id = repo.add_item(
+        title="Old", media_type=MediaType.BOOK, status=ItemStatus.DONE
+    )
+    reader = ThreadPoolExecutor(max_workers=1)  # its own connection, like the GUI
+
+    with repo.batch():  # a DbWriter group around the request's own batch
+        repo.update_item(
+            item_id,
+            title="New",
+            media_type=MediaType.BOOK,
+            status=ItemStatus.DONE,
+            rating=None,
+            notes="",
+        )
+        # Not committed yet: another thread still reads (and caches) the old row.
+        seen = reader.submit(repo.get_item, item_id).result()
+        assert seen is not None and seen.title == "Old"
+
+    fresh = reader.submit(repo.get_item, item_id).result()
+    assert fresh is not None and fresh.title == "New"
+    reader.shutdown()
+    repo.close()
+
+
+def test_update_item_keeps_columns_it_was_not_given(
+    db_conn: sqlite3.Connection,
+) -> None:
+    repo = ItemRepository(db_conn)
+    item_id = repo.add_item(
+        title="Dune", media_type=MediaType.BOOK, status=ItemStatus.BACKLOG
+    )
+    assert repo.get_item(item_id) is not None  # now cached without an author
+
+    # Another connection fills in metadata; the cache has not heard yet.
+    db_conn.execute(
+        "UPDATE items SET author = 'Frank Herbert', cover_id = 7 WHERE id = ?",
+        (item_id,),
+    )
+    repo.update_item(
+        item_id,
+        title="Dune",
+        media_type=MediaType.BOOK,
+        status=ItemStatus.DONE,
+        rating=5,
+        notes="",
+    )
+
+    item = repo.get_item(item_id)
+    assert item is not None
+    assert (item.status, item.author, item.cover_id) == (
+        ItemStatus.DONE,
+        "Frank Herbert",
+        7,
+    )
+
+
+def test_list_items_page_sorts_and_filters_in_sql(db_conn: sqlite3.Connection) -> None:
+    repo = ItemRepository(db_conn)
+    specs = [
+        ("beta", ItemStatus.DONE, 3),
+        ("Alpha", ItemStatus.DONE, None),
+        ("gamma", ItemStatus.BACKLOG, 5),
+        ("alpha", ItemStatus.DONE, 4),
+    ]
+    ids = repo.add_items(
+        NewItem(title=t, media_type=MediaType.BOOK, status=s, rating=r)
+        for t, s, r in specs
+    )
+
+    def all_pages(sort: ItemSort, filters: ItemFilter | None = None) -> list[int]:
+        out: list[int] = []
+        page = repo.list_items_page(limit=1, sort=sort, filters=filters)
+        while page:
+            out.extend(i.id for i in page)
+            page = repo.list_items_page(
+                after=page[-1], limit=1, sort=sort, filters=filters
+            )
+        return out
+
+    by_title = all_pages(ItemSort(SortKey.TITLE, descending=False))
+    assert by_title == [ids[1], ids[3], ids[0], ids[2]]
+
+    by_rating = all_pages(ItemSort(SortKey.RATING, descending=True))
+    assert by_rating == [ids[2], ids[3], ids[0], ids[1]]
+
+    done = all_pages(ItemSort(SortKey.TITLE), ItemFilter(status=ItemStatus.DONE))
+    assert done == [ids[0], ids[3], ids[1]]
+
+    rated = all_pages(ItemSort(), ItemFilter(min_rating=4))
+    assert rated == [ids[3], ids[2]]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from library_app.model.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    SingleFlight,
+    retry,
+)
+
+
+def test_single_flight_shares_one_call() -> None:
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def main() -> list[int]:
+        flights: SingleFlight[str] = SingleFlight()
+        return await asyncio.gather(*(flights.do("k", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == [42] * 5
+    assert calls == 1
+
+
+def test_retry_recovers_from_transient_errors() -> None:
+    attempts = 0
+
+    async def flaky() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise httpx.ConnectError("reset")
+        return "ok"
+
+    assert asyncio.run(retry(flaky, base_s=0)) == "ok"
+    assert attempts == 3
+
+
+def test_circuit_opens_after_repeated_failures() -> None:
+    breaker = CircuitBreaker(threshold=2, reset_s=60)
+    attempts = 0
+
+    async def down() -> None:
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ConnectError("down")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(retry(down, breaker=breaker, attempts=2, base_s=0))
+    assert breaker.is_open
+
+    # Refused without touching the network.
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(retry(down, breaker=breaker, base_s=0))
+    assert attempts == 2
+
+
+def test_cancelled_trial_call_does_not_wedge_the_breaker() -> None:
+    breaker = CircuitBreaker(threshold=1, reset_s=0)
+    breaker.record_failure()
+
+    async def hang() -> str:
+        await asyncio.sleep(60)
+        return "late"
+
+    async def ok() -> str:
+        return "ok"
+
+    async def main() -> str:
+        trial = asyncio.create_task(retry(hang, breaker=breaker, base_s=0))
+        await asyncio.sleep(0)  # the trial call is now in flight
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        return await retry(ok, breaker=breaker, base_s=0)
+
+    assert asyncio.run(main()) == "ok"
+    assert not breaker.is_open
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from library_app.model.openlibrary import OLResult
+from library_app.model.search_cache import SearchCache
+
+DUNE = OLResult(
+    key="/works/OL1W",
+    title="Dune",
+    author="Frank Herbert",
+    first_publish_year=1965,
+    edition_count=3,
+    cover_i=42,
+)
+
+
+def test_search_cache_hits_normalized_queries(tmp_path: Path) -> None:
+    cache = SearchCache(tmp_path / "cache.db")
+    assert cache.get("dune", limit=25) is None
+
+    cache.put("Dune", limit=25, results=[DUNE], fetch_s=0.2)
+
+    hit = cache.get("  DUNE ", limit=25)
+    assert hit is not None
+    assert hit.results == [DUNE]
+    assert not hit.stale
+    # A different page size or page is a different answer.
+    assert cache.get("dune", limit=50) is None
+    assert cache.get("dune", limit=25, offset=25) is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 3, 1)
+    assert stats.fetch_ms == 200.0
+    cache.close()
+
+
+def test_search_cache_serves_stale_then_expires(tmp_path: Path) -> None:
+    stale = SearchCache(tmp_path / "cache.db", ttl_s=0.0)
+    stale.put("dune", limit=25, results=[DUNE])
+    hit = stale.get("dune", limit=25)
+    assert hit is not None and hit.stale
+    stale.close()
+
+    expired = SearchCache(tmp_path / "cache.db", ttl_s=0.0, max_stale_s=0.0)
+    assert expired.get("dune", limit=25) is None
+    expired.close()
+
+
+def test_search_cache_evicts_least_recently_read(tmp_path: Path) -> None:
+    cache = SearchCache(tmp_path / "cache.db", max_entries=2)
+    cache.put("a", limit=25, results=[])
+    cache.put("b", limit=25, results=[])
+    assert cache.get("a", limit=25) is not None  # "b" is now the oldest
+    cache.put("c", limit=25, results=[])
+
+    assert cache.get("b", limit=25) is None
+    assert cache.get("a", limit=25) is not None
+    assert cache.stats().evictions == 1
+    cache.close()
+
+
+def test_lookups_do_not_write(tmp_path: Path) -> None:
+    cache = SearchCache(tmp_path / "cache.db", max_entries=2)
+    cache.put("a", limit=25, results=[])
+    cache.put("b", limit=25, results=[])
+
+    writes = cache._conn.total_changes
+    assert cache.get("a", limit=25) is not None
+    assert cache._conn.total_changes == writes
+    cache.close()
+
+    # The read still counts once written back: "b" is the oldest.
+    cache = SearchCache(tmp_path / "cache.db", max_entries=2)
+    cache.put("c", limit=25, results=[])
+    assert cache.get("b", limit=25) is None
+    assert cache.get("a", limit=25) is not None
+    cache.close()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtTest import QTest
+
+from library_app.model.openlibrary import OLResult
+from library_app.view.search_online_dialog import SearchOnlineDialog
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+_DEBOUNCE_MS = 20
+
+
+@pytest.fixture
+def dlg() -> Iterator[SearchOnlineDialog]:
+    dialog = SearchOnlineDialog()
+    dialog._debounce.setInterval(_DEBOUNCE_MS)
+    yield dialog
+    # Destroyed while the application still exists, not at exit.
+    dialog.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+def _searches(dlg: SearchOnlineDialog) -> list[str]:
+    searches: list[str] = []
+    dlg.search_requested.connect(searches.append)
+    return searches
+
+
+def _type(dlg: SearchOnlineDialog, text: str) -> None:
+    dlg.query_edit.setText(text)
+
+
+def _settle() -> None:
+    QTest.qWait(_DEBOUNCE_MS * 5)
+
+
+def test_typing_searches_once_after_a_pause(dlg: SearchOnlineDialog) -> None:
+    searches = _searches(dlg)
+    for text in ("d", "du", "dun", "dune"):
+        _type(dlg, text)
+    _settle()
+    assert searches == ["dune"]
+
+    _type(dlg, " dune ")  # the same query again
+    _settle()
+    _type(dlg, "du")  # too short to search on its own
+    _settle()
+    assert searches == ["dune"]
+
+    dlg.search_btn.click()  # ...but Enter / the button always search
+    assert searches == ["dune", "du"]
+    _settle()
+    assert searches == ["dune", "du"]  # the pending pause was cancelled
+
+
+def test_replies_of_an_older_search_are_dropped(dlg: SearchOnlineDialog) -> None:
+    old = dlg.begin_search()
+    new = dlg.begin_search()
+    assert not dlg.is_current(old) and dlg.is_current(new)
+
+    hit = OLResult("/works/OL1W", "Dune", "", None, None, None)
+    dlg.show_page(old, 0, [hit], exhausted=False)
+    assert dlg.results_model.rowCount() == 0
+
+    dlg.show_page(new, 0, [hit], exhausted=False)
+    dlg.page_failed(old)  # does not stop the current search paging
+    assert dlg.results_model.rowCount() == 1
+    assert dlg.results_model.canFetchMore()
+
+    dlg.page_failed(new)
+    assert not dlg.results_model.canFetchMore()
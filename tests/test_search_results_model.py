@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+from library_app.model.openlibrary import OLResult
+from library_app.view.search_results_model import SearchResultsModel
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+
+def _hits(*keys: str) -> list[OLResult]:
+    return [OLResult(f"/works/{k}", k, "", None, None, None) for k in keys]
+
+
+def _titles(model: SearchResultsModel) -> list[str]:
+    return [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+
+
+def _requests(model: SearchResultsModel) -> list[int]:
+    offsets: list[int] = []
+    model.more_requested.connect(offsets.append)
+    return offsets
+
+
+def test_one_page_is_asked_for_at_a_time() -> None:
+    model = SearchResultsModel()
+    offsets = _requests(model)
+    model.set_results(_hits("a", "b"), exhausted=False)
+
+    assert model.canFetchMore()
+    model.fetchMore()
+    model.fetchMore()  # still loading: no second request
+    assert offsets == [2]
+    assert not model.canFetchMore()
+
+    model.append_page(2, _hits("c", "d"), exhausted=False)
+    model.fetchMore()
+    assert offsets == [2, 4]
+
+
+def test_pages_for_another_offset_are_ignored() -> None:
+    model = SearchResultsModel()
+    model.set_results(_hits("a", "b"), exhausted=False)
+    model.fetchMore()
+
+    model.append_page(5, _hits("x"), exhausted=True)  # from before a reset
+    assert _titles(model) == ["a", "b"]
+    assert not model.canFetchMore()  # still waiting for offset 2
+
+    model.append_page(2, _hits("c"), exhausted=True)
+    assert _titles(model) == ["a", "b", "c"]
+    assert not model.canFetchMore()  # the last page
+
+
+def test_works_already_shown_are_skipped_but_counted() -> None:
+    model = SearchResultsModel()
+    offsets = _requests(model)
+    model.set_results(_hits("a", "b"), exhausted=False)
+    model.fetchMore()
+
+    # Results shifted: "b" comes again at the start of the next page.
+    model.append_page(2, _hits("b", "c"), exhausted=False)
+    assert _titles(model) == ["a", "b", "c"]
+    model.fetchMore()
+    assert offsets == [2, 4]  # offsets follow raw hits, not rows
+
+    model.append_page(4, _hits("a", "c"), exhausted=False)  # nothing new
+    assert model.rowCount() == 3
+    assert model.canFetchMore()
+
+
+def test_a_failed_page_stops_paging() -> None:
+    model = SearchResultsModel()
+    offsets = _requests(model)
+    model.set_results(_hits("a"), exhausted=False)
+    model.fetchMore()
+
+    model.stop_paging()
+    assert not model.canFetchMore()
+    model.fetchMore()
+    assert offsets == [1]
+    assert _titles(model) == ["a"]
+
+    # A new search starts paging again.
+    model.set_results(_hits("z"), exhausted=False)
+    assert model.canFetchMore()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+
+import pytest
+
+from library_app.util.worker import WorkerSignals, watch_future
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+
+def test_a_future_that_is_already_done_still_reports() -> None:
+    done: Future[int] = Future()
+    done.set_result(42)
+    got: list[object] = []
+
+    watch_future(
+        done,
+        on_result=got.append,
+        on_error=got.append,
+        on_finished=lambda: got.append("finished"),
+    )
+    assert got == [42, "finished"]
+
+
+def test_errors_reach_receivers_connected_beforehand() -> None:
+    failing: Future[int] = Future()
+    signals = WorkerSignals()
+    errors: list[str] = []
+    signals.error.connect(errors.append)
+
+    watch_future(failing, signals)
+    failing.set_exception(ValueError("bad page"))
+    assert len(errors) == 1
+    assert errors[0].rstrip().endswith("ValueError: bad page")
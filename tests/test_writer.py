@@ -0,0 +1,71 @@
+# tests/test_writer.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from library_app.model.db import ConnectionPool
+from library_app.model.enums import ItemStatus, MediaType
+from library_app.model.repository import ItemRepository
+from library_app.model.writer import DbWriter
+
+
+def test_writer_groups_queued_requests_into_one_commit(tmp_path: Path) -> None:
+    repo = ItemRepository(pool=ConnectionPool(tmp_path / "w.db"))
+    writer = DbWriter(repo, window_s=0.05)
+
+    gate = threading.Event()
+    blocker = writer.submit(lambda _repo: gate.wait(5))
+
+    def add(i: int) -> Callable[[ItemRepository], int]:
+        return lambda r: r.add_item(
+            title=f"T{i}", media_type=MediaType.BOOK, status=ItemStatus.DONE
+        )
+
+    futures = [writer.submit(add(i)) for i in range(50)]
+    gate.set()
+
+    ids = [f.result(timeout=5) for f in futures]
+    assert blocker.result(timeout=5) is True
+    assert len(set(ids)) == 50
+    # The 50 queued behind the blocker share at most one more transaction.
+    assert writer.stats().commits <= 2
+    assert writer.stats().requests == 51
+    assert len(repo.list_items()) == 50
+
+    writer.close(timeout=5)
+    repo.close()
+
+
+def test_failed_request_does_not_undo_its_group(tmp_path: Path) -> None:
+    repo = ItemRepository(pool=ConnectionPool(tmp_path / "w.db"))
+    writer = DbWriter(repo, window_s=0.05)
+
+    def dup(r: ItemRepository) -> int:
+        return r.add_item(
+            title="Dup",
+            media_type=MediaType.BOOK,
+            status=ItemStatus.DONE,
+            openlibrary_key="/works/OL1W",
+        )
+
+    first = writer.submit(dup)
+    second = writer.submit(dup)
+    third = writer.submit(
+        lambda r: r.add_item(
+            title="Other", media_type=MediaType.BOOK, status=ItemStatus.DONE
+        )
+    )
+
+    assert isinstance(first.result(timeout=5), int)
+    with pytest.raises(sqlite3.IntegrityError):
+        second.result(timeout=5)
+    assert isinstance(third.result(timeout=5), int)
+    assert sorted(i.title for i in repo.list_items()) == ["Dup", "Other"]
+
+    writer.close(timeout=5)
+    repo.close()